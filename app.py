@@ -1,22 +1,50 @@
+import time
+
 import streamlit as st
-import pickle
 import numpy as np
+import pandas as pd
+
+from explain import BIAS, Explainer
+from instrumentation import METRICS
+from model_artifact import load_artifact
+from prediction_cache import PredictionCache, normalize_features
+
+rerun_started = time.perf_counter()
+
+artifact_filename = "sales_prediction_artifact.json"
+
+# Load the trained model together with its fitted preprocessing.
+# Cached as a resource: loaded once per process and shared by every session and rerun.
+@st.cache_resource
+def load_model():
+    return load_artifact(artifact_filename)
 
-# Load the trained model
-pkl_filename = "sales_prediction_model.pkl"
-with open(pkl_filename, 'rb') as file:
-    model = pickle.load(file)
+# Memo of recent predictions, also shared across sessions
+@st.cache_resource
+def load_prediction_cache():
+    return PredictionCache(maxsize=4096, ttl=3600)
+
+# Explanations need xgboost's pred_contribs, so that model is only loaded once someone asks for one
+@st.cache_resource
+def load_explainer():
+    return Explainer(load_artifact(artifact_filename, backend='xgboost'))
+
+model = load_model()
+prediction_cache = load_prediction_cache()
 
 # Define a function to predict sales
 def predict_sales(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035):
     # Convert descriptive names back to required numerical values
-    outlet_identifier_out027 = 1 if outlet_identifier_out027 == 'OUT027' else 0
-    outlet_identifier_out019 = 1 if outlet_identifier_out019 == 'OUT019' else 0
-    outlet_identifier_out035 = 1 if outlet_identifier_out035 == 'OUT035' else 0
-    
-    features = np.array([[outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035]])
-    prediction = model.predict(features)
-    return prediction[0]
+    with METRICS.time('feature_build', rows=1):
+        features = normalize_features(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035)
+
+    # The artifact scales Outlet_Type, Item_MRP and Outlet_Age the same way as at training time
+    return prediction_cache.get_or_compute(features, lambda: float(model.predict(np.array([features]))[0]))
+
+# Per-feature contributions (TreeSHAP) to the prediction; they add up to it together with the bias
+def explain_sales(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035):
+    features = normalize_features(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035)
+    return load_explainer().explain_one(features)
 
 # Streamlit app
 st.title("Sales Prediction App")
@@ -77,10 +105,16 @@ item_mrp = st.number_input("Item MRP", min_value=0.0, format="%.2f")
 outlet_identifier_out019 = st.selectbox("Outlet Identifier OUT019", options=list(outlet_identifier_out019_options.values()))
 outlet_age = st.slider("Outlet Age", min_value=0, max_value=100, value=0, step=1)
 outlet_identifier_out035 = st.selectbox("Outlet Identifier OUT035", options=list(outlet_identifier_out035_options.values()))
+explain = st.checkbox("Explain the prediction")
 
 if st.button("Predict Sales"):
     result = predict_sales(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035)
     st.success(f"The predicted sales are: ${result:.2f}")
+    if explain:
+        contributions = explain_sales(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019, outlet_age, outlet_identifier_out035)
+        bias = contributions.pop(BIAS)
+        st.caption(f"Starting from the average prediction of ${bias:.2f}, each input moved it by:")
+        st.bar_chart(pd.Series(contributions, name="Contribution ($)"))
 
 # Footer
 st.markdown(f"""
@@ -89,3 +123,8 @@ st.markdown(f"""
     <a href="https://www.linkedin.com/in/abdul-mukit-1bbb72218" target="_blank" class='highlight'>Abdul Mukit</a>.
 </footer>
 """, unsafe_allow_html=True)
+
+# Script time of this rerun; exported with SALES_METRICS=1 (see instrumentation.py)
+if METRICS.enabled:
+    METRICS.observe('app_rerun', time.perf_counter() - rerun_started)
+    METRICS.write_if_due()
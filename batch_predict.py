@@ -0,0 +1,114 @@
+"""Batch scoring for the sales prediction model.
+
+Scores a whole catalog (a CSV or DataFrame shaped like Test.csv) with the same
+features that `predict_sales` in app.py builds for a single row, but computes
+them column-wise and calls `model.predict` once per chunk instead of once per row.
+The model is the versioned artifact from model_artifact.py, which applies the
+training-time scaling before scoring.
+
+Usage:
+    python batch_predict.py Test.csv --output predictions.csv --chunk-size 4096
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS
+from model_artifact import DEFAULT_ARTIFACT_PATH, THIS_YEAR, load_artifact
+
+# Columns the model was trained on, in training order
+FEATURE_NAMES = ['Outlet_Type', 'Outlet_Identifier_OUT027', 'Item_MRP',
+                 'Outlet_Identifier_OUT019', 'Outlet_Age', 'Outlet_Identifier_OUT035']
+
+# Label codes produced by LabelEncoder on Outlet_Type (alphabetical order)
+OUTLET_TYPES = ['Grocery Store', 'Supermarket Type1', 'Supermarket Type2', 'Supermarket Type3']
+
+# Raw columns needed to build the features
+INPUT_COLUMNS = ['Outlet_Type', 'Outlet_Identifier', 'Item_MRP', 'Outlet_Establishment_Year']
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def load_model(path=DEFAULT_ARTIFACT_PATH, backend='xgboost'):
+    # Load the preprocessing + model artifact; xgboost's traversal is fastest for large chunks
+    return load_artifact(path, backend=backend)
+
+
+def build_features(df):
+    """Build the (n_rows, 6) feature matrix for a Test.csv-shaped DataFrame."""
+    missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {missing}")
+
+    # Outlet_Type may arrive either as a label (e.g. 'Grocery Store') or already encoded (0-3)
+    outlet_type = df['Outlet_Type']
+    if pd.api.types.is_numeric_dtype(outlet_type):
+        outlet_type_codes = outlet_type.to_numpy(dtype=np.float64)
+        unknown = ~np.isin(outlet_type_codes, np.arange(len(OUTLET_TYPES)))
+    else:
+        outlet_type_codes = pd.Categorical(outlet_type, categories=OUTLET_TYPES).codes.astype(np.float64)
+        unknown = outlet_type_codes < 0
+    if unknown.any():
+        raise ValueError(f"Unknown Outlet_Type values: {sorted(set(outlet_type[unknown]))}")
+
+    outlet_identifier = df['Outlet_Identifier'].to_numpy()
+
+    features = np.empty((len(df), len(FEATURE_NAMES)), dtype=np.float64)
+    features[:, 0] = outlet_type_codes
+    features[:, 1] = outlet_identifier == 'OUT027'
+    features[:, 2] = df['Item_MRP'].to_numpy(dtype=np.float64)
+    features[:, 3] = outlet_identifier == 'OUT019'
+    features[:, 4] = THIS_YEAR - df['Outlet_Establishment_Year'].to_numpy(dtype=np.float64)
+    features[:, 5] = outlet_identifier == 'OUT035'
+    return features
+
+
+def predict_features(model, features, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score a prebuilt feature matrix with one `predict` call per chunk."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    predictions = np.empty(len(features), dtype=np.float32)
+    for start in range(0, len(features), chunk_size):
+        stop = start + chunk_size
+        predictions[start:stop] = model.predict(features[start:stop])
+    return predictions
+
+
+def predict_batch(model, data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score a Test.csv-shaped DataFrame, or the path to such a CSV."""
+    if not isinstance(data, pd.DataFrame):
+        data = pd.read_csv(data, usecols=INPUT_COLUMNS)
+    with METRICS.time('feature_build', rows=len(data)):
+        features = build_features(data)
+    return predict_features(model, features, chunk_size=chunk_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a Test.csv-shaped file with the sales prediction model.")
+    parser.add_argument('input', help="CSV file shaped like Test.csv")
+    parser.add_argument('--output', '-o', default='predictions.csv', help="where to write the predictions")
+    parser.add_argument('--model', default=DEFAULT_ARTIFACT_PATH, help="model artifact to score with")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per predict call")
+    parser.add_argument('--backend', choices=['xgboost', 'numpy'], default='xgboost',
+                        help="tree evaluator; 'numpy' runs without xgboost installed")
+    parser.add_argument('--metrics', help="write load/feature/predict timings here (Prometheus text format)")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        METRICS.enabled = True
+
+    df = pd.read_csv(args.input)
+    model = load_model(args.model, backend=args.backend)
+    df['Item_Outlet_Sales'] = predict_batch(model, df, chunk_size=args.chunk_size)
+
+    id_columns = [col for col in ('Item_Identifier', 'Outlet_Identifier') if col in df.columns]
+    df[id_columns + ['Item_Outlet_Sales']].to_csv(args.output, index=False)
+    print(f"Scored {len(df)} rows, predictions saved to {args.output}")
+    if args.metrics:
+        METRICS.write(args.metrics)
+
+
+if __name__ == '__main__':
+    main()
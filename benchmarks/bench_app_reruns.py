@@ -0,0 +1,96 @@
+"""Load test of app.py's per-rerun cost with many concurrent sessions.
+
+Streamlit serves every session from threads of one process and reruns the script
+on each widget interaction. This simulates that without a browser: each session
+thread performs a number of reruns with inputs drawn from a skewed pool (users
+revisit the same settings), and the per-rerun latency is compared between
+
+- before: the model is loaded at the top of every rerun and every prediction is computed;
+- after:  the model is a process-wide cached resource and predictions go through
+          the shared PredictionCache, as in app.py.
+
+Usage:
+    python benchmarks/bench_app_reruns.py --sessions 32 --reruns 50
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from model_artifact import load_artifact  # noqa: E402
+from prediction_cache import PredictionCache, normalize_features  # noqa: E402
+
+ARTIFACT = os.path.join(ROOT, 'sales_prediction_artifact.json')
+
+
+def input_pool(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(int(rng.integers(0, 4)), rng.choice(['Other', 'OUT027']), float(rng.integers(30, 270)),
+             rng.choice(['Other', 'OUT019']), int(rng.integers(0, 40)), rng.choice(['Other', 'OUT035']))
+            for _ in range(size)]
+
+
+def rerun_before(inputs):
+    model = load_artifact(ARTIFACT)
+    features = normalize_features(*inputs)
+    return float(model.predict(np.array([features]))[0])
+
+
+def make_rerun_after():
+    model = load_artifact(ARTIFACT)
+    cache = PredictionCache(maxsize=4096, ttl=3600)
+
+    def rerun(inputs):
+        features = normalize_features(*inputs)
+        return cache.get_or_compute(features, lambda: float(model.predict(np.array([features]))[0]))
+    return rerun
+
+
+def load_test(rerun, sessions, reruns, pool, seed=1):
+    latencies = [[] for _ in range(sessions)]
+    # Zipf-like popularity: a few settings account for most reruns
+    weights = 1.0 / np.arange(1, len(pool) + 1)
+    weights /= weights.sum()
+
+    def session(index):
+        rng = np.random.default_rng(seed + index)
+        for choice in rng.choice(len(pool), size=reruns, p=weights):
+            start = time.perf_counter()
+            rerun(pool[choice])
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    all_latencies = np.concatenate(latencies) * 1000
+    return np.percentile(all_latencies, 50), np.percentile(all_latencies, 99), len(all_latencies) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=32)
+    parser.add_argument('--reruns', type=int, default=50)
+    parser.add_argument('--pool', type=int, default=200, help="number of distinct input settings")
+    args = parser.parse_args(argv)
+
+    pool = input_pool(args.pool)
+    print(f"{args.sessions} sessions x {args.reruns} reruns, {args.pool} distinct inputs")
+    print(f"{'':<8}{'p50 ms':>10}{'p99 ms':>10}{'reruns/sec':>13}")
+    for name, rerun in (('before', rerun_before), ('after', make_rerun_after())):
+        p50, p99, throughput = load_test(rerun, args.sessions, args.reruns, pool)
+        print(f"{name:<8}{p50:>10.3f}{p99:>10.3f}{throughput:>13,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Throughput of batch scoring versus the per-row path used by app.py.
+
+Usage:
+    python benchmarks/bench_batch_predict.py --data Test.csv --chunk-sizes 256 1024 4096
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_predict import build_features, load_model, predict_features  # noqa: E402
+from model_artifact import DEFAULT_ARTIFACT_PATH  # noqa: E402
+
+
+def predict_per_row(model, df):
+    # Mirrors predict_sales in app.py: one 1x6 array and one predict call per row
+    predictions = []
+    for row in df.itertuples(index=False):
+        features = np.array([[
+            row.Outlet_Type,
+            1 if row.Outlet_Identifier == 'OUT027' else 0,
+            row.Item_MRP,
+            1 if row.Outlet_Identifier == 'OUT019' else 0,
+            row.Outlet_Age,
+            1 if row.Outlet_Identifier == 'OUT035' else 0,
+        ]])
+        predictions.append(model.predict(features)[0])
+    return np.array(predictions)
+
+
+def rows_per_second(func, n_rows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return n_rows / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='Test.csv')
+    parser.add_argument('--model', default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[256, 1024, 4096, 16384])
+    parser.add_argument('--per-row-rows', type=int, default=500, help="rows scored on the (slow) per-row path")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data)
+    model = load_model(args.model)
+    n_rows = len(df)
+
+    # The per-row path works on the same encoded inputs the app receives
+    sample = df.head(args.per_row_rows).copy()
+    sample['Outlet_Type'] = build_features(sample)[:, 0]
+    sample['Outlet_Age'] = 2024 - sample['Outlet_Establishment_Year']
+    per_row = rows_per_second(lambda: predict_per_row(model, sample), len(sample), args.repeat)
+    print(f"per-row (app.py path): {per_row:12,.0f} rows/sec")
+
+    for chunk_size in args.chunk_sizes:
+        batch = rows_per_second(lambda: predict_features(model, build_features(df), chunk_size),
+                                n_rows, args.repeat)
+        print(f"batch chunk={chunk_size:<6d}:  {batch:12,.0f} rows/sec  ({batch / per_row:,.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
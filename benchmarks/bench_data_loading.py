@@ -0,0 +1,89 @@
+"""Peak memory and time of streaming ingestion versus the notebook's whole-file load.
+
+Train.csv is replicated to several sizes. For each size, a fresh interpreter
+either loads and cleans it like salesprediction.py (read_csv with inferred
+dtypes, .copy(), fillna/pivot imputation, fat-content replace) or streams it
+through data_loading.iter_clean_chunks. Peak RSS of the child is reported.
+
+Usage:
+    python benchmarks/bench_data_loading.py --scales 1 10 50 --chunksize 100000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NOTEBOOK = '''
+df_train = pd.read_csv(path)
+df = df_train.copy()
+df['Item_Weight'] = df['Item_Weight'].fillna(df['Item_Weight'].mean())
+mode_of_Outlet_size = df.pivot_table(values='Outlet_Size', columns='Outlet_Type', aggfunc=(lambda x: x.mode()[0]))
+miss_values = df['Outlet_Size'].isnull()
+df.loc[miss_values, 'Outlet_Size'] = df.loc[miss_values, 'Outlet_Type'].apply(lambda x: mode_of_Outlet_size[x])
+df.replace({'Item_Fat_Content': {'low fat': 'Low Fat', 'LF': 'Low Fat', 'reg': 'Regular'}}, inplace=True)
+rows = len(df)
+'''
+
+STREAMING = '''
+from data_loading import iter_clean_chunks
+rows = 0
+for chunk in iter_clean_chunks(path, chunksize=chunksize):
+    rows += len(chunk)
+'''
+
+CHILD = '''
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+path, chunksize = {path!r}, {chunksize}
+start = time.perf_counter()
+{body}
+print(json.dumps({{"rows": rows, "seconds": time.perf_counter() - start,
+                  "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+'''
+
+
+def run(body, path, chunksize):
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c',
+                          CHILD.format(root=ROOT, path=path, chunksize=chunksize, body=body)],
+                         check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def replicate(source, scale, path):
+    with open(source) as src:
+        header = src.readline()
+        body = src.read()
+    with open(path, 'w') as dst:
+        dst.write(header)
+        for _ in range(scale):
+            dst.write(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(ROOT, 'Train.csv'))
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10}{'notebook s':>12}{'notebook MB':>13}{'stream s':>10}{'stream MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            path = os.path.join(tmp, f'train_x{scale}.csv')
+            replicate(args.data, scale, path)
+            notebook = run(NOTEBOOK, path, args.chunksize)
+            streaming = run(STREAMING, path, args.chunksize)
+            assert notebook['rows'] == streaming['rows']
+            print(f"{notebook['rows']:>10,}{notebook['seconds']:>12.2f}{notebook['max_rss_kb'] / 1024:>13.1f}"
+                  f"{streaming['seconds']:>10.2f}{streaming['max_rss_kb'] / 1024:>11.1f}")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
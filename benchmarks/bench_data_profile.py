@@ -0,0 +1,125 @@
+"""Data-quality profiling: the notebook's four scans versus data_profile.py.
+
+- notebook: whole-file read_csv, then check_missing_values, detect_outliers
+  (per-column quantiles, outlier rows pd.concat-ed), calculate_skewness and
+  categorical_cols, as in sections 3-4 of salesprediction.py;
+- profile: data_profile.profile, one chunked pass over the file.
+
+Each run is a fresh process, so peak RSS is its own. Sizes above Train.csv are
+synthetic (synthetic_data.py, cached in .cache/bench/). The quantiles, skewness and
+outlier counts of both are compared; above 1M values per column the profile's
+quantiles come from its sketch.
+
+Usage:
+    python benchmarks/bench_data_profile.py --sizes 8523 1000000 5000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TRAIN_ROWS = 8523
+NUMERIC = ['Item_Weight', 'Item_Visibility', 'Item_MRP', 'Outlet_Establishment_Year', 'Item_Outlet_Sales']
+
+
+def dataset_path(rows):
+    if rows == TRAIN_ROWS:
+        return os.path.join(ROOT, 'Train.csv')
+    path = os.path.join(ROOT, '.cache', 'bench', f'train_{rows}_seed0.csv')
+    if not os.path.exists(path):
+        from synthetic_data import write_dataset
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_dataset(path, rows, source=os.path.join(ROOT, 'Train.csv'), seed=0)
+    return path
+
+
+def notebook(path):
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df.isnull().sum()
+    outliers = pd.DataFrame(columns=df.columns)
+    stats = {}
+    for col in df.select_dtypes(include=['float64', 'int64']).columns:
+        q1, q3 = df[col].quantile(0.25), df[col].quantile(0.75)
+        iqr = q3 - q1
+        found = df[(df[col] < q1 - 1.5 * iqr) | (df[col] > q3 + 1.5 * iqr)]
+        outliers = pd.concat([outliers, found])
+        stats[col] = {'q1': q1, 'median': df[col].median(), 'q3': q3, 'outliers': len(found)}
+    skewness = df.select_dtypes(include=['float64', 'int64']).skew()
+    for col in stats:
+        stats[col]['skew'] = skewness[col]
+    [(col, len(df[col]), df[col].nunique()) for col in df.columns if df[col].dtype == 'object']
+    return stats
+
+
+def profiled(path):
+    from data_profile import profile
+
+    report = profile(path)
+    return {col: {key: report.loc[col, key] for key in ['q1', 'median', 'q3', 'outliers', 'skew']}
+            for col in NUMERIC}
+
+
+def child(mode, rows):
+    start = time.perf_counter()
+    stats = (notebook if mode == 'notebook' else profiled)(dataset_path(rows))
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'seconds': seconds, 'peak_rss_mb': peak,
+                      'stats': {col: {key: float(value) for key, value in values.items()}
+                                for col, values in stats.items()}}))
+
+
+def run_child(mode, rows):
+    out = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', mode, str(rows)],
+                         capture_output=True, text=True)
+    if out.returncode:
+        return None
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[TRAIN_ROWS, 1_000_000, 5_000_000])
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument('--generate', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        dataset_path(args.generate)
+        return
+
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    print(f"{'rows':>10}  {'method':<9}{'seconds':>9}{'peak MB':>9}  max relative quantile error, outlier count diff")
+    for rows in args.sizes:
+        # Generate in a separate process: peak RSS survives exec, so the measured children can't inherit it
+        subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--generate', str(rows)], check=True)
+        results = {mode: run_child(mode, rows) for mode in ['notebook', 'profile']}
+        reference = results['notebook']
+        for mode, result in results.items():
+            if result is None:
+                print(f"{rows:>10,}  {mode:<9}{'killed':>9}")
+                continue
+            line = f"{rows:>10,}  {mode:<9}{result['seconds']:>9.2f}{result['peak_rss_mb']:>9.0f}"
+            if mode == 'profile' and reference is not None:
+                errors = [abs(result['stats'][col][key] / reference['stats'][col][key] - 1)
+                          for col in NUMERIC for key in ['q1', 'median', 'q3']]
+                diffs = [int(result['stats'][col]['outliers'] - reference['stats'][col]['outliers']) for col in NUMERIC]
+                line += f"  {max(errors):.2e}, {diffs}"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
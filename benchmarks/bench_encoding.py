@@ -0,0 +1,94 @@
+"""Memory and fit time of the dense, sparse and categorical one-hot encodings.
+
+Train.csv is replicated `scale` times and its Outlet_Identifier is split into
+`--outlets` synthetic outlets, so the one-hot block grows like a real catalog.
+For each scale and encoding, a fresh interpreter preprocesses the frame, makes
+the notebook's train/test split and fits the tuned XGBoost model. Reported are
+the design matrix size, preprocessing and fit time, test R² and the child's
+peak RSS.
+
+Usage:
+    python benchmarks/bench_encoding.py --scales 10 100 --outlets 200
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from preprocessing import ENCODINGS  # noqa: E402
+
+CHILD = '''
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.metrics import r2_score
+from xgboost import XGBRegressor
+from feature_selection import XGB_PARAMS
+from preprocessing import DEFAULT_CONFIG, preprocess, split, xgboost_params
+
+train = pd.read_csv({data!r})
+df = pd.concat([train] * {scale}, ignore_index=True)
+replica = np.repeat(np.arange({scale}), len(train)) % max(1, {outlets} // train['Outlet_Identifier'].nunique())
+df['Outlet_Identifier'] = df['Outlet_Identifier'] + '_' + replica.astype(str)
+del train, replica
+
+start = time.perf_counter()
+X, y, _ = preprocess(df, {{**DEFAULT_CONFIG, 'onehot_encoding': {encoding!r}}})
+del df
+X_train, X_test, y_train, y_test = split(X, y)
+preprocessed = time.perf_counter()
+if sparse.issparse(X):
+    nbytes = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+else:
+    nbytes = int(X.memory_usage(deep=True).sum())
+model = XGBRegressor(**XGB_PARAMS, **xgboost_params(X_train), n_jobs=1).fit(X_train, y_train)
+fitted = time.perf_counter()
+print(json.dumps({{"rows": X.shape[0], "columns": X.shape[1], "matrix_mb": nbytes / 2**20,
+                  "preprocess_s": preprocessed - start, "fit_s": fitted - preprocessed,
+                  "r2_test": r2_score(y_test, model.predict(X_test)),
+                  "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+'''
+
+
+def run(data, scale, outlets, encoding):
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c',
+                          CHILD.format(root=ROOT, data=data, scale=scale, outlets=outlets, encoding=encoding)],
+                         capture_output=True, text=True)
+    if out.returncode == -signal.SIGKILL:
+        # The OOM killer; the point of the benchmark for the dense encoding at large scales
+        return None
+    out.check_returncode()
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(ROOT, 'Train.csv'))
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--outlets', type=int, default=200, help="synthetic Outlet_Identifier cardinality")
+    parser.add_argument('--encodings', nargs='+', choices=ENCODINGS, default=list(ENCODINGS))
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10}{'encoding':>13}{'columns':>9}{'matrix MB':>11}{'prep s':>8}{'fit s':>8}"
+          f"{'R2 test':>9}{'peak MB':>9}")
+    for scale in args.scales:
+        for encoding in args.encodings:
+            result = run(args.data, scale, args.outlets, encoding)
+            if result is None:
+                print(f"{'':>10}{encoding:>13}  killed (out of memory) at scale {scale}")
+                continue
+            print(f"{result['rows']:>10,}{encoding:>13}{result['columns']:>9}{result['matrix_mb']:>11.1f}"
+                  f"{result['preprocess_s']:>8.2f}{result['fit_s']:>8.2f}{result['r2_test']:>9.3f}"
+                  f"{result['max_rss_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Per-prediction explanations: pred_contribs on every row versus explain.Explainer's cache.
+
+- direct: Explainer.contributions, XGBoost's pred_contribs (exact TreeSHAP) on every row;
+- cold: Explainer.explain on a fresh explainer (computes every discrete combination seen);
+- warm: the same call again, served from the cache.
+
+The cached contributions are checked against the direct ones, and their sum
+against the model's predictions. Single-row latency is what the app pays per
+explained prediction. The data are Test.csv and synthetic files
+(synthetic_data.py, cached in .cache/bench/).
+
+Usage:
+    python benchmarks/bench_explain.py --sizes 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from batch_predict import INPUT_COLUMNS, build_features  # noqa: E402
+from explain import Explainer  # noqa: E402
+from model_artifact import load_artifact  # noqa: E402
+
+
+def dataset_path(rows, seed=0):
+    path = os.path.join(ROOT, '.cache', 'bench', f'train_{rows}_seed{seed}.csv')
+    if not os.path.exists(path):
+        from synthetic_data import write_dataset
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_dataset(path, rows, source=os.path.join(ROOT, 'Train.csv'), seed=seed)
+    return path
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def measure(name, features, model):
+    direct, direct_seconds = timed(lambda: Explainer(model).contributions(features))
+    explainer = Explainer(model)
+    _, cold_seconds = timed(lambda: explainer.explain(features))
+    cached, warm_seconds = timed(lambda: explainer.explain(features))
+    additivity = np.abs(cached.sum(axis=1, dtype=np.float64) - model.predict(features)).max()
+
+    print(f"{name}: {len(features):,} rows, {len(explainer):,} discrete combinations")
+    print(f"  direct            {direct_seconds:>9.3f} s")
+    print(f"  cached, cold      {cold_seconds:>9.3f} s")
+    print(f"  cached, warm      {warm_seconds:>9.3f} s")
+    print(f"  max difference    {np.abs(cached - direct).max():>9.3g} (sum vs prediction {additivity:.3g})")
+    return explainer
+
+
+def single_row(explainer, features, repeat=1000):
+    rows = features[:repeat]
+    _, direct = timed(lambda: [explainer.contributions(row[None]) for row in rows])
+    _, cached = timed(lambda: [explainer.explain_one(row) for row in rows])
+    print(f"single row: direct {direct / len(rows) * 1e6:.0f} µs, cached {cached / len(rows) * 1e6:.0f} µs")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    model = load_artifact(os.path.join(ROOT, 'sales_prediction_artifact.json'), backend='xgboost')
+    test = build_features(pd.read_csv(os.path.join(ROOT, 'Test.csv')))
+    explainer = measure('Test.csv', test, model)
+    single_row(explainer, test)
+    for rows in args.sizes:
+        features = build_features(pd.read_csv(dataset_path(rows), usecols=INPUT_COLUMNS))
+        measure(f"{rows:,} rows", features, model)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Cold versus warm run of the preprocessing stage with the Arrow feature cache.
+
+Each run is a fresh interpreter that produces the notebook's X_train/X_test split.
+The stage time excludes importing pandas/sklearn/pyarrow, which every run pays:
+- no cache: read Train.csv and preprocess it, as salesprediction.py does;
+- cold: the same, plus writing the cache (first run after a data/config change);
+- warm: memory-map the cached frame.
+
+Usage:
+    python benchmarks/bench_feature_cache.py --repeat 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import pandas as pd
+import pyarrow
+import sklearn.preprocessing
+from preprocessing import preprocess, split
+from feature_cache import load_training_frame
+imported = time.perf_counter()
+if {use_cache}:
+    X, y = load_training_frame({data!r}, cache_dir={cache_dir!r})
+else:
+    X, y, _ = preprocess(pd.read_csv({data!r}))
+X_train, X_test, y_train, y_test = split(X, y)
+end = time.perf_counter()
+print(json.dumps({{"stage": end - imported, "total": end - start}}))
+'''
+
+
+def run(data, cache_dir, use_cache):
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c',
+                          CHILD.format(root=ROOT, data=data, cache_dir=cache_dir, use_cache=use_cache)],
+                         check=True, capture_output=True, text=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(ROOT, 'Train.csv'))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    timings = {'no cache': [], 'cold': [], 'warm': []}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            timings['no cache'].append(run(args.data, cache_dir, False))
+            timings['cold'].append(run(args.data, cache_dir, True))
+            timings['warm'].append(run(args.data, cache_dir, True))
+
+    print(f"{'':<10}{'stage ms':>10}{'with imports ms':>17}")
+    for name, runs in timings.items():
+        stage = statistics.median(run['stage'] for run in runs) * 1000
+        total = statistics.median(run['total'] for run in runs) * 1000
+        print(f"{name:<10}{stage:>10.1f}{total:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Wall-clock of the notebook's feature-selection loop versus feature_selection.py.
+
+Both sides share one RFE ranking; what is timed is the subset evaluation:
+- notebook: three `cross_val_score` calls per subset size (15 fits per size);
+- single pass: one fit per fold (5 fits per size), subset sizes run in parallel;
+- early stop: the same, stopping once R² has not improved for `--patience` sizes.
+The single-pass table is checked against the notebook's.
+
+Usage:
+    python benchmarks/bench_feature_selection.py --n-jobs -1 --max-features 12
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_cache import load_training_frame  # noqa: E402
+from feature_selection import RESULT_COLUMNS, XGB_PARAMS, evaluate_subsets, rank_features  # noqa: E402
+from preprocessing import split  # noqa: E402
+
+
+def notebook_loop(estimator, X, y, ranking, max_features):
+    from sklearn.model_selection import cross_val_score
+
+    rows = []
+    for n_features in range(1, max_features + 1):
+        selected = np.argsort(ranking)[:n_features]
+        X_selected = X.iloc[:, selected]
+        r2_cv = cross_val_score(estimator, X_selected, y, cv=5, scoring='r2').mean()
+        mae_cv = -cross_val_score(estimator, X_selected, y, cv=5, scoring='neg_mean_absolute_error').mean()
+        rmse_cv = np.sqrt(-cross_val_score(estimator, X_selected, y, cv=5, scoring='neg_mean_squared_error').mean())
+        rows.append({'Num_Features': n_features, 'Feature_Names': X.columns[selected].tolist(),
+                     'R2_CV': r2_cv, 'MAE_CV': mae_cv, 'RMSE_CV': rmse_cv})
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    from xgboost import XGBRegressor
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--max-features', type=int, default=None, help="evaluate only the top-k subset sizes")
+    parser.add_argument('--patience', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    X, y = load_training_frame(os.path.join(ROOT, 'Train.csv'))
+    X_train, X_test, y_train, y_test = split(X, y)
+    estimator = XGBRegressor(**XGB_PARAMS)
+    ranking, rank_time = timed(rank_features, estimator, X_train, y_train)
+    max_features = args.max_features or len(ranking)
+
+    baseline, baseline_time = timed(notebook_loop, estimator, X_train, y_train, ranking, max_features)
+    single, single_time = timed(evaluate_subsets, estimator, X_train, y_train, ranking,
+                                n_jobs=args.n_jobs, max_features=max_features)
+    early, early_time = timed(evaluate_subsets, estimator, X_train, y_train, ranking,
+                              n_jobs=args.n_jobs, max_features=max_features, patience=args.patience)
+
+    metrics = ['R2_CV', 'MAE_CV', 'RMSE_CV']
+    max_diff = np.abs(single[metrics].to_numpy() - baseline[metrics].to_numpy()).max()
+    best = baseline.sort_values('R2_CV', ascending=False).iloc[0]
+    early_best = early.sort_values('R2_CV', ascending=False).iloc[0]
+
+    print(f"RFE ranking: {rank_time:.1f}s (shared)")
+    print(f"{'':<13}{'sizes':>6}{'seconds':>9}{'speedup':>9}")
+    for name, table, seconds in [('notebook', baseline, baseline_time), ('single pass', single, single_time),
+                                 ('early stop', early, early_time)]:
+        print(f"{name:<13}{len(table):>6}{seconds:>9.1f}{baseline_time / seconds:>8.1f}x")
+    print(f"single pass vs notebook: max metric diff {max_diff:.2e}")
+    print(f"best size: notebook {best['Num_Features']}, early stop {early_best['Num_Features']}")
+
+
+if __name__ == '__main__':
+    main()
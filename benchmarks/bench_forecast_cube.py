@@ -0,0 +1,138 @@
+"""Aggregate forecasts: scoring the catalog per query versus the precomputed cube.
+
+- per query: what a planner's total costs today, i.e. score every listing
+  (batch_predict, the fastest path the repo has) and sum the matching ones;
+- cube: forecast_cube.ForecastCube, built once, then one lookup per total and one
+  view per slice.
+
+Totals for random selections of 0-3 dimensions are checked against the scored
+listings. Updates are timed against a rebuild:
+- an outlet changes size and age (every listing at that outlet moves);
+- 100 items change MRP.
+After the updates the cube is compared with one rebuilt from the changed catalog.
+The catalogs are Test.csv and synthetic full catalogs (every item at every
+outlet) from synthetic_data.make_catalog.
+
+Usage:
+    python benchmarks/bench_forecast_cube.py --items 1559 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from batch_predict import load_model, predict_batch  # noqa: E402
+from forecast_cube import DIMENSIONS, ForecastCube  # noqa: E402
+
+
+def full_catalog(n_items):
+    """Every item of a synthetic catalog of `n_items` listed at every outlet."""
+    from synthetic_data import learn_profile, make_catalog
+
+    profile = learn_profile(pd.read_csv(os.path.join(ROOT, 'Train.csv')))
+    items = make_catalog(profile, n_items)[['Item_Identifier', 'Item_Type', 'Item_MRP']]
+    outlets = profile['outlets'].reset_index()
+    return items.merge(outlets, how='cross')
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def random_selections(catalog, count, seed=0):
+    rng = np.random.default_rng(seed)
+    selections = []
+    for _ in range(count):
+        dims = rng.choice(DIMENSIONS, size=rng.integers(0, 4), replace=False)
+        row = catalog.iloc[rng.integers(len(catalog))]
+        selections.append({dim: str(row[dim]) if pd.notna(row[dim]) else 'Unknown' for dim in dims})
+    return selections
+
+
+def scored_total(model, catalog, selection):
+    predictions = predict_batch(model, catalog).astype(np.float64)
+    mask = np.ones(len(catalog), dtype=bool)
+    for dim, value in selection.items():
+        mask &= catalog[dim].fillna('Unknown').astype(str).to_numpy() == value
+    return predictions[mask].sum()
+
+
+def max_difference(cube, reference):
+    return max(np.abs(cube.slice(by).reindex(reference.slice(by).index) - reference.slice(by)).max()
+               for by in DIMENSIONS)
+
+
+def measure(name, catalog, model, queries):
+    start = time.perf_counter()
+    cube = ForecastCube.build(catalog, model)
+    build_seconds = time.perf_counter() - start
+
+    selections = random_selections(catalog, queries)
+    per_query = best_of(lambda: scored_total(model, catalog, selections[0]), 3)
+    start = time.perf_counter()
+    for selection in selections:
+        cube.total(**selection)
+    lookup = (time.perf_counter() - start) / len(selections)
+    slice_seconds = best_of(lambda: cube.slice('Item_Type', Outlet_Type='Supermarket Type1'), 100)
+    errors = [abs(cube.total(**selection) - scored_total(model, catalog, selection))
+              / max(abs(cube.total(**selection)), 1.0) for selection in selections[:20]]
+
+    outlet = catalog['Outlet_Identifier'].iloc[0]
+    items = catalog['Item_Identifier'].drop_duplicates().iloc[:100]
+    updated = catalog.copy()
+    at_outlet = updated['Outlet_Identifier'] == outlet
+    updated.loc[at_outlet, 'Outlet_Size'] = 'High'
+    updated.loc[at_outlet, 'Outlet_Establishment_Year'] = 1990
+    start = time.perf_counter()
+    cube.update_outlet(outlet, model, Outlet_Size='High', Outlet_Establishment_Year=1990)
+    outlet_seconds = time.perf_counter() - start
+
+    changed = updated['Item_Identifier'].isin(items)
+    updated.loc[changed, 'Item_MRP'] *= 1.1
+    start = time.perf_counter()
+    cube.upsert(updated[changed], model)
+    items_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuilt = ForecastCube.build(updated, model)
+    rebuild_seconds = time.perf_counter() - start
+
+    print(f"{name}: {len(catalog):,} listings, {cube.sums.size:,} cells "
+          f"({(cube.sums.nbytes + cube.counts.nbytes) / 1024:.0f} KB)")
+    print(f"  build               {build_seconds:>10.3f} s")
+    print(f"  total, scoring      {per_query * 1000:>10.1f} ms per query")
+    print(f"  total, cube         {lookup * 1e6:>10.1f} µs per query (max relative error {max(errors):.1e})")
+    print(f"  slice, cube         {slice_seconds * 1e6:>10.1f} µs (Item_Type within one Outlet_Type)")
+    print(f"  outlet update       {outlet_seconds:>10.3f} s ({at_outlet.sum():,} listings rescored)")
+    print(f"  100 items update    {items_seconds:>10.3f} s ({changed.sum():,} listings rescored)")
+    print(f"  rebuild             {rebuild_seconds:>10.3f} s (max difference after updates "
+          f"{max_difference(cube, rebuilt):.1e})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[1559, 100_000],
+                        help="synthetic catalog sizes; each item is listed at all 10 outlets")
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    model = load_model(os.path.join(ROOT, 'sales_prediction_artifact.json'))
+    measure('Test.csv', pd.read_csv(os.path.join(ROOT, 'Test.csv')), model, args.queries)
+    for n_items in args.items:
+        measure(f"{n_items:,} items", full_catalog(n_items), model, args.queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Cold-start import budget for the serving and training entry points.
+
+Each entry point is imported in a fresh interpreter under `python -X importtime`.
+The script reports the total import time and the entry point's slowest direct
+imports, and checks two things:
+- the total stays under the entry point's budget;
+- none of its forbidden modules were loaded.
+
+It exits with status 1 if either check fails. Serving may load only NumPy and the
+evaluator. The training pipeline may load pandas, but scikit-learn, xgboost,
+scipy and matplotlib must wait until a stage needs them. For reference it also
+times the end-to-end cold start of `serve.py`, and unpickling the notebook's
+model (which imports xgboost and scikit-learn).
+
+Usage:
+    python benchmarks/bench_import_time.py --repeat 5
+    python benchmarks/bench_import_time.py --budget-scale 1.5   # slower machine
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVING_FORBIDDEN = ['pandas', 'sklearn', 'xgboost', 'scipy', 'pyarrow', 'joblib', 'matplotlib', 'streamlit']
+TRAINING_FORBIDDEN = ['sklearn', 'xgboost', 'scipy', 'matplotlib', 'seaborn', 'plotly']
+
+# (statement, forbidden top-level packages, budget in ms); budgets are for one core of a cloud VM
+ENTRY_POINTS = {
+    'serve': ('import serve', SERVING_FORBIDDEN, 250),
+    'prediction_server': ('import prediction_server', SERVING_FORBIDDEN, 350),
+    'pipeline': ('import pipeline', TRAINING_FORBIDDEN, 1200),
+}
+REFERENCE = ('import pickle; pickle.load(open("sales_prediction_model.pkl", "rb"))')
+
+
+def parse_importtime(stderr, module):
+    """(total import ms, [(direct import of `module`, cumulative ms)]) from `-X importtime` output."""
+    total, children, pending = 0, [], []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            total += int(cumulative)
+            if name.strip() == module:
+                children = pending
+            pending = []
+        elif depth == 1:
+            pending.append((name.strip(), int(cumulative) / 1000))
+    return total / 1000, children
+
+
+def measure(statement):
+    """(total import ms, direct imports, loaded top-level packages) in a fresh interpreter."""
+    code = f"{statement}\nimport sys\nprint(__import__('json').dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                         check=True, cwd=ROOT)
+    total, children = parse_importtime(out.stderr, statement.split()[1])
+    return total, children, set(json.loads(out.stdout.strip().splitlines()[-1]))
+
+
+def wall_time(args):
+    start = time.perf_counter()
+    subprocess.run(args, capture_output=True, check=True, cwd=ROOT)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="fresh interpreters per entry point; the best is kept")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="multiply every budget")
+    parser.add_argument('--top', type=int, default=4, help="slowest imports to list")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'entry point':<20}{'import ms':>10}{'budget':>8}  slowest direct imports (ms)")
+    for name, (statement, forbidden, budget) in ENTRY_POINTS.items():
+        runs = [measure(statement) for _ in range(args.repeat)]
+        total, children, loaded = min(runs, key=lambda run: run[0])
+        budget *= args.budget_scale
+        slowest = sorted(children, key=lambda item: -item[1])[:args.top]
+        print(f"{name:<20}{total:>10.1f}{budget:>8.0f}  " + ', '.join(f"{module} {ms:.0f}" for module, ms in slowest))
+        if total > budget:
+            failures.append(f"{name}: {total:.0f} ms import time, budget {budget:.0f} ms")
+        leaked = sorted(loaded & set(forbidden))
+        if leaked:
+            failures.append(f"{name}: imports {', '.join(leaked)}")
+
+    serve = min(wall_time([sys.executable, 'serve.py', '1', '0', '249.8', '0', '25', '0'])
+                for _ in range(args.repeat))
+    pickled = min(wall_time([sys.executable, '-c', REFERENCE]) for _ in range(args.repeat))
+    bare = min(wall_time([sys.executable, '-c', 'pass']) for _ in range(args.repeat))
+    print(f"\nCold start to first prediction: serve.py {serve * 1000:.0f} ms; "
+          f"unpickling the notebook model alone {pickled * 1000:.0f} ms (bare interpreter {bare * 1000:.0f} ms)")
+
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
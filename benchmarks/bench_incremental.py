@@ -0,0 +1,103 @@
+"""Incremental update from one batch versus a full retrain, as history grows.
+
+For each history size, a model is fitted on the history as the notebook does
+(preprocess, XGB_PARAMS, the app's features), and its training state is taken.
+Then one new batch arrives:
+- full: preprocess and refit everything on history + batch;
+- incremental: incremental.update on the batch alone (state, scaler and
+  booster updated, `--rounds` trees added).
+
+Times exclude reading the CSV. The holdout RMSE of the model before the batch, and
+of both updated models, is printed, as is the largest change in the old trees'
+holdout predictions once their thresholds are rescaled (float32 rounding only).
+The data are synthetic (synthetic_data.py, cached in .cache/bench/).
+
+Usage:
+    python benchmarks/bench_incremental.py --sizes 100000 300000 1000000 --batch 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from batch_predict import FEATURE_NAMES, build_features  # noqa: E402
+from incremental import history_state, rescale_thresholds, update  # noqa: E402
+from model_artifact import SalesModel, build_artifact  # noqa: E402
+
+HOLDOUT_ROWS = 50_000
+
+
+def dataset_path(rows):
+    path = os.path.join(ROOT, '.cache', 'bench', f'train_{rows}_seed0.csv')
+    if not os.path.exists(path):
+        from synthetic_data import write_dataset
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_dataset(path, rows, source=os.path.join(ROOT, 'Train.csv'), seed=0)
+    return path
+
+
+def full_retrain(df):
+    from xgboost import XGBRegressor
+
+    from feature_selection import XGB_PARAMS
+    from preprocessing import preprocess
+
+    X, y, (scaler, label_encoders, ohe) = preprocess(df)
+    model = XGBRegressor(**XGB_PARAMS).fit(X[FEATURE_NAMES], y)
+    return model, build_artifact(model, scaler, label_encoders, ohe, FEATURE_NAMES)
+
+
+def rmse(artifact, features, y):
+    return float(np.sqrt(np.mean((SalesModel(artifact).predict(features) - y) ** 2)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 300_000, 1_000_000])
+    parser.add_argument('--batch', type=int, default=10_000, help="rows in the new batch (a day of sales)")
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    total = max(args.sizes) + args.batch + HOLDOUT_ROWS
+    data = pd.read_csv(dataset_path(total))
+    holdout = data.iloc[-HOLDOUT_ROWS:]
+    holdout_features, holdout_y = build_features(holdout), holdout['Item_Outlet_Sales'].to_numpy()
+
+    print(f"batch of {args.batch:,} rows, {args.rounds} trees per update, RMSE on {HOLDOUT_ROWS:,} holdout rows")
+    print(f"{'history':>10}{'full s':>9}{'incr s':>9}{'speedup':>9}{'RMSE before':>13}{'full':>9}{'incr':>9}"
+          f"{'old trees max diff':>20}")
+    for rows in args.sizes:
+        history, batch = data.iloc[:rows], data.iloc[rows:rows + args.batch]
+        model, artifact = full_retrain(history)
+        state = history_state(history)
+
+        start = time.perf_counter()
+        _, full_artifact = full_retrain(pd.concat([history, batch]))
+        full_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, _, incremental_artifact = update(batch, state, artifact, model.get_booster(), args.rounds)
+        incremental_seconds = time.perf_counter() - start
+
+        rescaled = rescale_thresholds(model.get_booster(), FEATURE_NAMES, artifact['scaling'],
+                                      incremental_artifact['scaling'])
+        old_trees = {**incremental_artifact, 'model': SimpleNamespace(predict=rescaled.inplace_predict)}
+        drift = np.abs(SalesModel(old_trees).predict(holdout_features)
+                       - SalesModel(artifact).predict(holdout_features)).max()
+        print(f"{rows:>10,}{full_seconds:>9.2f}{incremental_seconds:>9.2f}"
+              f"{full_seconds / incremental_seconds:>8.0f}x{rmse(artifact, holdout_features, holdout_y):>13.1f}"
+              f"{rmse(full_artifact, holdout_features, holdout_y):>9.1f}"
+              f"{rmse(incremental_artifact, holdout_features, holdout_y):>9.1f}{drift:>20.2g}")
+
+
+if __name__ == '__main__':
+    main()
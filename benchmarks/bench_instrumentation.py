@@ -0,0 +1,58 @@
+"""Per-call overhead of the instrumentation on `SalesModel.predict`.
+
+Times (best of 5) one-row and batch predictions through the uninstrumented path
+(`model.model.predict(model.transform(x))`) and through `model.predict` with
+metrics off, metrics on, and metrics plus the stack sampler on.
+
+Usage:
+    python benchmarks/bench_instrumentation.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from instrumentation import METRICS, PROFILER  # noqa: E402
+from model_artifact import DEFAULT_ARTIFACT_PATH, load_artifact  # noqa: E402
+
+
+def per_call_us(func, calls, repeat=5):
+    """Best of `repeat` runs; the differences measured are a few microseconds."""
+    return min(timeit.repeat(func, number=calls // repeat, repeat=repeat)) / (calls // repeat) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    model = load_artifact(os.path.join(ROOT, DEFAULT_ARTIFACT_PATH))
+    one = np.array([[1, 0, 150.0, 0, 25, 1]], dtype=np.float64)
+    batch = np.tile(one, (256, 1))
+
+    print(f"{'':<22}{'1 row us':>10}{'256 rows us':>13}")
+    with tempfile.TemporaryDirectory() as profile_dir:
+        for name, metrics, profiler in [('uninstrumented', None, False), ('metrics off', False, False),
+                                        ('metrics on', True, False), ('metrics + sampler', True, True)]:
+            METRICS.enabled = bool(metrics)
+            if profiler:
+                # High threshold: measure the sampling cost, not the dumps
+                PROFILER.enable(profile_dir, threshold=10.0)
+            if metrics is None:
+                timings = [per_call_us(lambda x=x: model.model.predict(model.transform(x)), args.calls)
+                           for x in (one, batch)]
+            else:
+                timings = [per_call_us(lambda x=x: model.predict(x), args.calls) for x in (one, batch)]
+            PROFILER.disable()
+            print(f"{name:<22}{timings[0]:>10.1f}{timings[1]:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Cold-start cost of loading the model: pickle versus XGBoost's native booster format.
+
+Each path runs in a fresh interpreter, so import time is included. Reports the
+wall-clock time of import + load + one prediction, peak resident memory, and the
+file size.
+
+Usage:
+    python benchmarks/bench_model_load.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = '''
+import resource, sys, time, json
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{load}
+model.predict([[1.0, 0.0, 0.5, 0.0, -0.2, 0.0]])
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+'''
+
+LOADERS = {
+    'pickle (XGBRegressor)': '''
+import pickle
+with open({path!r}, 'rb') as file:
+    model = pickle.load(file)
+''',
+    'native (bare Booster)': '''
+from booster_io import NativeBooster
+model = NativeBooster({path!r})
+''',
+}
+
+
+def measure(load, repeat):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-W', 'ignore', '-c', CHILD.format(root=ROOT, load=load)],
+                             check=True, capture_output=True, text=True, cwd=ROOT)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return (statistics.median(run['seconds'] for run in runs),
+            statistics.median(run['max_rss_kb'] for run in runs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=os.path.join(ROOT, 'sales_prediction_model.pkl'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    import pickle
+
+    from booster_io import export_booster
+
+    with open(args.model, 'rb') as file:
+        model = pickle.load(file)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [('pickle (XGBRegressor)', args.model)]
+        for ext in ('.json', '.ubj'):
+            path = os.path.join(tmp, 'model' + ext)
+            export_booster(model, path)
+            cases.append(('native (bare Booster)', path))
+
+        print(f"{'path':<24}{'format':<8}{'size KB':>9}{'load ms':>10}{'max RSS MB':>12}")
+        for name, path in cases:
+            seconds, rss_kb = measure(LOADERS[name].format(path=path), args.repeat)
+            ext = os.path.splitext(path)[1]
+            print(f"{name:<24}{ext:<8}{os.path.getsize(path) / 1024:>9.1f}{seconds * 1000:>10.1f}{rss_kb / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
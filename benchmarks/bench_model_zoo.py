@@ -0,0 +1,68 @@
+"""Baseline model comparison: the notebook's sequential loop versus model_zoo.py.
+
+- notebook: section 6 of salesprediction.py, nine fits one after another;
+- cold: model_zoo with an empty cache (process pool, capped threads);
+- warm: the same call again, answered from the cache;
+- one new model: the zoo plus one extra candidate, which is the only fit.
+
+Usage:
+    python benchmarks/bench_model_zoo.py --max-workers 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_cache import load_training_frame  # noqa: E402
+from model_zoo import baseline_models, evaluate_models  # noqa: E402
+from preprocessing import split  # noqa: E402
+from tuning import evaluation_metrics  # noqa: E402
+
+
+def notebook_loop(models, X_train, y_train, X_test, y_test):
+    for name, model in models:
+        model.fit(X_train, y_train)
+        evaluation_metrics(model, X_train, y_train, X_test, y_test)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    from sklearn.ensemble import ExtraTreesRegressor
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    X, y = load_training_frame(os.path.join(ROOT, 'Train.csv'))
+    X_train, X_test, y_train, y_test = split(X, y)
+    data = (X_train, y_train, X_test, y_test)
+
+    _, notebook_time = timed(notebook_loop, baseline_models(), *data)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        run = dict(max_workers=args.max_workers, cache_dir=cache_dir)
+        cold, cold_time = timed(evaluate_models, baseline_models(), *data, **run)
+        warm, warm_time = timed(evaluate_models, baseline_models(), *data, **run)
+        extended = baseline_models() + [('ExtraTrees', ExtraTreesRegressor(random_state=0))]
+        added, added_time = timed(evaluate_models, extended, *data, **run)
+
+    print(cold.drop(columns='Cached').to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    print()
+    print(f"{'':<15}{'fits':>5}{'seconds':>9}")
+    for name, table, seconds in [('notebook', None, notebook_time), ('cold', cold, cold_time),
+                                 ('warm', warm, warm_time), ('one new model', added, added_time)]:
+        fits = len(baseline_models()) if table is None else int((~table['Cached']).sum())
+        print(f"{name:<15}{fits:>5}{seconds:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
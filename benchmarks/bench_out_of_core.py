@@ -0,0 +1,146 @@
+"""Out-of-core training versus the in-memory fit: peak RSS and time by data size.
+
+- in_memory: read_csv, preprocessing.preprocess and XGBRegressor.fit on the app's
+  features, as the pipeline's export stage fits them;
+- external: out_of_core.prepare (chunked shards), then an external-memory DMatrix;
+- quantile: the same shards into a QuantileDMatrix.
+
+Each run is a fresh process, so peak RSS is its own. The data are synthetic
+(synthetic_data.py, cached in .cache/bench/ and generated in a separate process).
+Each model scores a 50k-row holdout from another seed; RMSE and the largest
+prediction difference from the in-memory model are printed.
+
+Usage:
+    python benchmarks/bench_out_of_core.py --sizes 1000000 5000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ['in_memory', 'external', 'quantile']
+HOLDOUT_ROWS = 50_000
+
+
+def dataset_path(rows, seed=0):
+    path = os.path.join(ROOT, '.cache', 'bench', f'train_{rows}_seed{seed}.csv')
+    if not os.path.exists(path):
+        from synthetic_data import write_dataset
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_dataset(path, rows, source=os.path.join(ROOT, 'Train.csv'), seed=seed)
+    return path
+
+
+def in_memory(path, tmp):
+    import pandas as pd
+    from xgboost import XGBRegressor
+
+    from batch_predict import FEATURE_NAMES
+    from feature_selection import XGB_PARAMS
+    from model_artifact import build_artifact
+    from preprocessing import preprocess
+
+    start = time.perf_counter()
+    X, y, (scaler, label_encoders, ohe) = preprocess(pd.read_csv(path))
+    X = X[FEATURE_NAMES]
+    prepared_at = time.perf_counter()
+    model = XGBRegressor(**XGB_PARAMS).fit(X, y)
+    return (build_artifact(model, scaler, label_encoders, ohe, FEATURE_NAMES),
+            prepared_at - start, time.perf_counter() - prepared_at)
+
+
+def out_of_core(path, tmp, matrix):
+    from out_of_core import build, prepare, train
+
+    start = time.perf_counter()
+    prepared = prepare(path, tmp)
+    prepared_at = time.perf_counter()
+    booster = train(prepared, tmp, matrix=matrix)
+    return build(booster, prepared), prepared_at - start, time.perf_counter() - prepared_at
+
+
+def child(mode, rows, predictions_path):
+    import numpy as np
+    import pandas as pd
+
+    from batch_predict import build_features
+    from model_artifact import SalesModel
+    from tree_arrays import TreeEnsemble, flatten_booster
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if mode == 'in_memory':
+            artifact, prepare_seconds, fit_seconds = in_memory(dataset_path(rows), tmp)
+        else:
+            artifact, prepare_seconds, fit_seconds = out_of_core(dataset_path(rows), tmp, mode)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    holdout = pd.read_csv(dataset_path(HOLDOUT_ROWS, seed=1))
+    artifact['model'] = TreeEnsemble(flatten_booster(artifact['model']))
+    predictions = SalesModel(artifact).predict(build_features(holdout))
+    np.save(predictions_path, predictions)
+    rmse = float(np.sqrt(np.mean((predictions - holdout['Item_Outlet_Sales'].to_numpy()) ** 2)))
+    print(json.dumps({'prepare_seconds': prepare_seconds, 'fit_seconds': fit_seconds, 'peak_rss_mb': peak,
+                      'rmse': rmse}))
+
+
+def run_child(mode, rows, predictions_path):
+    out = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', mode, str(rows),
+                          predictions_path], capture_output=True, text=True)
+    if out.returncode:
+        return None
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 5_000_000])
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    parser.add_argument('--generate', type=int, nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        dataset_path(*args.generate)
+        return
+
+    if args.child:
+        child(args.child[0], int(args.child[1]), args.child[2])
+        return
+
+    import numpy as np
+
+    # Generate in a separate process: peak RSS survives exec, so the measured children can't inherit it
+    for rows, seed in [(HOLDOUT_ROWS, 1)] + [(rows, 0) for rows in args.sizes]:
+        subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--generate', str(rows),
+                        str(seed)], check=True)
+
+    print(f"{'rows':>10}  {'mode':<10}{'prepare s':>10}{'fit s':>8}{'peak MB':>9}{'RMSE':>8}  max diff vs in-memory")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            reference = None
+            for mode in MODES:
+                predictions_path = os.path.join(tmp, f'{mode}_{rows}.npy')
+                result = run_child(mode, rows, predictions_path)
+                if result is None:
+                    print(f"{rows:>10,}  {mode:<10}{'killed':>10}")
+                    continue
+                predictions = np.load(predictions_path)
+                line = (f"{rows:>10,}  {mode:<10}{result['prepare_seconds']:>10.2f}{result['fit_seconds']:>8.2f}"
+                        f"{result['peak_rss_mb']:>9.0f}{result['rmse']:>8.1f}")
+                if mode == 'in_memory':
+                    reference = predictions
+                elif reference is not None:
+                    line += f"  {np.abs(predictions - reference).max():.3g}"
+                print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Stage-cached pipeline: cold, warm and partial reruns, serial versus concurrent.
+
+- cold: every stage runs (empty cache);
+- warm: the same targets again, all answered from the cache;
+- tune changed: a new tuning budget, so only tune (and what reads it) reruns;
+- new data: a changed training file reruns everything from load;
+- concurrent: a cold run with --max-workers, select/tune/report in parallel.
+
+Exports go to a temporary directory, never over the repo's artifact.
+
+Usage:
+    python benchmarks/bench_pipeline.py --max-workers 3
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pipeline import DEFAULT_CONFIG, run  # noqa: E402
+
+
+def timed_run(targets, config, cache_dir, max_workers=1):
+    ran = []
+    start = time.perf_counter()
+    run(targets, config, cache_dir, max_workers, log=lambda stage, status, _: status == 'ran' and ran.append(stage))
+    return time.perf_counter() - start, ran
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-workers', type=int, default=3)
+    parser.add_argument('--max-fits', type=int, default=30, help="tune budget (the second run uses twice this)")
+    parser.add_argument('--patience', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    targets = ['select', 'tune', 'export']
+    with tempfile.TemporaryDirectory() as tmp:
+        train_path = os.path.join(tmp, 'Train.csv')
+        shutil.copy(os.path.join(ROOT, 'Train.csv'), train_path)
+        config = {**DEFAULT_CONFIG, 'train_path': train_path,
+                  'select': {**DEFAULT_CONFIG['select'], 'patience': args.patience},
+                  'tune': {**DEFAULT_CONFIG['tune'], 'max_fits': args.max_fits},
+                  'export': {**DEFAULT_CONFIG['export'], 'output_dir': os.path.join(tmp, 'out')}}
+        retuned = {**config, 'tune': {**config['tune'], 'max_fits': 2 * args.max_fits}}
+
+        cache_dir = os.path.join(tmp, 'cache')
+        rows = [('cold', *timed_run(targets, config, cache_dir)),
+                ('warm', *timed_run(targets, config, cache_dir)),
+                ('tune changed', *timed_run(targets, retuned, cache_dir))]
+        with open(train_path, 'a') as file:
+            # One more sale; a new file hash invalidates every stage
+            file.write('FDA15,9.3,Low Fat,0.016047301,Dairy,249.8092,OUT049,1999,Medium,Tier 1,'
+                       'Supermarket Type1,3735.138\n')
+        rows.append(('new data', *timed_run(targets, config, cache_dir)))
+        rows.append((f'concurrent x{args.max_workers}',
+                     *timed_run(targets, config, os.path.join(tmp, 'cache2'), args.max_workers)))
+
+    print(f"{'run':<16}{'seconds':>9}  stages run")
+    for name, seconds, ran in rows:
+        print(f"{name:<16}{seconds:>9.2f}  {' '.join(ran) or '-'}")
+    print(f"\n{os.cpu_count()} CPU(s); concurrency helps only with more than one core")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Parity and latency of the precomputed prediction table versus the model.
+
+Checks the table against SalesModel.predict on random inputs covering the whole
+app input space (exits non-zero on mismatch), then times single-row and batch
+lookups against the model.
+
+Usage:
+    python benchmarks/bench_prediction_table.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from model_artifact import load_artifact  # noqa: E402
+from prediction_table import AGE_RANGE, PredictionTable  # noqa: E402
+
+
+def random_inputs(n_rows, seed=0):
+    # Same encoding as the app's widgets
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(0, 4, n_rows),
+        rng.integers(0, 2, n_rows),
+        rng.uniform(0, 300, n_rows).round(2),
+        rng.integers(0, 2, n_rows),
+        rng.integers(AGE_RANGE[0], AGE_RANGE[1] + 1, n_rows),
+        rng.integers(0, 2, n_rows),
+    ]).astype(np.float64)
+
+
+def per_call_us(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--artifact', default=os.path.join(ROOT, 'sales_prediction_artifact.json'))
+    parser.add_argument('--table', default=os.path.join(ROOT, 'sales_prediction_table.bin'))
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    model = load_artifact(args.artifact, backend='numpy')
+    table = PredictionTable.load(args.table)
+    features = random_inputs(args.rows)
+
+    expected = model.predict(features)
+    actual = table.predict(features)
+    worst = np.abs(actual - expected).max()
+    if not np.allclose(actual, expected, rtol=1e-5, atol=1e-2):
+        raise SystemExit(f"Parity check FAILED: max abs diff {worst}")
+    single = np.array([table.predict_one(row) for row in features[:1000].tolist()], dtype=np.float32)
+    if not np.array_equal(single, actual[:1000]):
+        raise SystemExit("Parity check FAILED: predict_one disagrees with predict")
+    print(f"Parity check passed on {len(features)} rows (max abs diff {worst:.2e})")
+    print(f"table: {os.path.getsize(args.table) / 1024:.1f} KB, {table.n_intervals} MRP intervals")
+
+    rows = features[:2000].tolist()
+    model_us = per_call_us(lambda row: model.predict([row])[0], rows[:500])
+    table_us = per_call_us(table.predict_one, rows)
+    print(f"single row: model {model_us:8.1f} us   table {table_us:8.2f} us   ({model_us / table_us:,.0f}x)")
+
+    start = time.perf_counter()
+    model.predict(features)
+    model_s = time.perf_counter() - start
+    start = time.perf_counter()
+    table.predict(features)
+    table_s = time.perf_counter() - start
+    print(f"batch of {len(features)}: model {len(features) / model_s:12,.0f} rows/sec   "
+          f"table {len(features) / table_s:12,.0f} rows/sec")
+
+
+if __name__ == '__main__':
+    main()
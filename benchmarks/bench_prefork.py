@@ -0,0 +1,91 @@
+"""Throughput scaling and per-worker memory of the pre-fork prediction server.
+
+For each worker count, starts `prediction_server.py --workers N`, drives it from
+several load-generator processes, and reports QPS plus each worker's RSS and PSS
+(proportional set size, which splits shared pages between the processes mapping
+them). A single-process server that loads the artifact itself is the baseline.
+
+Usage:
+    python benchmarks/bench_prefork.py --workers 1 2 4 8 --duration 5
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_generator import run_load, wait_for_port  # noqa: E402
+
+
+def memory_kb(pid):
+    """(RSS, PSS) of a process in KB, from /proc."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as file:
+        for line in file:
+            name, _, rest = line.partition(':')
+            if name in ('Rss', 'Pss'):
+                values[name] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def worker_pids(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as file:
+        return [int(child) for child in file.read().split()]
+
+
+def client_process(args):
+    host, port, concurrency, duration = args
+    latencies, elapsed = asyncio.run(run_load(host, port, concurrency, duration, 0))
+    return len(latencies), elapsed
+
+
+def measure(command, workers, args):
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.host, args.port)
+        pids = worker_pids(server.pid) if workers else [server.pid]
+        # Warm every worker up before sampling memory
+        with multiprocessing.Pool(args.clients) as pool:
+            pool.map(client_process, [(args.host, args.port, args.concurrency, 0.5)] * args.clients)
+            start = time.perf_counter()
+            results = pool.map(client_process, [(args.host, args.port, args.concurrency, args.duration)] * args.clients)
+            elapsed = time.perf_counter() - start
+        memory = [memory_kb(pid) for pid in pids]
+    finally:
+        server.terminate()
+        server.wait()
+    requests = sum(count for count, _ in results)
+    return requests / elapsed, memory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8010)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--clients', type=int, default=max(2, os.cpu_count() or 1), help="load-generator processes")
+    parser.add_argument('--concurrency', type=int, default=16, help="connections per load-generator process")
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    server = [sys.executable, os.path.join(ROOT, 'prediction_server.py'), '--host', args.host, '--port', str(args.port)]
+    print(f"{os.cpu_count()} CPUs, {args.clients} client processes x {args.concurrency} connections")
+    print(f"{'workers':<22}{'QPS':>10}{'RSS/worker MB':>16}{'PSS/worker MB':>16}")
+
+    qps, memory = measure(server, 0, args)
+    print(f"{'1 (own model copy)':<22}{qps:>10,.0f}{memory[0][0] / 1024:>16.1f}{memory[0][1] / 1024:>16.1f}")
+    for workers in sorted(set(args.workers)):
+        qps, memory = measure(server + ['--workers', str(workers)], workers, args)
+        rss = sum(m[0] for m in memory) / len(memory) / 1024
+        pss = sum(m[1] for m in memory) / len(memory) / 1024
+        print(f"{workers:<22}{qps:>10,.0f}{rss:>16.1f}{pss:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""What-if MRP sweeps: scoring every point versus price_sweep.PriceSweep, time and peak RSS.
+
+- naive: build the items x outlets x grid feature matrix (batch_predict.build_features)
+  and score it with the xgboost backend, the fastest per-row path the repo has;
+- sweep: PriceSweep over the same product, consuming the streamed chunks.
+
+Each run is a fresh process, so peak RSS is its own. The items are synthetic
+(synthetic_data.make_catalog), at all 10 Big Mart outlets. The sweep run also
+rescores a 100k-point sample of its output with the NumPy backend and prints the
+largest difference.
+
+Usage:
+    python benchmarks/bench_price_sweep.py --items 1000 10000 100000 --points 241
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ['naive', 'sweep']
+GRID = (30.0, 270.0)
+SAMPLE_ROWS = 100_000
+
+
+def items_and_outlets(n_items):
+    import pandas as pd
+
+    from synthetic_data import learn_profile, make_catalog
+
+    profile = learn_profile(pd.read_csv(os.path.join(ROOT, 'Train.csv')))
+    items = make_catalog(profile, n_items)[['Item_Identifier', 'Item_MRP']].reset_index(drop=True)
+    return items, profile['outlets'].reset_index()
+
+
+def naive(items, outlets, grid):
+    import numpy as np
+
+    from batch_predict import build_features, load_model, predict_features
+
+    model = load_model(os.path.join(ROOT, 'sales_prediction_artifact.json'))
+    product = items[['Item_Identifier']].merge(outlets, how='cross')
+    product = product.loc[product.index.repeat(len(grid))].reset_index(drop=True)
+    product['Item_MRP'] = np.tile(grid, len(product) // len(grid))
+    return len(predict_features(model, build_features(product))), None
+
+
+def sweep(items, outlets, grid):
+    from price_sweep import PriceSweep
+
+    engine = PriceSweep(numpy_model(), outlets)
+    rows, sample = 0, []
+    for chunk in engine.sweep(items, grid):
+        rows += len(chunk)
+        if len(sample) * len(chunk) < SAMPLE_ROWS:
+            sample.append(chunk.iloc[::max(1, len(chunk) // 10_000)])
+    return rows, sample
+
+
+def numpy_model():
+    from model_artifact import load_artifact
+
+    return load_artifact(os.path.join(ROOT, 'sales_prediction_artifact.json'), backend='numpy')
+
+
+def max_difference(sample, outlets):
+    import numpy as np
+    import pandas as pd
+
+    from batch_predict import build_features
+
+    sample = pd.concat(sample)
+    rows = outlets.set_index('Outlet_Identifier').loc[sample['Outlet_Identifier'].astype(str)].reset_index()
+    rows['Item_MRP'] = sample['Item_MRP'].to_numpy()
+    expected = numpy_model().predict(build_features(rows))
+    return float(np.abs(expected - sample['Item_Outlet_Sales'].to_numpy()).max())
+
+
+def child(mode, n_items, points):
+    import numpy as np
+
+    items, outlets = items_and_outlets(n_items)
+    grid = np.linspace(*GRID, points)
+    start = time.perf_counter()
+    rows, sample = (naive if mode == 'naive' else sweep)(items, outlets, grid)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'rows': rows, 'seconds': seconds, 'peak_rss_mb': peak,
+                      'max_diff': max_difference(sample, outlets) if sample else None}))
+
+
+def run_child(mode, n_items, points):
+    out = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', mode, str(n_items),
+                          str(points)], capture_output=True, text=True)
+    if out.returncode:
+        return None
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[1000, 10_000, 100_000])
+    parser.add_argument('--points', type=int, default=241, help="MRP grid points over 30-270")
+    parser.add_argument('--naive-max-rows', type=int, default=30_000_000,
+                        help="skip the naive run above this many points")
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child[0], int(args.child[1]), int(args.child[2]))
+        return
+
+    print(f"{'items':>8}  {'points':>12}  {'mode':<6}{'seconds':>9}{'M points/s':>12}{'peak MB':>9}  max diff")
+    for n_items in args.items:
+        for mode in MODES:
+            rows = n_items * 10 * args.points
+            if mode == 'naive' and rows > args.naive_max_rows:
+                print(f"{n_items:>8,}  {rows:>12,}  {mode:<6}{'skipped':>9}")
+                continue
+            result = run_child(mode, n_items, args.points)
+            if result is None:
+                print(f"{n_items:>8,}  {rows:>12,}  {mode:<6}{'killed':>9}")
+                continue
+            line = (f"{n_items:>8,}  {result['rows']:>12,}  {mode:<6}{result['seconds']:>9.2f}"
+                    f"{result['rows'] / result['seconds'] / 1e6:>12.1f}{result['peak_rss_mb']:>9.0f}")
+            if result['max_diff'] is not None:
+                line += f"  {result['max_diff']:.3g}"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
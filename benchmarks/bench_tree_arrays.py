@@ -0,0 +1,74 @@
+"""Parity and latency of the NumPy tree evaluator versus XGBRegressor.predict.
+
+First checks that TreeEnsemble reproduces `XGBRegressor.predict` on every row of
+Train.csv (exits non-zero otherwise), then times both for several batch sizes.
+
+Usage:
+    python benchmarks/bench_tree_arrays.py --batch-sizes 1 10 100 1000
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batch_predict import build_features  # noqa: E402
+from model_artifact import load_artifact  # noqa: E402
+from tree_arrays import TreeEnsemble, flatten_booster  # noqa: E402
+
+
+def check_parity(model, ensemble, features, rtol=1e-5, atol=1e-2):
+    expected = model.predict(features)
+    actual = ensemble.predict(features)
+    # Leaf choice must match exactly; only the float32 summation order may differ
+    worst = np.abs(actual - expected).max()
+    if not np.allclose(actual, expected, rtol=rtol, atol=atol):
+        raise SystemExit(f"Parity check FAILED: max abs diff {worst}")
+    print(f"Parity check passed on {len(features)} rows (max abs diff {worst:.2e})")
+
+
+def latency_us(predict, features, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(features)
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(ROOT, 'Train.csv'))
+    parser.add_argument('--model', default=os.path.join(ROOT, 'sales_prediction_model.pkl'))
+    parser.add_argument('--artifact', default=os.path.join(ROOT, 'sales_prediction_artifact.json'))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000, 8523])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with open(args.model, 'rb') as file:
+        model = pickle.load(file)
+    ensemble = TreeEnsemble(flatten_booster(model))
+
+    # Scaled features exactly as the model sees them
+    artifact = load_artifact(args.artifact)
+    features = artifact.transform(build_features(pd.read_csv(args.data)))
+    check_parity(model, ensemble, features)
+
+    print(f"{'batch':>7}{'XGBRegressor us':>18}{'TreeEnsemble us':>18}{'speedup':>9}")
+    for batch_size in args.batch_sizes:
+        batch = features[:batch_size]
+        repeat = max(3, args.repeat // max(1, batch_size // 100))
+        xgb_us = latency_us(model.predict, batch, repeat)
+        numpy_us = latency_us(ensemble.predict, batch, repeat)
+        print(f"{len(batch):>7}{xgb_us:>18.1f}{numpy_us:>18.1f}{xgb_us / numpy_us:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
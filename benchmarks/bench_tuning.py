@@ -0,0 +1,70 @@
+"""Wall-clock and fit count of the notebook's GridSearchCV versus tuning.py.
+
+For each model, the exhaustive 5-fold GridSearchCV from section 7 of
+salesprediction.py is run next to the budgeted search from tuning.py, and both
+best models are scored on the notebook's train/test split.
+
+Usage:
+    python benchmarks/bench_tuning.py --models XGB --max-fits 150
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_cache import load_training_frame  # noqa: E402
+from preprocessing import split  # noqa: E402
+from tuning import PARAM_GRIDS, evaluation_metrics, tune  # noqa: E402
+
+
+def grid_search(name, X_train, y_train, n_jobs):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Lasso, Ridge
+    from sklearn.model_selection import GridSearchCV
+    from xgboost import XGBRegressor
+
+    estimator = {'Ridge': Ridge(), 'Lasso': Lasso(), 'RandomForest': RandomForestRegressor(random_state=0),
+                 'XGB': XGBRegressor(random_state=0)}[name]
+    search = GridSearchCV(estimator, PARAM_GRIDS[name], cv=5, scoring='r2', n_jobs=n_jobs)
+    search.fit(X_train, y_train)
+    return search.best_estimator_
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--models', nargs='+', choices=list(PARAM_GRIDS), default=['XGB'])
+    parser.add_argument('--max-fits', type=int, default=None)
+    parser.add_argument('--time-budget', type=float, default=None)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args(argv)
+
+    X, y = load_training_frame(os.path.join(ROOT, 'Train.csv'))
+    X_train, X_test, y_train, y_test = split(X, y)
+
+    rows = []
+    for name in args.models:
+        start = time.perf_counter()
+        model = grid_search(name, X_train, y_train, args.n_jobs)
+        grid_time = time.perf_counter() - start
+        rows.append({'Model': name, 'Search': 'grid', 'Seconds': grid_time,
+                     **evaluation_metrics(model, X_train, y_train, X_test, y_test)})
+
+        start = time.perf_counter()
+        results, best_params = tune(X_train, y_train, X_test, y_test, models=[name], n_jobs=args.n_jobs,
+                                    max_fits=args.max_fits, time_budget=args.time_budget)
+        rows.append({'Model': name, 'Search': 'budgeted', 'Seconds': time.perf_counter() - start,
+                     **results.iloc[0].drop('Model').to_dict()})
+        print(f"{name}: budgeted search picked {best_params[name]}")
+
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Load generator for prediction_server.py: reports p50/p99 latency and QPS.
+
+Opens `--concurrency` keep-alive connections and sends single-row /predict
+requests (or /predict/batch requests with `--batch-rows`) for `--duration` seconds.
+
+Usage:
+    python prediction_server.py --port 8000 &
+    python benchmarks/load_generator.py --port 8000 --concurrency 64 --duration 10
+
+    # or let the load generator start (and stop) the server itself
+    python benchmarks/load_generator.py --spawn --max-wait-ms 2 --max-batch-size 256
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_row(rng):
+    return {
+        'outlet_type': rng.randrange(4),
+        'outlet_identifier_out027': rng.choice(['Other', 'OUT027']),
+        'item_mrp': round(rng.uniform(30, 270), 2),
+        'outlet_identifier_out019': rng.choice(['Other', 'OUT019']),
+        'outlet_age': rng.randrange(0, 40),
+        'outlet_identifier_out035': rng.choice(['Other', 'OUT035']),
+    }
+
+
+async def client(host, port, deadline, batch_rows, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            if batch_rows:
+                path, payload = '/predict/batch', {'rows': [random_row(rng) for _ in range(batch_rows)]}
+            else:
+                path, payload = '/predict', random_row(rng)
+            body = json.dumps(payload).encode()
+            start = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            if b' 200 ' not in status:
+                raise RuntimeError(f"unexpected response: {status!r}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, duration, batch_rows):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, deadline, batch_rows, latencies, seed)
+                           for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return np.array(latencies) * 1000, elapsed
+
+
+def wait_for_port(host, port, timeout=30.0):
+    import socket
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on {host}:{port} did not come up")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds")
+    parser.add_argument('--batch-rows', type=int, default=0, help="rows per /predict/batch request; 0 = /predict")
+    parser.add_argument('--spawn', action='store_true', help="start prediction_server.py for the run")
+    parser.add_argument('--max-batch-size', type=int, default=256, help="server setting, with --spawn")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help="server setting, with --spawn")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'prediction_server.py'),
+                                   '--host', args.host, '--port', str(args.port),
+                                   '--max-batch-size', str(args.max_batch_size),
+                                   '--max-wait-ms', str(args.max_wait_ms)],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.host, args.port)
+        latencies, elapsed = asyncio.run(run_load(args.host, args.port, args.concurrency,
+                                                  args.duration, args.batch_rows))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    rows = len(latencies) * max(1, args.batch_rows)
+    print(f"requests: {len(latencies)}  concurrency: {args.concurrency}  duration: {elapsed:.1f}s")
+    print(f"QPS: {len(latencies) / elapsed:,.0f}  rows/sec: {rows / elapsed:,.0f}")
+    print(f"latency ms  p50: {np.percentile(latencies, 50):.2f}  p99: {np.percentile(latencies, 99):.2f}  "
+          f"max: {latencies.max():.2f}")
+
+
+if __name__ == '__main__':
+    main()
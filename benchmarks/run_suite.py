@@ -0,0 +1,291 @@
+"""End-to-end benchmark suite with a stored baseline and a regression check.
+
+Every stage of salesprediction.py, as the repo's modules now run it, is timed at
+several data sizes, followed by app.py-style serving:
+    load          read_csv of the raw training file
+    clean         imputation and Outlet_Size pivot (preprocessing.clean)
+    encode        ordinal/label/one-hot encoding (preprocessing.encode)
+    scale         sqrt transform and standard scaling (preprocessing.transform)
+    split         the notebook's train/test split
+    model_zoo     baseline comparison (model_zoo.evaluate_models, empty cache)
+    tune          hyperparameter search (tuning.tune)
+    select        RFE subset evaluation (feature_selection.select_features)
+    final_fit     XGBoost on the selected features
+    predict_one   one app-style prediction per call (median latency)
+    predict_batch batch_predict.predict_batch over the whole frame
+
+Sizes other than Train.csv's are generated with synthetic_data.py and cached
+under .cache/bench/. Each size runs in a fresh interpreter, and every stage
+records its wall-clock time and the process's peak RSS at the end of the stage.
+The 'quick' profile caps the expensive stages (row limits, a small tuning
+budget, fewer RFE subsets) so a full run takes minutes; 'full' runs the
+notebook's settings.
+
+Results are written as JSON and compared with a baseline file: any stage whose
+time or peak memory grew by more than `--threshold` is reported and the exit
+status is 1.
+
+Usage:
+    python benchmarks/run_suite.py --sizes 8523 100000 1000000 --output results.json
+    python benchmarks/run_suite.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DATA_DIR = os.path.join(ROOT, '.cache', 'bench')
+TRAIN_ROWS = 8523
+DEFAULT_SIZES = [TRAIN_ROWS, 100_000, 1_000_000]
+
+# Stages skipped above these row counts in the 'quick' profile (SVR in the zoo is quadratic)
+QUICK_ROW_LIMITS = {'model_zoo': 20_000, 'tune': 200_000, 'select': 200_000}
+# Changes smaller than these are noise, whatever the relative threshold
+MIN_DELTA = {'seconds': 0.05, 'peak_rss_mb': 10.0}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dataset_path(rows):
+    if rows == TRAIN_ROWS:
+        return os.path.join(ROOT, 'Train.csv')
+    path = os.path.join(DATA_DIR, f'train_{rows}_seed0.csv')
+    if not os.path.exists(path):
+        from synthetic_data import write_dataset
+
+        os.makedirs(DATA_DIR, exist_ok=True)
+        write_dataset(path, rows, source=os.path.join(ROOT, 'Train.csv'), seed=0)
+    return path
+
+
+def stage_load(ctx):
+    import pandas as pd
+
+    ctx['raw'] = pd.read_csv(ctx['path'])
+
+
+def stage_clean(ctx):
+    from preprocessing import clean
+
+    ctx['df'] = clean(ctx['raw'])
+
+
+def stage_encode(ctx):
+    from preprocessing import encode
+
+    ctx['df'], _, _ = encode(ctx['df'])
+
+
+def stage_scale(ctx):
+    from preprocessing import DEFAULT_CONFIG, TARGET, transform
+
+    df, _ = transform(ctx['df'])
+    ctx['X'], ctx['y'] = df.drop(DEFAULT_CONFIG['dropped_columns'], axis=1), df[TARGET]
+    del ctx['df']
+
+
+def stage_split(ctx):
+    from preprocessing import split
+
+    ctx['X_train'], ctx['X_test'], ctx['y_train'], ctx['y_test'] = split(ctx['X'], ctx['y'])
+
+
+def stage_model_zoo(ctx):
+    import tempfile
+
+    from model_zoo import baseline_models, evaluate_models
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        evaluate_models(baseline_models(), ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'],
+                        cache_dir=cache_dir)
+
+
+def stage_tune(ctx):
+    from tuning import PARAM_GRIDS, tune
+
+    if ctx['profile'] == 'quick':
+        tune(ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'], models=['Ridge', 'Lasso', 'XGB'],
+             max_fits=30)
+    else:
+        tune(ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'], models=list(PARAM_GRIDS))
+
+
+def stage_select(ctx):
+    from feature_selection import select_features
+
+    kwargs = {'max_features': 8, 'patience': 3} if ctx['profile'] == 'quick' else {}
+    _, ctx['selected'] = select_features(ctx['X_train'], ctx['y_train'], **kwargs)
+
+
+def stage_final_fit(ctx):
+    from xgboost import XGBRegressor
+
+    from batch_predict import FEATURE_NAMES
+    from feature_selection import XGB_PARAMS
+
+    features = ctx.get('selected', FEATURE_NAMES)
+    XGBRegressor(**XGB_PARAMS).fit(ctx['X_train'][features], ctx['y_train'])
+
+
+def stage_predict_one(ctx):
+    import numpy as np
+
+    from batch_predict import build_features
+    from model_artifact import load_artifact
+
+    model = load_artifact()
+    rows = build_features(ctx['raw'].iloc[:1000])
+    latencies = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict(row[np.newaxis])
+        latencies.append(time.perf_counter() - start)
+    return {'latency_us': float(np.median(latencies) * 1e6)}
+
+
+def stage_predict_batch(ctx):
+    from batch_predict import load_model, predict_batch
+
+    predictions = predict_batch(load_model(), ctx['raw'])
+    return {'rows_per_second': len(predictions) / ctx['elapsed']()}
+
+
+STAGES = [('load', stage_load), ('clean', stage_clean), ('encode', stage_encode), ('scale', stage_scale),
+          ('split', stage_split), ('model_zoo', stage_model_zoo), ('tune', stage_tune), ('select', stage_select),
+          ('final_fit', stage_final_fit), ('predict_one', stage_predict_one),
+          ('predict_batch', stage_predict_batch)]
+
+
+def run_stages(rows, profile, stages):
+    """Run the stages for one data size in this process; returns {stage: metrics}."""
+    ctx = {'path': dataset_path(rows), 'profile': profile}
+    results = {}
+    for name, stage in STAGES:
+        if name not in stages:
+            continue
+        if profile == 'quick' and rows > QUICK_ROW_LIMITS.get(name, rows):
+            continue
+        start = time.perf_counter()
+        ctx['elapsed'] = lambda: time.perf_counter() - start
+        extra = stage(ctx) or {}
+        results[name] = {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb(), **extra}
+    return results
+
+
+def run_size(rows, profile, stages):
+    # Generate in a separate process: peak RSS survives fork/exec, so the measured child must not inherit it
+    subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--generate', str(rows)],
+                   check=True, cwd=ROOT)
+    out = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', str(rows),
+                          '--profile', profile, '--stages', *stages],
+                         check=True, capture_output=True, text=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def best_of(runs):
+    """Per stage, the fastest run's metrics (memory: the lowest peak)."""
+    merged = {}
+    for stage in runs[0]:
+        merged[stage] = dict(min((run[stage] for run in runs), key=lambda metrics: metrics['seconds']))
+        merged[stage]['peak_rss_mb'] = min(run[stage]['peak_rss_mb'] for run in runs)
+    return merged
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=ROOT, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """(size, stage, metric, baseline, current) for every metric that regressed by more than `threshold`."""
+    regressions = []
+    for size, stages in results['results'].items():
+        for stage, metrics in stages.items():
+            reference = baseline.get('results', {}).get(size, {}).get(stage)
+            if reference is None:
+                continue
+            for metric, min_delta in MIN_DELTA.items():
+                before, after = reference[metric], metrics[metric]
+                if after > before * (1 + threshold) and after - before > min_delta:
+                    regressions.append((size, stage, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--profile', choices=['quick', 'full'], default='quick')
+    parser.add_argument('--stages', nargs='+', choices=[name for name, _ in STAGES],
+                        default=[name for name, _ in STAGES])
+    parser.add_argument('--repeat', type=int, default=1, help="runs per size; the best is kept")
+    parser.add_argument('--output', help="write the results JSON here")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--generate', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.generate is not None:
+        dataset_path(args.generate)
+        return
+
+    if args.child is not None:
+        print(json.dumps(run_stages(args.child, args.profile, args.stages)))
+        return
+
+    results = {
+        'meta': {'revision': git_revision(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                 'python': platform.python_version(), 'machine': platform.machine(),
+                 'cpu_count': os.cpu_count(), 'profile': args.profile},
+        'results': {},
+    }
+    print(f"{'rows':>10}  {'stage':<14}{'seconds':>9}{'peak MB':>9}")
+    for rows in args.sizes:
+        stages = best_of([run_size(rows, args.profile, args.stages) for _ in range(args.repeat)])
+        results['results'][str(rows)] = stages
+        for stage, metrics in stages.items():
+            print(f"{rows:>10,}  {stage:<14}{metrics['seconds']:>9.3f}{metrics['peak_rss_mb']:>9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline['meta'].get('profile') != args.profile:
+        raise ValueError(f"baseline profile {baseline['meta'].get('profile')!r} does not match {args.profile!r}")
+    regressions = compare(results, baseline, args.threshold)
+    for size, stage, metric, before, after in regressions:
+        print(f"REGRESSION {stage} at {int(size):,} rows: {metric} {before:.3f} -> {after:.3f} "
+              f"({after / before - 1:+.0%})")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions over {args.threshold:.0%} against {args.baseline} "
+          f"(revision {baseline['meta'].get('revision')})")
+
+
+if __name__ == '__main__':
+    main()
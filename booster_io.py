@@ -0,0 +1,37 @@
+"""Save and load the model in XGBoost's native booster format.
+
+Pickling an XGBRegressor ties the file to the exact xgboost/sklearn versions and
+unpickling it imports the whole sklearn wrapper. The native JSON/UBJSON format
+only holds the trees, loads straight into a bare `xgboost.Booster`, and is
+predicted with `inplace_predict` (no DMatrix construction per call).
+"""
+
+import numpy as np
+
+NATIVE_FORMATS = ('.json', '.ubj')
+
+
+def export_booster(model, path):
+    """Write an XGBRegressor (or Booster) to `path`; the extension picks JSON or UBJSON."""
+    if not path.endswith(NATIVE_FORMATS):
+        raise ValueError(f"Native booster path must end with one of {NATIVE_FORMATS}: {path}")
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    booster.save_model(path)
+
+
+def load_booster(path):
+    """Build a bare Booster from a native model file."""
+    import xgboost as xgb
+
+    return xgb.Booster(model_file=path)
+
+
+class NativeBooster:
+    """Minimal `predict` interface over a bare Booster, so it can stand in for XGBRegressor."""
+
+    def __init__(self, path):
+        self.booster = load_booster(path)
+        self.feature_names = self.booster.feature_names
+
+    def predict(self, features):
+        return self.booster.inplace_predict(np.asarray(features), validate_features=False)
@@ -0,0 +1,124 @@
+"""Streaming, schema-typed loading and cleaning of Big Mart sales extracts.
+
+salesprediction.py reads Train.csv/Test.csv whole with inferred dtypes (object
+columns, float64/int64 numerics) and copies them before cleaning. Here the files
+are read in chunks with a declared schema: categorical dtype for the repetitive
+string columns and float32 for numerics. Cleaning (the same steps as section 3 of
+the notebook) is applied per chunk and chunks are yielded from a generator, so
+peak memory depends on the chunk size, not on the input size.
+
+The dataset-wide statistics the cleaning needs (mean Item_Weight, Outlet_Size mode
+per Outlet_Type) are computed in a first streaming pass, or can be passed in,
+e.g. the training statistics when cleaning new data.
+
+Usage:
+    for chunk in iter_clean_chunks('Train.csv', chunksize=100_000):
+        ...
+"""
+
+import numpy as np
+import pandas as pd
+
+from model_artifact import FAT_CONTENT_MAP
+
+CATEGORICAL_COLUMNS = ['Item_Identifier', 'Item_Type', 'Outlet_Identifier', 'Outlet_Size',
+                       'Outlet_Location_Type', 'Outlet_Type']
+FLOAT_COLUMNS = ['Item_Weight', 'Item_Visibility', 'Item_MRP', 'Item_Outlet_Sales']
+
+SCHEMA = {
+    **{col: 'category' for col in CATEGORICAL_COLUMNS},
+    **{col: np.float32 for col in FLOAT_COLUMNS},
+    # Raw values are irregular ('LF', 'low fat', 'reg', ...) until cleaned
+    'Item_Fat_Content': 'category',
+    'Outlet_Establishment_Year': np.int16,
+}
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNK_SIZE, usecols=None):
+    """Yield raw chunks of a Train.csv/Test.csv-shaped file, typed with SCHEMA."""
+    with pd.read_csv(path, dtype=SCHEMA, usecols=usecols, chunksize=chunksize) as reader:
+        yield from reader
+
+
+def compute_cleaning_stats(path, chunksize=DEFAULT_CHUNK_SIZE, categories=()):
+    """One streaming pass for the statistics `clean_chunk` needs.
+
+    The distinct raw values of the `categories` columns, sorted, can be collected in
+    the same pass (under 'categories'), e.g. to fit encoders without loading the file.
+    """
+    weight_sum = 0.0
+    weight_count = 0
+    size_counts = None
+    seen = {col: set() for col in categories}
+    usecols = ['Item_Weight', 'Outlet_Size', 'Outlet_Type'] + [col for col in categories if col != 'Outlet_Type']
+    for chunk in read_chunks(path, chunksize, usecols=usecols):
+        weights = chunk['Item_Weight'].to_numpy(dtype=np.float64)
+        weight_sum += np.nansum(weights)
+        weight_count += int(np.count_nonzero(~np.isnan(weights)))
+        counts = chunk.groupby(['Outlet_Type', 'Outlet_Size'], observed=True).size()
+        size_counts = counts if size_counts is None else size_counts.add(counts, fill_value=0)
+        for col, values in seen.items():
+            values.update(chunk[col].dropna().unique())
+    stats = {
+        'item_weight_mean': float(weight_sum / weight_count) if weight_count else float('nan'),
+        'outlet_size_mode': _mode_by_outlet_type(size_counts),
+    }
+    if categories:
+        stats['categories'] = {col: sorted(values) for col, values in seen.items()}
+    return stats
+
+
+def _mode_by_outlet_type(size_counts):
+    modes = {}
+    if size_counts is None:
+        return modes
+    for (outlet_type, outlet_size), count in sorted(size_counts.items()):
+        # Ties go to the first size in sorted order, like Series.mode()[0]
+        if outlet_type not in modes or count > modes[outlet_type][1]:
+            modes[outlet_type] = (outlet_size, count)
+    return {outlet_type: size for outlet_type, (size, _) in modes.items()}
+
+
+def clean_chunk(chunk, stats):
+    """Impute Item_Weight and Outlet_Size and normalize Item_Fat_Content, in place."""
+    if 'Item_Weight' in chunk:
+        chunk['Item_Weight'] = chunk['Item_Weight'].fillna(np.float32(stats['item_weight_mean']))
+
+    if 'Outlet_Size' in chunk and 'Outlet_Type' in chunk:
+        sizes = chunk['Outlet_Size']
+        missing = sizes.isna().to_numpy()
+        if missing.any():
+            fill = chunk['Outlet_Type'].map(stats['outlet_size_mode']).astype(object)
+            known = set(stats['outlet_size_mode'].values())
+            sizes = sizes.cat.add_categories(sorted(known - set(sizes.cat.categories)))
+            chunk['Outlet_Size'] = sizes.where(~missing, fill)
+
+    if 'Item_Fat_Content' in chunk:
+        # Maps the (few) categories, not every row
+        chunk['Item_Fat_Content'] = chunk['Item_Fat_Content'].map(
+            lambda value: FAT_CONTENT_MAP.get(value, value)).astype('category')
+    return chunk
+
+
+def iter_clean_chunks(path, chunksize=DEFAULT_CHUNK_SIZE, stats=None, usecols=None):
+    """Yield cleaned, schema-typed chunks; computes `stats` in a first pass if not given."""
+    if stats is None:
+        stats = compute_cleaning_stats(path, chunksize)
+    for chunk in read_chunks(path, chunksize, usecols=usecols):
+        yield clean_chunk(chunk, stats)
+
+
+def concat_chunks(chunks):
+    """Concatenate chunks into one frame, unioning the per-chunk categories."""
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    columns = {}
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            columns[col] = pd.api.types.union_categoricals([chunk[col] for chunk in chunks])
+        else:
+            columns[col] = np.concatenate([chunk[col].to_numpy() for chunk in chunks])
+    return pd.DataFrame(columns)
@@ -0,0 +1,258 @@
+"""Single-pass data-quality profile of Big Mart extracts, over chunks.
+
+Section 3-4 of salesprediction.py checks data quality with four separate scans:
+- `check_missing_values`: null counts;
+- `detect_outliers`: IQR bounds per column;
+- `calculate_skewness`;
+- `categorical_cols`: cardinalities.
+`detect_outliers` also recomputes quantiles column by column and `pd.concat`s the
+outlier rows into ever-growing frames, then returns nothing.
+
+`profile` computes all of it in one pass over a frame, a file read in chunks
+(see data_loading.py), or any iterable of chunks, for every column at once.
+It returns one report row per column:
+- kind, count, nulls and distinct values;
+- min/max, mean, std and skewness, which match pandas, merged across chunks with
+  exact moment updates;
+- Q1/median/Q3, IQR bounds and outlier counts.
+
+Quantiles are exact while a column has at most `exact_limit` values. Beyond that
+they come from a mergeable sketch of `sketch_size` weighted points, and distinct
+counts beyond `distinct_limit` come from a k-minimum-values estimate; the report
+flags such rows as approximate. `outlier_masks` turns the bounds into boolean
+masks for any frame or chunk, so no rows are copied.
+
+Usage:
+    python data_profile.py Train.csv Test.csv --chunksize 100000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_loading import DEFAULT_CHUNK_SIZE, read_chunks
+
+REPORT_COLUMNS = ['kind', 'count', 'nulls', 'null_fraction', 'distinct', 'min', 'max', 'mean', 'std', 'skew',
+                  'q1', 'median', 'q3', 'iqr', 'lower', 'upper', 'outliers', 'approximate']
+
+IQR_FACTOR = 1.5
+EXACT_LIMIT = 1_000_000
+SKETCH_SIZE = 4096
+DISTINCT_LIMIT = 100_000
+KMV_SIZE = 4096
+
+
+class QuantileSketch:
+    """Sorted values while small, then a fixed number of equal-weight points.
+
+    `quantile` matches numpy's default (linear) method while the sketch is exact.
+    """
+
+    def __init__(self, exact_limit=EXACT_LIMIT, size=SKETCH_SIZE):
+        self.exact_limit = exact_limit
+        self.size = size
+        self.parts = []
+        self.count = 0
+        self.exact = True
+        self._values = self._weights = None
+
+    def update(self, values):
+        if not len(values):
+            return
+        self.count += len(values)
+        self._values = None
+        if self.exact:
+            self.parts.append((values, None))
+            if self.count > self.exact_limit:
+                self.exact = False
+                self._compress()
+            return
+        values = np.sort(values)
+        if len(values) > self.size:
+            # Summarize the chunk on its own first; merging summaries keeps the compressions few
+            ranks = ((np.arange(self.size) + 0.5) * len(values) / self.size).astype(np.intp)
+            self.parts.append((values[ranks], np.full(self.size, len(values) / self.size)))
+        else:
+            self.parts.append((values, np.ones(len(values))))
+        if sum(len(part) for part, _ in self.parts) > 32 * self.size:
+            self._compress()
+
+    def _merged(self):
+        if self._values is None:
+            values = np.concatenate([part for part, _ in self.parts])
+            if self.exact:
+                self._values, self._weights = np.sort(values), None
+            else:
+                weights = np.concatenate([np.ones(len(part)) if weight is None else weight
+                                          for part, weight in self.parts])
+                order = np.argsort(values)
+                self._values, self._weights = values[order], weights[order]
+            self.parts = [(self._values, self._weights)]
+        return self._values, self._weights
+
+    def _compress(self):
+        values, weights = self._merged()
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        # `size` points of equal weight, each at the value its rank midpoint falls on
+        targets = (np.arange(self.size) + 0.5) * total / self.size
+        points = values[np.searchsorted(cumulative, targets).clip(max=len(values) - 1)]
+        self._values, self._weights = points, np.full(self.size, total / self.size)
+        self.parts = [(self._values, self._weights)]
+
+    def quantile(self, q):
+        if not self.count:
+            return np.full(np.shape(q), np.nan)
+        values, weights = self._merged()
+        if self.exact:
+            return np.quantile(values, q)
+        midpoints = np.cumsum(weights) - weights / 2
+        return np.interp(np.asarray(q) * self.count, midpoints, values)
+
+    def count_outside(self, lower, upper):
+        """Values below `lower` or above `upper` (interpolated once the sketch is compressed)."""
+        values, weights = self._merged()
+        if self.exact:
+            return int(np.searchsorted(values, lower, side='left') + len(values)
+                       - np.searchsorted(values, upper, side='right'))
+        midpoints = np.cumsum(weights) - weights / 2
+        below, above = np.interp([lower, upper], values, midpoints, left=0, right=self.count)
+        return int(round(below + self.count - above))
+
+
+class DistinctCounter:
+    """Exact distinct count over 64-bit hashes, then a k-minimum-values estimate."""
+
+    def __init__(self, limit=DISTINCT_LIMIT, k=KMV_SIZE):
+        self.limit = limit
+        self.k = min(k, limit)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.exact = True
+
+    def update(self, hashes):
+        self.hashes = np.union1d(self.hashes, hashes)
+        if self.exact and len(self.hashes) > self.limit:
+            self.exact = False
+        if not self.exact:
+            self.hashes = self.hashes[:self.k]
+
+    def estimate(self):
+        if self.exact or len(self.hashes) < self.k:
+            return len(self.hashes)
+        return int(round((self.k - 1) / (float(self.hashes[-1]) / 2.0 ** 64)))
+
+
+class ColumnProfile:
+    """Running statistics of one column."""
+
+    def __init__(self, numeric, exact_limit=EXACT_LIMIT, sketch_size=SKETCH_SIZE, distinct_limit=DISTINCT_LIMIT):
+        self.numeric = numeric
+        self.count = self.nulls = 0
+        self.mean = self.m2 = self.m3 = 0.0
+        self.min, self.max = np.inf, -np.inf
+        self.sketch = QuantileSketch(exact_limit, sketch_size) if numeric else None
+        self.distinct = DistinctCounter(distinct_limit)
+
+    def update(self, series):
+        missing = series.isna().to_numpy()
+        self.nulls += int(missing.sum())
+        present = series[~missing]
+        self.distinct.update(np.unique(pd.util.hash_pandas_object(present, index=False).to_numpy()))
+        if not self.numeric or not len(present):
+            return
+        values = present.to_numpy(dtype=np.float64)
+        n_b = len(values)
+        mean_b = values.mean()
+        centered = values - mean_b
+        m2_b, m3_b = (centered ** 2).sum(), (centered ** 3).sum()
+        # Pairwise merge of central moments (Chan et al.)
+        n_a, n = self.count, self.count + n_b
+        delta = mean_b - self.mean
+        self.m3 += (m3_b + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                    + 3 * delta * (n_a * m2_b - n_b * self.m2) / n)
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self.count = n
+        self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+        self.sketch.update(values)
+
+    def report(self, iqr_factor=IQR_FACTOR):
+        row = {'kind': 'numeric' if self.numeric else 'categorical', 'nulls': self.nulls,
+               'distinct': self.distinct.estimate(), 'approximate': not self.distinct.exact}
+        n = self.count
+        if not self.numeric or not n:
+            return row
+        row.update({'min': self.min, 'max': self.max, 'mean': self.mean,
+                    'std': np.sqrt(self.m2 / (n - 1)) if n > 1 else np.nan})
+        # Adjusted Fisher-Pearson coefficient, as pandas' Series.skew
+        if n > 2:
+            row['skew'] = 0.0 if self.m2 == 0 else (np.sqrt(n * (n - 1)) / (n - 2)
+                                                     * np.sqrt(n) * self.m3 / self.m2 ** 1.5)
+        q1, median, q3 = self.sketch.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        lower, upper = q1 - iqr_factor * iqr, q3 + iqr_factor * iqr
+        row.update({'q1': q1, 'median': median, 'q3': q3, 'iqr': iqr, 'lower': lower, 'upper': upper,
+                    'outliers': self.sketch.count_outside(lower, upper),
+                    'approximate': row['approximate'] or not self.sketch.exact})
+        return row
+
+
+def _chunks(data, chunksize):
+    if isinstance(data, str):
+        return read_chunks(data, chunksize)
+    if isinstance(data, pd.DataFrame):
+        return (data.iloc[start:start + chunksize] for start in range(0, max(len(data), 1), chunksize))
+    return data
+
+
+def profile(data, columns=None, chunksize=DEFAULT_CHUNK_SIZE, iqr_factor=IQR_FACTOR, exact_limit=EXACT_LIMIT,
+            sketch_size=SKETCH_SIZE, distinct_limit=DISTINCT_LIMIT):
+    """One pass over `data` (a path, a frame or an iterable of frames); returns the report frame."""
+    profiles = {}
+    rows = 0
+    for chunk in _chunks(data, chunksize):
+        if not profiles:
+            for column in columns or chunk.columns:
+                numeric = pd.api.types.is_numeric_dtype(chunk[column]) and not pd.api.types.is_bool_dtype(chunk[column])
+                profiles[column] = ColumnProfile(numeric, exact_limit, sketch_size, distinct_limit)
+        rows += len(chunk)
+        for column, column_profile in profiles.items():
+            column_profile.update(chunk[column])
+
+    report = pd.DataFrame([column_profile.report(iqr_factor) for column_profile in profiles.values()],
+                          index=pd.Index(list(profiles), name='column')).reindex(columns=REPORT_COLUMNS)
+    report['count'] = rows - report['nulls']
+    report['null_fraction'] = report['nulls'] / rows if rows else np.nan
+    return report
+
+
+def outlier_masks(frame, report):
+    """Boolean frame, True where a value lies outside its column's IQR bounds (numeric columns only)."""
+    bounds = report.loc[report['kind'] == 'numeric', ['lower', 'upper']].dropna()
+    columns = [column for column in bounds.index if column in frame.columns]
+    values = frame[columns].to_numpy(dtype=np.float64)
+    mask = (values < bounds.loc[columns, 'lower'].to_numpy()) | (values > bounds.loc[columns, 'upper'].to_numpy())
+    return pd.DataFrame(mask, index=frame.index, columns=columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile Big Mart extracts in one chunked pass.")
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--iqr-factor', type=float, default=IQR_FACTOR)
+    parser.add_argument('--output', help="write the reports as CSV (one file per input, suffixed)")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        report = profile(path, chunksize=args.chunksize, iqr_factor=args.iqr_factor)
+        print(f"{path}: {int(report['count'].iloc[0] + report['nulls'].iloc[0]):,} rows")
+        print(report.drop(columns=['kind']).to_string(float_format=lambda value: f"{value:.4g}"))
+        print()
+        if args.output:
+            stem = args.output[:-4] if args.output.endswith('.csv') else args.output
+            report.to_csv(f"{stem}-{path.replace('/', '_')}.csv" if len(args.paths) > 1 else args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Per-prediction explanations: exact TreeSHAP contributions of the app's six inputs.
+
+Each prediction is split into a bias (the model's expected output) plus one
+contribution per feature: Outlet_Type, the OUT027/OUT019/OUT035 flags, Item_MRP
+and Outlet_Age. XGBoost computes them natively (`pred_contribs`, exact
+path-dependent TreeSHAP) and they add up to the prediction.
+
+A tree's contributions depend on the input only through the branch taken at
+each split, so like the prediction (see prediction_table.py) they are
+piecewise constant in Item_MRP. `Explainer.explain` keeps, per combination of
+the five discrete inputs, the contributions at every Item_MRP interval between
+split thresholds, computed in one `pred_contribs` batch the first time the
+combination is seen. Every later row with that combination, at any MRP, is a
+binary search and a lookup. The app's whole input space is a few thousand
+combinations of about 2 KB each. `contributions` runs `pred_contribs` on every
+row directly, in chunks.
+
+Usage:
+    python explain.py Test.csv --output contributions.csv
+"""
+
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+from batch_predict import DEFAULT_CHUNK_SIZE
+from prediction_table import CONTINUOUS_FEATURE, _representatives, _split_thresholds, _to_float32
+
+BIAS = 'Bias'
+
+
+def _booster_of(model):
+    # NativeBooster (backend='xgboost') or an unpickled XGBRegressor
+    if hasattr(model, 'booster'):
+        return model.booster
+    if hasattr(model, 'get_booster'):
+        return model.get_booster()
+    raise ValueError("Explanations need the XGBoost model, load the artifact with backend='xgboost'")
+
+
+def _combinations(discrete):
+    """(distinct rows, index of each row's distinct row) of a non-empty 2-d array, hashing instead of sorting."""
+    inverse = np.zeros(len(discrete), dtype=np.int64)
+    for column in discrete.T:
+        codes, uniques = pd.factorize(column)
+        # Refactorized every step, so the combined code stays below n_rows * n_uniques
+        inverse = pd.factorize(inverse * len(uniques) + codes)[0]
+    first = np.empty(inverse.max() + 1, dtype=np.intp)
+    first[inverse[::-1]] = np.arange(len(inverse) - 1, -1, -1)
+    return discrete[first], inverse
+
+
+class Explainer:
+    """Feature contributions for app-encoded feature rows (see model_artifact.SalesModel)."""
+
+    def __init__(self, sales_model):
+        from tree_arrays import TreeEnsemble, flatten_booster
+
+        self.sales_model = sales_model
+        self.booster = _booster_of(sales_model.model)
+        self.columns = list(sales_model.feature_names) + [BIAS]
+        self.mrp_index = sales_model.feature_names.index(CONTINUOUS_FEATURE)
+        self._discrete = [i for i in range(len(sales_model.feature_names)) if i != self.mrp_index]
+        self.thresholds = _split_thresholds(TreeEnsemble(flatten_booster(self.booster)),
+                                            self.mrp_index).astype(np.float32)
+        self._representatives = _representatives(self.thresholds)
+        self._threshold_list = self.thresholds.tolist()
+        # discrete input tuple -> (n_intervals, n_features + 1) contributions
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def contributions(self, features, chunk_size=DEFAULT_CHUNK_SIZE):
+        """`pred_contribs` for every row of an (n_rows, 6) matrix, shape (n_rows, 7); the last column is the bias."""
+        import xgboost as xgb
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        transformed = self.sales_model.transform(features)
+        result = np.empty((len(transformed), len(self.columns)), dtype=np.float32)
+        for start in range(0, len(transformed), chunk_size):
+            matrix = xgb.DMatrix(transformed[start:start + chunk_size], feature_names=self.booster.feature_names)
+            result[start:start + chunk_size] = self.booster.predict(matrix, pred_contribs=True)
+        return result
+
+    def _compute(self, keys):
+        import xgboost as xgb
+
+        # One pred_contribs batch: every MRP interval of every new combination
+        raw = np.zeros((len(keys), len(self.columns) - 1))
+        raw[:, self._discrete] = keys
+        transformed = self.sales_model.transform(raw)
+        rows = np.repeat(transformed, len(self._representatives), axis=0)
+        rows[:, self.mrp_index] = np.tile(self._representatives, len(keys))
+        matrix = xgb.DMatrix(rows, feature_names=self.booster.feature_names)
+        contributions = self.booster.predict(matrix, pred_contribs=True)
+        return contributions.reshape(len(keys), len(self._representatives), len(self.columns))
+
+    def explain(self, features):
+        """Same result as `contributions`, served from the per-combination cache."""
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(self.columns) - 1:
+            raise ValueError(f"Expected an (n, {len(self.columns) - 1}) feature matrix, got {features.shape}")
+        if len(features) == 0:
+            return np.empty((0, len(self.columns)), dtype=np.float32)
+        keys, inverse = _combinations(features[:, self._discrete])
+        key_tuples = [tuple(key) for key in keys.tolist()]
+        with self._lock:
+            missing = [i for i, key in enumerate(key_tuples) if key not in self._entries]
+        if missing:
+            # Computed outside the lock; a combination computed twice concurrently gets the same values
+            computed = self._compute(keys[missing])
+            with self._lock:
+                for i, values in zip(missing, computed):
+                    self._entries[key_tuples[i]] = values
+        with self._lock:
+            tables = np.stack([self._entries[key] for key in key_tuples])
+
+        mrp = (features[:, self.mrp_index] * self.sales_model._coef[self.mrp_index]
+               + self.sales_model._offset[self.mrp_index])
+        intervals = np.searchsorted(self.thresholds, mrp.astype(np.float32), side='right')
+        return tables[inverse, intervals]
+
+    def explain_one(self, features):
+        """Feature name -> contribution for one row of the app's six inputs, plus BIAS."""
+        key = tuple(float(features[i]) for i in self._discrete)
+        with self._lock:
+            table = self._entries.get(key)
+        if table is None:
+            return dict(zip(self.columns, self.explain(np.array([features], dtype=np.float64))[0].tolist()))
+        # Plain Python on a cache hit: a handful of operations instead of array setup
+        mrp = _to_float32(features[self.mrp_index] * self.sales_model._coef[self.mrp_index]
+                          + self.sales_model._offset[self.mrp_index])
+        return dict(zip(self.columns, table[bisect.bisect_right(self._threshold_list, mrp)].tolist()))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def main(argv=None):
+    import argparse
+
+    from batch_predict import build_features
+    from model_artifact import DEFAULT_ARTIFACT_PATH, load_artifact
+
+    parser = argparse.ArgumentParser(description="Per-row feature contributions for a Test.csv-shaped file.")
+    parser.add_argument('input', help="CSV file shaped like Test.csv")
+    parser.add_argument('--output', '-o', default='contributions.csv')
+    parser.add_argument('--model', default=DEFAULT_ARTIFACT_PATH, help="model artifact to explain")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.input)
+    explainer = Explainer(load_artifact(args.model, backend='xgboost'))
+    contributions = pd.DataFrame(explainer.explain(build_features(df)), columns=explainer.columns)
+    contributions['Item_Outlet_Sales'] = contributions.sum(axis=1)
+    id_columns = [col for col in ('Item_Identifier', 'Outlet_Identifier') if col in df.columns]
+    pd.concat([df[id_columns], contributions], axis=1).to_csv(args.output, index=False)
+    print(f"Explained {len(df)} rows ({len(explainer)} input combinations), saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Columnar cache of the preprocessed training frame.
+
+Re-parsing the CSV and redoing the imputation, encoding and scaling on every run
+is wasted work when neither the data nor the preprocessing changed. The fully
+preprocessed X/y are written once to an Arrow IPC file, keyed by a hash of the
+input file contents and the preprocessing config; later runs (and the feature
+selection / tuning stages) memory-map that file instead of recomputing. The CSR
+matrix of the 'sparse' one-hot encoding is cached as .npz instead.
+
+Usage:
+    X, y = load_training_frame('Train.csv')
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from preprocessing import DEFAULT_CONFIG, TARGET, preprocess
+
+# Bump when `preprocess` changes in a way the config does not capture
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'features')
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(paths, config=DEFAULT_CONFIG):
+    """Hash of the input file contents, the preprocessing config and CACHE_VERSION."""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for path in paths:
+        digest.update(file_digest(path).encode())
+    digest.update(json.dumps(config, sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+
+def write_frame(X, y, path):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(pd.concat([X, y], axis=1), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           b'target': y.name.encode()})
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_frame(path):
+    """Memory-map a cached frame; numeric columns are not copied into the heap."""
+    import pyarrow as pa
+
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    target = table.schema.metadata[b'target'].decode()
+    frame = table.to_pandas(split_blocks=True)
+    return frame.drop(columns=[target]), frame[target]
+
+
+def write_sparse(X, y, path):
+    """Cache a CSR design matrix (the 'sparse' one-hot encoding) and its target as .npz."""
+    import numpy as np
+
+    X = X.tocsr()
+    tmp_path = f"{path}.tmp{os.getpid()}.npz"
+    np.savez(tmp_path, data=X.data, indices=X.indices, indptr=X.indptr, shape=X.shape,
+             y=y.to_numpy(), target=y.name)
+    os.replace(tmp_path, path)
+
+
+def read_sparse(path):
+    import numpy as np
+    from scipy import sparse
+
+    with np.load(path) as arrays:
+        X = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(arrays['shape']))
+        return X, pd.Series(arrays['y'], name=str(arrays['target']))
+
+
+def load_training_frame(train_path='Train.csv', config=DEFAULT_CONFIG, cache_dir=DEFAULT_CACHE_DIR, refresh=False):
+    """Preprocessed (X, y) for `train_path`, from the cache when it is up to date."""
+    sparse = config.get('onehot_encoding') == 'sparse'
+    path = os.path.join(cache_dir, f"train-{cache_key([train_path], config)}.{'npz' if sparse else 'arrow'}")
+    if not refresh and os.path.exists(path):
+        return read_sparse(path) if sparse else read_frame(path)
+
+    X, y, _ = preprocess(pd.read_csv(train_path), config)
+    os.makedirs(cache_dir, exist_ok=True)
+    (write_sparse if sparse else write_frame)(X, y.rename(TARGET), path)
+    return X, y
@@ -0,0 +1,259 @@
+"""Rollup cube of expected sales over the catalog, for aggregate forecasts.
+
+Planners ask for totals, not per-item predictions: expected sales per outlet, per
+item type, or per outlet type and tier. Answering one with `predict_sales` means
+scoring every item and summing. `ForecastCube.build` scores the catalog once
+(Test.csv-shaped item-outlet listings, via batch_predict.py) and sums the
+predictions into dense arrays over DIMENSIONS.
+
+Each axis has one extra slot at the end holding the total over that dimension,
+and every combination of such totals is materialized. So any query that fixes
+some dimensions and rolls up the others is a single array lookup, and a slice
+along one or two dimensions is a view. The Big Mart outlets and item types make
+about 19k cells.
+
+Changes are applied as deltas, touching 2^5 cells per changed listing:
+- `upsert` rescores only the given listings (new, or with changed attributes such
+  as a new MRP) and moves their contribution from their old cells to the new ones;
+- `update_outlet` and `update_item` do the same for every listing of one outlet
+  or item after its attributes change;
+- `remove` drops listings.
+New values of a dimension add a slot to its axis.
+
+Usage:
+    python forecast_cube.py Test.csv --cube sales_forecast_cube.npz
+    python forecast_cube.py --by Item_Type --where "Outlet_Type=Supermarket Type1" "Outlet_Location_Type=Tier 3"
+"""
+
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from batch_predict import INPUT_COLUMNS, predict_batch
+
+DEFAULT_CUBE_PATH = "sales_forecast_cube.npz"
+CUBE_VERSION = 1
+
+# Outlet_Type is implied by the outlet, but planners query it with the tier, so it gets an axis too
+DIMENSIONS = ['Outlet_Identifier', 'Item_Type', 'Outlet_Type', 'Outlet_Location_Type', 'Outlet_Size']
+KEY_COLUMNS = ['Item_Identifier', 'Outlet_Identifier']
+CATALOG_COLUMNS = list(dict.fromkeys(KEY_COLUMNS + DIMENSIONS + INPUT_COLUMNS))
+# Outlet_Size is missing for some outlets; the cube shows them as such rather than imputing
+MISSING_LABEL = 'Unknown'
+MEASURES = ('sum', 'count', 'mean')
+
+
+class ForecastCube:
+    """Expected sales and listing counts over DIMENSIONS, with every rollup materialized.
+
+    `sums` and `counts` have one axis per dimension, of length len(labels) + 1;
+    the last position along an axis is the total over that dimension. `catalog`
+    holds the scored listings, indexed by KEY_COLUMNS, for incremental updates.
+    """
+
+    def __init__(self, labels, sums, counts, catalog):
+        self.labels = {dim: list(labels[dim]) for dim in DIMENSIONS}
+        self._positions = {dim: {label: i for i, label in enumerate(values)} for dim, values in self.labels.items()}
+        self.sums = sums
+        self.counts = counts
+        self.catalog = catalog
+
+    @classmethod
+    def empty(cls):
+        shape = (1,) * len(DIMENSIONS)
+        catalog = pd.DataFrame(columns=CATALOG_COLUMNS + ['prediction'])
+        catalog.index = pd.MultiIndex.from_arrays([[], []], names=KEY_COLUMNS)
+        return cls({dim: [] for dim in DIMENSIONS}, np.zeros(shape), np.zeros(shape, dtype=np.int64), catalog)
+
+    @classmethod
+    def build(cls, catalog, model):
+        """Score every listing of a Test.csv-shaped frame once and roll the predictions up."""
+        cube = cls.empty()
+        cube.upsert(catalog, model)
+        return cube
+
+    # Queries
+
+    def _position(self, dim, value):
+        if dim not in self._positions:
+            raise ValueError(f"Unknown dimension {dim!r}, expected one of {DIMENSIONS}")
+        if value is None:
+            return len(self.labels[dim])
+        try:
+            return self._positions[dim][value]
+        except KeyError:
+            raise ValueError(f"Unknown {dim} {value!r}") from None
+
+    def _measure(self, index, measure):
+        if measure == 'sum':
+            return self.sums[index]
+        if measure == 'count':
+            return self.counts[index]
+        if measure == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return self.sums[index] / self.counts[index]
+        raise ValueError(f"Unknown measure {measure!r}, expected one of {MEASURES}")
+
+    def total(self, measure='sum', **selection):
+        """One number over the listings matching `selection` (dimension=value); other dimensions roll up."""
+        for dim in selection:
+            self._position(dim, None)
+        index = tuple(self._position(dim, selection.get(dim)) for dim in DIMENSIONS)
+        return self._measure(index, measure).item()
+
+    def slice(self, by, measure='sum', **selection):
+        """Totals per value of `by` (one dimension: a Series; two: a DataFrame) within `selection`."""
+        by = [by] if isinstance(by, str) else list(by)
+        if not 1 <= len(by) <= 2 or set(by) & set(selection):
+            raise ValueError("slice takes one or two `by` dimensions, not also in the selection")
+        for dim in list(selection) + by:
+            self._position(dim, None)
+        index = tuple(slice(0, len(self.labels[dim])) if dim in by else self._position(dim, selection.get(dim))
+                      for dim in DIMENSIONS)
+        values = self._measure(index, measure)
+        # The array keeps DIMENSIONS order; put the axes in `by` order
+        if len(by) == 2 and DIMENSIONS.index(by[0]) > DIMENSIONS.index(by[1]):
+            values = values.T
+        # Labels are stored in order of appearance; show them sorted
+        if len(by) == 1:
+            return pd.Series(values, index=pd.Index(self.labels[by[0]], name=by[0]), name=measure).sort_index()
+        return pd.DataFrame(values, index=pd.Index(self.labels[by[0]], name=by[0]),
+                            columns=pd.Index(self.labels[by[1]], name=by[1])).sort_index().sort_index(axis=1)
+
+    # Updates
+
+    def _listings(self, rows):
+        missing = [col for col in CATALOG_COLUMNS if col not in rows.columns]
+        if missing:
+            raise ValueError(f"Missing catalog columns: {missing}")
+        rows = rows[CATALOG_COLUMNS].copy()
+        rows['Outlet_Size'] = rows['Outlet_Size'].fillna(MISSING_LABEL)
+        for dim in DIMENSIONS:
+            rows[dim] = rows[dim].astype(str)
+        rows.index = pd.MultiIndex.from_frame(rows[KEY_COLUMNS])
+        if rows.index.has_duplicates:
+            raise ValueError("Listings must be unique per (Item_Identifier, Outlet_Identifier)")
+        return rows
+
+    def _grow(self, rows):
+        """Add a slot, before the total, for every new value of a dimension."""
+        for axis, dim in enumerate(DIMENSIONS):
+            new = [label for label in pd.unique(rows[dim]) if label not in self._positions[dim]]
+            if not new:
+                continue
+            position = len(self.labels[dim])
+            self.sums = np.insert(self.sums, [position] * len(new), 0.0, axis=axis)
+            self.counts = np.insert(self.counts, [position] * len(new), 0, axis=axis)
+            for label in new:
+                self._positions[dim][label] = len(self.labels[dim])
+                self.labels[dim].append(label)
+
+    def _accumulate(self, rows, predictions, sign):
+        """Add (sign 1) or take out (sign -1) listings in every cell that contains them."""
+        if not len(rows):
+            return
+        coords = np.column_stack([rows[dim].map(self._positions[dim]).to_numpy(dtype=np.intp) for dim in DIMENSIONS])
+        totals = np.array(self.sums.shape) - 1
+        flat = np.concatenate([np.ravel_multi_index(np.where(mask, totals, coords).T, self.sums.shape)
+                               for mask in itertools.product([False, True], repeat=len(DIMENSIONS))])
+        weights = np.tile(np.asarray(predictions, dtype=np.float64), 2 ** len(DIMENSIONS))
+        self.sums += sign * np.bincount(flat, weights=weights, minlength=self.sums.size).reshape(self.sums.shape)
+        self.counts += sign * np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def upsert(self, rows, model):
+        """Score new or changed listings and move their contribution; the rest of the catalog is not rescored."""
+        rows = self._listings(rows)
+        predictions = predict_batch(model, rows)
+        old = self.catalog[self.catalog.index.isin(rows.index)]
+        self._accumulate(old, old['prediction'], -1)
+        self._grow(rows)
+        self._accumulate(rows, predictions, 1)
+        rows['prediction'] = predictions
+        kept = self.catalog[~self.catalog.index.isin(rows.index)]
+        self.catalog = pd.concat([kept, rows]) if len(kept) else rows
+
+    def remove(self, keys):
+        """Drop the listings with these (Item_Identifier, Outlet_Identifier) keys."""
+        dropped = self.catalog[self.catalog.index.isin(list(keys))]
+        self._accumulate(dropped, dropped['prediction'], -1)
+        self.catalog = self.catalog.drop(dropped.index)
+
+    def _update(self, column, value, model, changes):
+        if set(changes) & set(KEY_COLUMNS):
+            raise ValueError(f"{KEY_COLUMNS} identify a listing; remove it and upsert the new one instead")
+        rows = self.catalog[self.catalog[column] == value].drop(columns='prediction')
+        if not len(rows):
+            raise ValueError(f"No listings with {column} {value!r}")
+        self.upsert(rows.assign(**changes), model)
+
+    def update_outlet(self, outlet, model, **changes):
+        """Apply attribute changes (e.g. Outlet_Size='High') to every listing of `outlet` and rescore them."""
+        self._update('Outlet_Identifier', outlet, model, changes)
+
+    def update_item(self, item, model, **changes):
+        """Apply attribute changes (e.g. Item_MRP=...) to every listing of `item` and rescore them."""
+        self._update('Item_Identifier', item, model, changes)
+
+    # Storage
+
+    def save(self, path=DEFAULT_CUBE_PATH):
+        arrays = {'version': np.array(CUBE_VERSION), 'sums': self.sums, 'counts': self.counts}
+        for dim in DIMENSIONS:
+            arrays[f'labels/{dim}'] = np.array(self.labels[dim], dtype=str)
+        for col in self.catalog.columns:
+            values = self.catalog[col].to_numpy()
+            arrays[f'catalog/{col}'] = values.astype(str) if values.dtype == object else values
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_CUBE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != CUBE_VERSION:
+                raise ValueError(f"Unsupported cube version {int(data['version'])}, expected {CUBE_VERSION}")
+            labels = {dim: data[f'labels/{dim}'].tolist() for dim in DIMENSIONS}
+            catalog = pd.DataFrame({name[len('catalog/'):]: data[name] for name in data.files
+                                    if name.startswith('catalog/')})
+            sums, counts = data['sums'], data['counts']
+        for col in CATALOG_COLUMNS:
+            if catalog[col].dtype.kind == 'U':
+                catalog[col] = catalog[col].astype(object)
+        catalog.index = pd.MultiIndex.from_frame(catalog[KEY_COLUMNS])
+        return cls(labels, sums, counts, catalog)
+
+
+def main(argv=None):
+    import argparse
+
+    from batch_predict import load_model
+    from model_artifact import DEFAULT_ARTIFACT_PATH
+
+    parser = argparse.ArgumentParser(description="Build or query the rollup cube of expected sales.")
+    parser.add_argument('catalog', nargs='?', help="Test.csv-shaped listings to score and roll up into --cube")
+    parser.add_argument('--cube', default=DEFAULT_CUBE_PATH)
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument('--by', nargs='+', choices=DIMENSIONS, help="one or two dimensions to break the total down by")
+    parser.add_argument('--where', nargs='*', default=[], metavar='DIMENSION=VALUE')
+    parser.add_argument('--measure', choices=MEASURES, default='sum')
+    args = parser.parse_args(argv)
+
+    if args.catalog:
+        cube = ForecastCube.build(pd.read_csv(args.catalog), load_model(args.artifact))
+        cube.save(args.cube)
+        print(f"{args.cube}: {len(cube.catalog):,} listings, {cube.sums.size:,} cells")
+    else:
+        cube = ForecastCube.load(args.cube)
+
+    selection = dict(condition.split('=', 1) for condition in args.where)
+    if args.by:
+        print(cube.slice(args.by, args.measure, **selection).to_string(float_format=lambda value: f"{value:,.1f}"))
+    else:
+        print(f"{cube.total(args.measure, **selection):,.1f}")
+
+
+if __name__ == '__main__':
+    main()
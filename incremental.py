@@ -0,0 +1,255 @@
+"""Incremental retraining from new sales batches.
+
+salesprediction.py (and `python -m pipeline`) refresh the model by refitting
+everything on the full history: the imputation values, every encoder, the scaler
+and a fresh XGBRegressor. Here a batch of new sales updates the model from the
+batch alone:
+- the running Item_Weight mean and the Outlet_Size counts per Outlet_Type, which
+  give the imputation values the batch is cleaned with;
+- the StandardScaler statistics, merged with `partial_fit`;
+- the booster, which keeps its trees and gets `rounds` more, fitted on the batch
+  through XGBoost's `xgb_model=` warm start.
+
+The existing trees split on scaled values. When the scaler moves, their split
+thresholds are moved with it so that they cut at the same raw values, and the old
+trees predict as before. Encoders are not refitted: an unseen label-encoded value
+is an error, and an unseen one-hot category (a new outlet) gets all-zero flags.
+
+The counts and scaler statistics live in a JSON state file next to the artifact.
+`--init` builds it from the history the current artifact was fitted on; run it
+again after every full retrain.
+
+Usage:
+    python incremental.py --init Train.csv
+    python incremental.py new_sales.csv --rounds 10
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from data_loading import _mode_by_outlet_type, clean_chunk
+from model_artifact import DEFAULT_ARTIFACT_PATH
+from preprocessing import DEFAULT_CONFIG, TARGET, encode_fitted, model_features
+
+STATE_VERSION = 1
+DEFAULT_STATE_PATH = "sales_training_state.json"
+DEFAULT_MODEL_PATH = "sales_prediction_model.pkl"
+
+# Trees added per batch; the notebook's model has 100
+DEFAULT_ROUNDS = 10
+
+# float32 steps a rescaled split threshold is moved down by (see rescale_thresholds)
+THRESHOLD_ULPS = 4
+
+
+def history_state(df_history, config=DEFAULT_CONFIG):
+    """Training state of a full fit on the raw `df_history` frame (what preprocessing.preprocess fits)."""
+    from preprocessing import clean, encode, transform
+
+    df, _, _ = encode(clean(df_history, config), config)
+    _, scaler = transform(df, config)
+    state = {'version': STATE_VERSION, 'rows': 0, 'batches': 0, 'item_weight': {'count': 0, 'sum': 0.0},
+             'outlet_size_counts': {}}
+    _add_counts(state, df_history)
+    state['scaler'] = _scaler_state(scaler, config['scaled_features'])
+    return state
+
+
+def load_state(path=DEFAULT_STATE_PATH):
+    with open(path) as file:
+        state = json.load(file)
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"Unsupported training state version {state.get('version')!r}, expected {STATE_VERSION}")
+    return state
+
+
+def save_state(state, path=DEFAULT_STATE_PATH):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w') as file:
+        json.dump(state, file, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _add_counts(state, batch):
+    weights = batch['Item_Weight'].to_numpy(dtype=np.float64)
+    state['rows'] += len(batch)
+    state['item_weight']['count'] += int(np.count_nonzero(~np.isnan(weights)))
+    state['item_weight']['sum'] += float(np.nansum(weights))
+    counts = state['outlet_size_counts']
+    size_counts = batch.groupby(['Outlet_Type', 'Outlet_Size'], observed=True).size()
+    for (outlet_type, outlet_size), count in size_counts.items():
+        sizes = counts.setdefault(str(outlet_type), {})
+        sizes[str(outlet_size)] = sizes.get(str(outlet_size), 0) + int(count)
+
+
+def cleaning_stats(state):
+    """The imputation values of the state, in the form data_loading.clean_chunk takes."""
+    weight = state['item_weight']
+    return {
+        'item_weight_mean': weight['sum'] / weight['count'] if weight['count'] else float('nan'),
+        'outlet_size_mode': _mode_by_outlet_type({(outlet_type, outlet_size): count
+                                                  for outlet_type, sizes in state['outlet_size_counts'].items()
+                                                  for outlet_size, count in sizes.items()}),
+    }
+
+
+def _scaler_state(scaler, scaled_features):
+    return {'features': list(scaled_features), 'n_samples_seen': int(scaler.n_samples_seen_),
+            'mean': [float(x) for x in scaler.mean_], 'var': [float(x) for x in scaler.var_]}
+
+
+def _transformers(state, artifact):
+    """Fitted scaler, label encoders and one-hot encoder rebuilt from the state and the artifact."""
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+
+    scaling = state['scaler']
+    scaler = StandardScaler()
+    scaler.n_features_in_ = len(scaling['features'])
+    scaler.n_samples_seen_ = scaling['n_samples_seen']
+    scaler.mean_ = np.asarray(scaling['mean'])
+    scaler.var_ = np.asarray(scaling['var'])
+    scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+
+    label_encoders = {}
+    for col, classes in artifact['label_classes'].items():
+        label_encoders[col] = LabelEncoder()
+        label_encoders[col].classes_ = np.asarray(classes, dtype=object)
+    ohe = OneHotEncoder(drop='first')
+    ohe.categories_ = [np.asarray(categories, dtype=object) for categories in artifact['onehot_categories'].values()]
+    return scaler, label_encoders, ohe
+
+
+def rescale_thresholds(booster, feature_names, old_scaling, new_scaling):
+    """A copy of `booster` whose splits on scaled features cut at the same raw values under `new_scaling`.
+
+    Scalings map feature name -> (mean, scale), as in the artifact.
+    """
+    import xgboost as xgb
+
+    # t_new = (t_old * scale_old + mean_old - mean_new) / scale_new, per feature
+    coef = np.ones(len(feature_names))
+    offset = np.zeros(len(feature_names))
+    for i, name in enumerate(feature_names):
+        if name in old_scaling:
+            (old_mean, old_scale), (new_mean, new_scale) = old_scaling[name], new_scaling[name]
+            coef[i] = old_scale / new_scale
+            offset[i] = (old_mean - new_mean) / new_scale
+
+    model = json.loads(booster.save_raw(raw_format='json'))
+    for tree in model['learner']['gradient_booster']['model']['trees']:
+        # Leaves keep their weight in split_conditions; only internal nodes are splits
+        features = np.asarray(tree['split_indices'])
+        moved = (np.asarray(tree['left_children']) != -1) & ((coef != 1) | (offset != 0))[features]
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float64)
+        rescaled = (conditions[moved] * coef[features[moved]] + offset[features[moved]]).astype(np.float32)
+        # Hist cuts sit exactly on training values, which go right (x < t goes left). Rescaled, such a
+        # value and its threshold are only known to an ulp or two, so keep the threshold a few ulps below it.
+        conditions[moved] = rescaled - THRESHOLD_ULPS * np.spacing(np.abs(rescaled))
+        tree['split_conditions'] = conditions.tolist()
+    return xgb.Booster(model_file=bytearray(json.dumps(model).encode()))
+
+
+def update(batch, state, artifact, booster, rounds=DEFAULT_ROUNDS, params=None, config=DEFAULT_CONFIG):
+    """Fold one raw batch (Train.csv columns) into the state and boost `rounds` more trees on it.
+
+    `artifact` is the artifact document (as saved, without the model) and `booster`
+    the model it describes. Returns (model, state, artifact) for the updated model;
+    the inputs are left unchanged.
+    """
+    from xgboost import XGBRegressor
+
+    from feature_selection import XGB_PARAMS
+    from model_artifact import build_artifact
+
+    scaled_features = config['scaled_features']
+    old_scaling = {name: tuple(artifact['scaling'][name]) for name in scaled_features}
+    expected = [old_scaling[name][0] for name in state['scaler']['features']]
+    if state['scaler']['features'] != list(scaled_features) or not np.allclose(state['scaler']['mean'], expected):
+        raise ValueError("The training state does not match the artifact; rebuild it with --init")
+    if not len(batch):
+        raise ValueError("Empty batch")
+
+    state = json.loads(json.dumps(state))
+    _add_counts(state, batch)
+    cleaned = clean_chunk(batch.astype({'Outlet_Size': 'category', 'Outlet_Type': 'category'}), cleaning_stats(state))
+    scaler, label_encoders, ohe = _transformers(state, artifact)
+    encoded = encode_fitted(cleaned, label_encoders, config)
+    scaler.partial_fit(encoded[scaled_features].to_numpy(dtype=np.float64))
+    state['scaler'] = _scaler_state(scaler, scaled_features)
+    state['batches'] += 1
+
+    feature_names = artifact['feature_names']
+    new_scaling = {name: (float(mean), float(scale)) for name, mean, scale in zip(scaled_features, scaler.mean_,
+                                                                                    scaler.scale_)}
+    booster = rescale_thresholds(booster, feature_names, old_scaling, new_scaling)
+    params = {**(XGB_PARAMS if params is None else params), 'n_estimators': rounds}
+    model = XGBRegressor(**params).fit(model_features(encoded, feature_names, new_scaling, config), batch[TARGET],
+                                       xgb_model=booster)
+    return model, state, build_artifact(model, scaler, label_encoders, ohe, feature_names, scaled_features)
+
+
+def read_artifact(path=DEFAULT_ARTIFACT_PATH):
+    """(artifact document, its xgboost Booster) of a `.json` artifact."""
+    from booster_io import load_booster
+
+    if not path.endswith('.json'):
+        raise ValueError(f"Incremental updates need a .json artifact (its booster is read natively): {path}")
+    with open(path) as file:
+        artifact = json.load(file)
+    return artifact, load_booster(os.path.join(os.path.dirname(path), artifact['booster_file']))
+
+
+def save_model(model, artifact, artifact_path=DEFAULT_ARTIFACT_PATH, model_path=DEFAULT_MODEL_PATH, table_path=None):
+    """Write the updated artifact, the pickled XGBRegressor and, if given, the prediction table."""
+    from batch_predict import FEATURE_NAMES
+    from model_artifact import load_artifact, save_artifact
+    from prediction_table import build_table, save_table
+
+    save_artifact(artifact, artifact_path)
+    if model_path:
+        tmp_path = f"{model_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(model, file)
+        os.replace(tmp_path, model_path)
+    # The table enumerates the app's discrete inputs; other feature sets have no table
+    if table_path and artifact['feature_names'] == FEATURE_NAMES:
+        save_table(build_table(load_artifact(artifact_path)), table_path)
+
+
+def main(argv=None):
+    import argparse
+
+    from prediction_table import DEFAULT_TABLE_PATH
+
+    parser = argparse.ArgumentParser(description="Update the model from new sales batches without a full refit.")
+    parser.add_argument('batches', nargs='*', help="raw sales CSVs with Train.csv's columns, applied in order")
+    parser.add_argument('--init', metavar='HISTORY', help="first build the state from the artifact's training data")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH)
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument('--model-file', default=DEFAULT_MODEL_PATH, help="pickled XGBRegressor to rewrite ('' to skip)")
+    parser.add_argument('--table-file', default=DEFAULT_TABLE_PATH, help="prediction table to rebuild ('' to skip)")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help="trees added per batch")
+    args = parser.parse_args(argv)
+
+    if args.init:
+        save_state(history_state(pd.read_csv(args.init)), args.state)
+        print(f"{args.state}: state of {args.init}")
+    if not args.batches:
+        return
+
+    state = load_state(args.state)
+    artifact, booster = read_artifact(args.artifact)
+    for path in args.batches:
+        model, state, artifact = update(pd.read_csv(path), state, artifact, booster, args.rounds)
+        booster = model.get_booster()
+        print(f"{path}: {state['rows']:,} rows seen, {booster.num_boosted_rounds()} trees")
+    save_model(model, artifact, args.artifact, args.model_file, args.table_file)
+    save_state(state, args.state)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""Timers, counters and an opt-in stack sampler for the prediction path.
+
+`METRICS` keeps latency histograms for model loading, feature building and
+`predict` (labelled by batch size, rounded up to a power of two) plus plain
+counters. They can be rendered in the Prometheus text exposition format, served
+by prediction_server.py at `GET /metrics`, or written to a file for the node
+exporter's textfile collector.
+
+`PROFILER` is a sampling profiler that can be switched on at runtime. While it is
+on, every timed section records the call stacks of its thread every `interval`
+seconds. Sections that take longer than `threshold` are dumped as folded stacks
+(`frame;frame;frame count`), the input format of flamegraph.pl and speedscope.
+
+Both are off by default, and then a timed section is a shared no-op context manager.
+Environment variables switch them on at startup:
+    SALES_METRICS=1                collect metrics (0, false, no or off leave them off)
+    SALES_METRICS_FILE=path.prom   also write them there (see `write_if_due`)
+    SALES_PROFILE_DIR=dir          sample sections slower than SALES_PROFILE_THRESHOLD_MS (default 50)
+
+Usage:
+    with METRICS.time('predict', rows=len(features)):
+        ...
+    print(METRICS.render())
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Upper bounds in seconds, 50 us to 10 s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 10.0)
+PREFIX = 'sales_'
+
+
+def batch_label(rows):
+    """Batch size rounded up to a power of two, to keep label cardinality small."""
+    return str(1 << max(0, int(rows) - 1).bit_length())
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ('metrics', 'name', 'rows', 'start', 'sampling')
+
+    def __init__(self, metrics, name, rows):
+        self.metrics = metrics
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        profiler = self.metrics.profiler
+        self.sampling = profiler is not None and profiler.enabled and profiler.begin()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        if self.metrics.enabled:
+            self.metrics.observe(self.name, elapsed, self.rows)
+        if self.sampling:
+            self.metrics.profiler.end(self.name, elapsed)
+        return False
+
+
+class Metrics:
+    """Thread-safe registry of latency histograms and counters."""
+
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS, profiler=None):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.profiler = profiler
+        self._histograms = {}
+        self._counters = Counter()
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+
+    def time(self, name, rows=None):
+        """Context manager timing one section; a shared no-op when metrics and profiling are off."""
+        if not self.enabled and (self.profiler is None or not self.profiler.enabled):
+            return _NULL_SECTION
+        return _Section(self, name, rows)
+
+    def observe(self, name, seconds, rows=None):
+        key = (name, None if rows is None else batch_label(rows))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count(self, name, amount=1):
+        """Add to the counter `name`, rendered as `sales_<name>_total`."""
+        if self.enabled:
+            with self._lock:
+                self._counters[name] += amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: (item[0][0], int(item[0][1] or 0)))
+            histograms = [(key, list(h.counts), h.sum, h.count) for key, h in histograms]
+            counters = sorted(self._counters.items())
+
+        lines = []
+        seen = set()
+        for (name, batch), counts, total, count in histograms:
+            metric = f'{PREFIX}{name}_seconds'
+            if metric not in seen:
+                seen.add(metric)
+                lines += [f'# HELP {metric} Latency of {name}.', f'# TYPE {metric} histogram']
+            labels = '' if batch is None else f'batch_size="{batch}",'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{{{labels}le="{le}"}} {cumulative}')
+            suffix = f'{{{labels.rstrip(",")}}}' if labels else ''
+            lines.append(f'{metric}_sum{suffix} {total!r}')
+            lines.append(f'{metric}_count{suffix} {count}')
+        for name, value in counters:
+            metric = f'{PREFIX}{name}_total'
+            lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write `render()` to `path` atomically (textfile-collector friendly)."""
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as file:
+            file.write(self.render())
+        os.replace(tmp_path, path)
+
+    def write_if_due(self, path=None, interval=10.0):
+        """Write to `path` (default: $SALES_METRICS_FILE) at most once per `interval` seconds."""
+        path = path or os.environ.get('SALES_METRICS_FILE')
+        now = time.monotonic()
+        if not self.enabled or not path or now - self._last_write < interval:
+            return False
+        self._last_write = now
+        self.write(path)
+        return True
+
+
+class StackSampler:
+    """Samples the stacks of threads inside timed sections; dumps slow sections as folded stacks."""
+
+    def __init__(self, output_dir=os.path.join('.cache', 'profiles'), threshold=0.05, interval=0.001):
+        self.output_dir = output_dir
+        self.threshold = threshold
+        self.interval = interval
+        self.enabled = False
+        self.dumps = 0
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def enable(self, output_dir=None, threshold=None, interval=None):
+        self.output_dir = output_dir or self.output_dir
+        self.threshold = self.threshold if threshold is None else threshold
+        self.interval = interval or self.interval
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.enabled = True
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+            self._thread.start()
+
+    def disable(self):
+        self.enabled = False
+
+    def toggle(self, *_):
+        """Signal-handler friendly on/off switch."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def begin(self):
+        ident = threading.get_ident()
+        with self._lock:
+            if ident in self._active:
+                # Nested section: the outer one already samples this thread
+                return False
+            self._active[ident] = Counter()
+        return True
+
+    def end(self, name, elapsed):
+        with self._lock:
+            stacks = self._active.pop(threading.get_ident(), None)
+        if stacks and elapsed >= self.threshold:
+            self._dump(name, elapsed, stacks)
+
+    def _run(self):
+        own = threading.get_ident()
+        while self.enabled:
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, stacks in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None and ident != own:
+                        stacks[_fold(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+    def _dump(self, name, elapsed, stacks):
+        path = os.path.join(self.output_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-"
+                                             f"{os.getpid()}-{self.dumps}-{elapsed * 1000:.0f}ms.folded")
+        self.dumps += 1
+        with open(path, 'w') as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def _fold(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def install_toggle_signal(signum=None):
+    """Toggle the profiler on `signum` (default SIGUSR1); main thread only."""
+    import signal
+
+    signum = signum or getattr(signal, 'SIGUSR1', None)
+    if signum is None or threading.current_thread() is not threading.main_thread():
+        return False
+    signal.signal(signum, PROFILER.toggle)
+    return True
+
+
+PROFILER = StackSampler(threshold=float(os.environ.get('SALES_PROFILE_THRESHOLD_MS', 50)) / 1000)
+METRICS = Metrics(enabled=os.environ.get('SALES_METRICS', '').strip().lower() not in ('', '0', 'false', 'no', 'off'),
+                  profiler=PROFILER)
+if os.environ.get('SALES_PROFILE_DIR'):
+    PROFILER.enable(os.environ['SALES_PROFILE_DIR'])
@@ -0,0 +1,209 @@
+"""Versioned model artifact: fitted preprocessing plus the trained XGBRegressor.
+
+The notebook (salesprediction.py) fits a StandardScaler, LabelEncoders and a
+OneHotEncoder before training, and the model only makes sense on inputs that went
+through the same transforms. The artifact keeps the fitted parameters of those
+transformers as plain arrays next to the model, so serving applies them as
+precomputed affine and lookup-table operations and never imports sklearn fit code.
+
+Two on-disk formats are supported, chosen by the file extension:
+- `.json`: the preprocessing as JSON plus the trees next to it, both in XGBoost's
+  native UBJSON format (see booster_io.py) and flattened into NumPy arrays
+  (see tree_arrays.py). Fast to load and not tied to library versions; with the
+  default `numpy` backend, serving does not import xgboost at all.
+- `.pkl`: everything, including the XGBRegressor, in one pickle.
+
+Usage (rebuild the artifact from Train.csv and the pickled model):
+    python model_artifact.py --train Train.csv --model sales_prediction_model.pkl
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+from instrumentation import METRICS
+
+ARTIFACT_VERSION = 1
+DEFAULT_ARTIFACT_PATH = "sales_prediction_artifact.json"
+
+# Preprocessing constants shared with salesprediction.py
+THIS_YEAR = 2024
+FAT_CONTENT_MAP = {'low fat': 'Low Fat', 'LF': 'Low Fat', 'reg': 'Regular'}
+OUTLET_SIZE_MAP = {'Small': 1, 'Medium': 2, 'High': 3}
+OUTLET_LOCATION_MAP = {'Tier 1': 1, 'Tier 2': 2, 'Tier 3': 3}
+SCALED_FEATURES = ['Item_Weight', 'Item_MRP', 'Outlet_Size', 'Outlet_Location_Type',
+                   'Outlet_Type', 'Outlet_Age', 'Item_Visibility_Sqrt']
+ONEHOT_COLUMNS = ['Item_Identifier', 'Item_Type', 'Outlet_Identifier']
+
+
+def fit_preprocessing(df_train):
+    """Refit the notebook's transformers on the raw training frame.
+
+    Runs sections 3.2-5.4 of salesprediction.py (see preprocessing.py) and returns
+    the fitted (scaler, label_encoders, ohe). Only needed at export time.
+    """
+    from preprocessing import preprocess
+
+    _, _, transformers = preprocess(df_train)
+    return transformers
+
+
+def build_artifact(model, scaler, label_encoders, ohe, feature_names, scaled_features=SCALED_FEATURES):
+    """Collect the fitted transformers and the model into a plain, versioned dict."""
+    feature_names = list(feature_names)
+    scaling = {name: (float(mean), float(scale))
+               for name, mean, scale in zip(scaled_features, scaler.mean_, scaler.scale_)}
+    label_classes = {col: [str(c) for c in encoder.classes_] for col, encoder in label_encoders.items()}
+    onehot_categories = {col: [str(c) for c in categories]
+                         for col, categories in zip(ONEHOT_COLUMNS, ohe.categories_)}
+
+    # Per model feature: x_scaled = x * coef + offset, except label-encoded inputs,
+    # whose handful of possible codes are scaled once into a lookup table.
+    coef = np.ones(len(feature_names))
+    offset = np.zeros(len(feature_names))
+    lookup = {}
+    for i, name in enumerate(feature_names):
+        if name not in scaling:
+            continue
+        mean, scale = scaling[name]
+        if name in label_classes:
+            codes = np.arange(len(label_classes[name]), dtype=np.float64)
+            lookup[i] = (codes - mean) / scale
+        else:
+            coef[i] = 1.0 / scale
+            offset[i] = -mean / scale
+
+    return {
+        'version': ARTIFACT_VERSION,
+        'feature_names': feature_names,
+        'this_year': THIS_YEAR,
+        'scaling': scaling,
+        'label_classes': label_classes,
+        'onehot_categories': onehot_categories,
+        'coef': coef,
+        'offset': offset,
+        'lookup': lookup,
+        'model': model,
+    }
+
+
+def _booster_path(path):
+    return os.path.splitext(path)[0] + '.ubj'
+
+
+def _trees_path(path):
+    return os.path.splitext(path)[0] + '.npz'
+
+
+def save_artifact(artifact, path=DEFAULT_ARTIFACT_PATH):
+    if not path.endswith('.json'):
+        with open(path, 'wb') as file:
+            pickle.dump(artifact, file)
+        return
+
+    from booster_io import export_booster
+    from tree_arrays import flatten_booster, save_trees
+
+    booster_path = _booster_path(path)
+    trees_path = _trees_path(path)
+    export_booster(artifact['model'], booster_path)
+    save_trees(flatten_booster(artifact['model']), trees_path)
+    document = {key: value for key, value in artifact.items() if key != 'model'}
+    document['booster_file'] = os.path.basename(booster_path)
+    document['trees_file'] = os.path.basename(trees_path)
+    document['coef'] = [float(x) for x in artifact['coef']]
+    document['offset'] = [float(x) for x in artifact['offset']]
+    document['lookup'] = {str(i): [float(x) for x in table] for i, table in artifact['lookup'].items()}
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=1)
+
+
+class SalesModel:
+    """Loaded artifact that scores app-encoded feature rows.
+
+    Input rows use the same encoding as the app's widgets: Outlet_Type as its
+    label code (0-3), the OUT027/OUT019/OUT035 flags as 0/1, raw Item_MRP and
+    raw Outlet_Age in years.
+    """
+
+    def __init__(self, artifact):
+        if artifact.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported artifact version {artifact.get('version')!r}, "
+                             f"expected {ARTIFACT_VERSION}")
+        self.artifact = artifact
+        self.feature_names = artifact['feature_names']
+        self.model = artifact['model']
+        self._coef = np.asarray(artifact['coef'], dtype=np.float64)
+        self._offset = np.asarray(artifact['offset'], dtype=np.float64)
+        self._lookup = {int(i): np.asarray(table, dtype=np.float64) for i, table in artifact['lookup'].items()}
+
+    def transform(self, features):
+        """Apply the fitted scaling to an (n_rows, n_features) matrix."""
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected an (n, {len(self.feature_names)}) feature matrix, got {features.shape}")
+        transformed = features * self._coef + self._offset
+        for i, table in self._lookup.items():
+            codes = features[:, i].astype(np.intp)
+            if (codes < 0).any() or (codes >= len(table)).any() or (codes != features[:, i]).any():
+                raise ValueError(f"{self.feature_names[i]} codes must be integers in [0, {len(table)})")
+            transformed[:, i] = table[codes]
+        return transformed
+
+    def predict(self, features):
+        with METRICS.time('predict', rows=len(features)):
+            return self.model.predict(self.transform(features))
+
+
+def load_artifact(path=DEFAULT_ARTIFACT_PATH, backend='numpy'):
+    """Load an artifact once at startup; everything needed at inference is precomputed.
+
+    For `.json` artifacts, `backend` selects the tree evaluator: 'numpy' walks the
+    flattened trees without importing xgboost, 'xgboost' loads a bare Booster.
+    """
+    with METRICS.time('model_load'):
+        if not path.endswith('.json'):
+            with open(path, 'rb') as file:
+                return SalesModel(pickle.load(file))
+
+        with open(path) as file:
+            artifact = json.load(file)
+        directory = os.path.dirname(path)
+        if backend == 'numpy':
+            from tree_arrays import TreeEnsemble
+
+            artifact['model'] = TreeEnsemble.load(os.path.join(directory, artifact['trees_file']))
+        elif backend == 'xgboost':
+            from booster_io import NativeBooster
+
+            artifact['model'] = NativeBooster(os.path.join(directory, artifact['booster_file']))
+        else:
+            raise ValueError(f"Unknown backend {backend!r}, expected 'numpy' or 'xgboost'")
+        return SalesModel(artifact)
+
+
+def main(argv=None):
+    import argparse
+
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Export the preprocessing + model artifact.")
+    parser.add_argument('--train', default='Train.csv', help="raw training data the transformers are fitted on")
+    parser.add_argument('--model', default='sales_prediction_model.pkl', help="pickled XGBRegressor")
+    parser.add_argument('--output', '-o', default=DEFAULT_ARTIFACT_PATH, help="a .json path also writes the .ubj booster and .npz trees")
+    args = parser.parse_args(argv)
+
+    with open(args.model, 'rb') as file:
+        model = pickle.load(file)
+    scaler, label_encoders, ohe = fit_preprocessing(pd.read_csv(args.train))
+    artifact = build_artifact(model, scaler, label_encoders, ohe, model.get_booster().feature_names)
+    save_artifact(artifact, args.output)
+    print(f"Artifact v{ARTIFACT_VERSION} saved to {args.output}")
+    if args.output.endswith('.json'):
+        print(f"Booster saved to {_booster_path(args.output)}, trees to {_trees_path(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
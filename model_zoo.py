@@ -0,0 +1,206 @@
+"""Parallel, disk-memoized evaluation of the baseline model comparison.
+
+Section 6 of salesprediction.py fits nine regressors one after another and
+formats their metrics as strings. Here the candidates are fitted concurrently in
+a process pool. Each worker's BLAS/OpenMP pools and the estimators' own `n_jobs`
+are capped at `threads_per_worker`, so XGBoost and the random forest don't
+oversubscribe the cores. Every fitted model and its metrics are stored under
+`.cache/models/`, keyed by a hash of the data and the estimator's class and
+parameters; re-running after adding one model fits only that model.
+
+Usage:
+    python model_zoo.py --max-workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from tuning import RESULT_COLUMNS, evaluation_metrics
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'models')
+
+# Parameters that change speed but not the fitted model
+IGNORED_PARAMS = {'n_jobs', 'nthread', 'verbose', 'verbosity'}
+
+_worker_data = None
+
+
+def baseline_models(encoding='dense'):
+    """The candidates from section 6 of the notebook, as (name, estimator) pairs.
+
+    With the 'categorical' one-hot encoding only XGBoost applies; the scikit-learn
+    candidates need numeric input.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+    from sklearn.neighbors import KNeighborsRegressor
+    from sklearn.svm import SVR
+    from sklearn.tree import DecisionTreeRegressor
+    from xgboost import XGBRegressor
+
+    if encoding == 'categorical':
+        return [('XGB', XGBRegressor(random_state=0, enable_categorical=True, tree_method='hist'))]
+    return [('LR', LinearRegression()),
+            ('Ridge', Ridge()),
+            ('Lasso', Lasso()),
+            ('Elastic', ElasticNet()),
+            ('SVR', SVR()),
+            ('DecisionTree', DecisionTreeRegressor(random_state=0)),
+            ('RandomForest', RandomForestRegressor(random_state=0)),
+            ('KNN', KNeighborsRegressor()),
+            ('XGB', XGBRegressor(random_state=0))]
+
+
+def data_digest(*arrays):
+    """Content hash of frames/series/arrays/sparse matrices, including column names and index."""
+    from scipy import sparse
+
+    digest = hashlib.sha256()
+    for data in arrays:
+        if sparse.issparse(data):
+            data = data.tocsr()
+            digest.update(f"csr{data.dtype}{data.shape}".encode())
+            for part in (data.data, data.indices, data.indptr):
+                digest.update(np.ascontiguousarray(part).tobytes())
+        elif isinstance(data, (pd.DataFrame, pd.Series)):
+            digest.update(repr(list(data.columns) if isinstance(data, pd.DataFrame) else data.name).encode())
+            digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        else:
+            data = np.ascontiguousarray(data)
+            digest.update(f"{data.dtype}{data.shape}".encode())
+            digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+def model_key(estimator, data_hash):
+    """Cache key for one estimator on one dataset."""
+    params = {name: value for name, value in estimator.get_params(deep=True).items() if name not in IGNORED_PARAMS}
+    cls = type(estimator)
+    digest = hashlib.sha256(data_hash.encode())
+    digest.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+    digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()[:32]
+
+
+def _limit_threads(estimator, threads):
+    from sklearn.base import clone
+
+    estimator = clone(estimator)
+    if threads is not None and 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=threads)
+    return estimator
+
+
+def _init_worker(data, threads):
+    global _worker_data
+    from threadpoolctl import threadpool_limits
+
+    _worker_data = data
+    if threads is not None:
+        threadpool_limits(threads)
+
+
+def _fit_and_store(estimator, path, threads, data=None):
+    import joblib
+
+    X_train, y_train, X_test, y_test = data if data is not None else _worker_data
+    start = time.perf_counter()
+    model = _limit_threads(estimator, threads).fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    record = {**evaluation_metrics(model, X_train, y_train, X_test, y_test), 'Fit_Seconds': fit_seconds}
+
+    # The metrics file is written last; its presence marks a complete entry
+    tmp_suffix = f".tmp{os.getpid()}"
+    joblib.dump(model, path + '.joblib' + tmp_suffix)
+    os.replace(path + '.joblib' + tmp_suffix, path + '.joblib')
+    with open(path + '.json' + tmp_suffix, 'w') as file:
+        json.dump(record, file)
+    os.replace(path + '.json' + tmp_suffix, path + '.json')
+    return record
+
+
+def evaluate_models(models, X_train, y_train, X_test, y_test, max_workers=None, threads_per_worker=None,
+                    cache_dir=DEFAULT_CACHE_DIR, refresh=False):
+    """Fit (or load from the cache) and score each (name, estimator); returns a numeric results frame."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(cache_dir, exist_ok=True)
+    data_hash = data_digest(X_train, y_train, X_test, y_test)
+    records, pending = {}, []
+    for name, estimator in models:
+        path = os.path.join(cache_dir, model_key(estimator, data_hash))
+        if not refresh and os.path.exists(path + '.json'):
+            with open(path + '.json') as file:
+                records[name] = {**json.load(file), 'Cached': True}
+        else:
+            pending.append((name, estimator, path))
+
+    n_cpus = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers or n_cpus, len(pending) or 1))
+    threads = threads_per_worker or max(1, n_cpus // max_workers)
+    data = (X_train, y_train, X_test, y_test)
+    if max_workers == 1:
+        from threadpoolctl import threadpool_limits
+
+        with threadpool_limits(threads):
+            for name, estimator, path in pending:
+                records[name] = {**_fit_and_store(estimator, path, threads, data), 'Cached': False}
+    elif pending:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(data, threads)) as pool:
+            futures = {name: pool.submit(_fit_and_store, estimator, path, threads)
+                       for name, estimator, path in pending}
+            for name, future in futures.items():
+                records[name] = {**future.result(), 'Cached': False}
+
+    rows = [{'Model': name, **records[name]} for name, _ in models]
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS + ['Fit_Seconds', 'Cached'])
+
+
+def load_fitted(estimator, X_train, y_train, X_test, y_test, cache_dir=DEFAULT_CACHE_DIR):
+    """The cached fitted model for `estimator` on this data, or None."""
+    import joblib
+
+    path = os.path.join(cache_dir, model_key(estimator, data_digest(X_train, y_train, X_test, y_test)))
+    if not os.path.exists(path + '.json'):
+        return None
+    return joblib.load(path + '.joblib')
+
+
+def main(argv=None):
+    from feature_cache import load_training_frame
+    from preprocessing import DEFAULT_CONFIG, ENCODINGS, split
+
+    parser = argparse.ArgumentParser(description="Fit and score the baseline models in parallel, with caching.")
+    parser.add_argument('--train', default='Train.csv')
+    parser.add_argument('--models', nargs='+', help="subset of the baseline model names")
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--threads-per-worker', type=int, default=None)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--refresh', action='store_true', help="refit even if cached")
+    parser.add_argument('--encoding', choices=ENCODINGS, default='dense', help="one-hot block representation")
+    args = parser.parse_args(argv)
+
+    models = baseline_models(args.encoding)
+    if args.models:
+        unknown = set(args.models) - {name for name, _ in models}
+        if unknown:
+            raise ValueError(f"unknown models {sorted(unknown)}")
+        models = [(name, model) for name, model in models if name in args.models]
+
+    X, y = load_training_frame(args.train, {**DEFAULT_CONFIG, 'onehot_encoding': args.encoding})
+    X_train, X_test, y_train, y_test = split(X, y)
+    results = evaluate_models(models, X_train, y_train, X_test, y_test, max_workers=args.max_workers,
+                              threads_per_worker=args.threads_per_worker, cache_dir=args.cache_dir,
+                              refresh=args.refresh)
+    print("Model evaluation results:")
+    print(results.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Out-of-core training: XGBoost fed from preprocessed shards through a DataIter.
+
+`sales_prediction_model.fit(X_train_best, y_train)` in salesprediction.py (and the
+pipeline's export stage) needs the whole encoded design matrix in memory as a
+pandas frame. Here the training file is never loaded whole:
+1. `prepare` streams it in chunks (see data_loading.py). The first pass collects
+   the cleaning statistics and the category values the encoders are fitted on.
+   The second cleans and encodes each chunk, accumulates the scaler statistics
+   and writes the model's features (unscaled) and the target as one Parquet shard.
+2. `shard_iter` is an `xgboost.DataIter` that reads the shards back one at a
+   time, scaled.
+3. `train` builds the training matrix from it and fits with the `hist` method.
+   The matrix is either an external-memory DMatrix, whose pages are cached on
+   disk, or a QuantileDMatrix, which keeps only the quantized values in memory
+   (about a byte per value).
+
+Peak memory depends on the chunk size, not the number of rows. The output is the
+artifact (and prediction table) the export stage writes, without the pickle.
+The trees match an in-memory fit up to float32 reading of the CSV and the
+batched quantile sketch of the split candidates.
+
+Usage:
+    python out_of_core.py big_train.csv --output-dir models/
+    python out_of_core.py big_train.csv --matrix quantile --shard-dir .cache/shards
+"""
+
+import os
+
+import numpy as np
+
+from batch_predict import FEATURE_NAMES
+from data_loading import DEFAULT_CHUNK_SIZE, compute_cleaning_stats, iter_clean_chunks
+from preprocessing import DEFAULT_CONFIG, TARGET, encode_fitted, model_features
+
+MATRIX_KINDS = ('external', 'quantile')
+MAX_BIN = 256
+
+
+def fit_encoders(categories, config=DEFAULT_CONFIG):
+    """The LabelEncoders and OneHotEncoder `preprocessing.encode` would fit, from the raw category values."""
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+
+    def cleaned(col):
+        values = categories[col]
+        if col == 'Item_Fat_Content':
+            values = [config['fat_content_map'].get(value, value) for value in values]
+        elif col == 'Item_Identifier':
+            values = [value[:config['item_identifier_prefix']] for value in values]
+        return sorted(set(values))
+
+    label_encoders = {col: LabelEncoder().fit(cleaned(col)) for col in config['label_encoded']}
+    # Only the categories are read (build_artifact); rows are one-hot encoded by model_features
+    ohe = OneHotEncoder(drop='first')
+    ohe.categories_ = [np.asarray(cleaned(col), dtype=object) for col in config['onehot_columns']]
+    return label_encoders, ohe
+
+
+def prepare(path, shard_dir, feature_names=FEATURE_NAMES, chunksize=DEFAULT_CHUNK_SIZE, config=DEFAULT_CONFIG):
+    """Two streaming passes over a raw training file: fitted transformers and one Parquet shard per chunk.
+
+    Returns {'shards', 'rows', 'feature_names', 'scaler', 'label_encoders', 'ohe'}.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from sklearn.preprocessing import StandardScaler
+
+    stats = compute_cleaning_stats(path, chunksize, categories=config['label_encoded'] + config['onehot_columns'])
+    label_encoders, ohe = fit_encoders(stats['categories'], config)
+    scaler = StandardScaler()
+    os.makedirs(shard_dir, exist_ok=True)
+    shards, rows = [], 0
+    for i, chunk in enumerate(iter_clean_chunks(path, chunksize, stats)):
+        encoded = encode_fitted(chunk, label_encoders, config)
+        scaler.partial_fit(encoded[config['scaled_features']].to_numpy(dtype=np.float64))
+        frame = model_features(encoded, feature_names, config=config).astype(np.float32)
+        frame[TARGET] = chunk[TARGET].to_numpy(dtype=np.float32)
+        shard = os.path.join(shard_dir, f"shard_{i:05d}.parquet")
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), shard)
+        shards.append(shard)
+        rows += len(chunk)
+    return {'shards': shards, 'rows': rows, 'feature_names': list(feature_names), 'scaler': scaler,
+            'label_encoders': label_encoders, 'ohe': ohe}
+
+
+def scaling_of(prepared, config=DEFAULT_CONFIG):
+    """Scaled feature -> (mean, scale) of the prepared data, as in the model artifact."""
+    scaler = prepared['scaler']
+    return {name: (float(mean), float(scale))
+            for name, mean, scale in zip(config['scaled_features'], scaler.mean_, scaler.scale_)}
+
+
+def shard_iter(shards, feature_names, scaling, cache_prefix=None):
+    """An xgboost.DataIter over the Parquet shards, scaling each one as it is read."""
+    import pyarrow.parquet as pq
+    import xgboost as xgb
+
+    coef = np.array([1.0 / scaling[name][1] if name in scaling else 1.0 for name in feature_names])
+    offset = np.array([-scaling[name][0] / scaling[name][1] if name in scaling else 0.0 for name in feature_names])
+
+    class ShardIter(xgb.DataIter):
+        def __init__(self):
+            self.position = 0
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data):
+            if self.position == len(shards):
+                return 0
+            table = pq.read_table(shards[self.position])
+            features = np.column_stack([table.column(name).to_numpy() for name in feature_names])
+            input_data(data=features.astype(np.float64) * coef + offset, feature_names=list(feature_names),
+                       label=table.column(TARGET).to_numpy())
+            self.position += 1
+            return 1
+
+        def reset(self):
+            self.position = 0
+
+    return ShardIter()
+
+
+def train(prepared, cache_dir, params=None, matrix='external', max_bin=MAX_BIN, config=DEFAULT_CONFIG):
+    """Fit a Booster on the prepared shards; `cache_dir` holds the external-memory pages."""
+    import xgboost as xgb
+
+    from feature_selection import XGB_PARAMS
+
+    if matrix not in MATRIX_KINDS:
+        raise ValueError(f"Unknown matrix {matrix!r}, expected one of {MATRIX_KINDS}")
+    params = dict(XGB_PARAMS if params is None else params)
+    rounds = params.pop('n_estimators', 100)
+    external = matrix == 'external'
+    iterator = shard_iter(prepared['shards'], prepared['feature_names'], scaling_of(prepared, config),
+                          cache_prefix=os.path.join(cache_dir, 'dmatrix') if external else None)
+    dtrain = xgb.DMatrix(iterator) if external else xgb.QuantileDMatrix(iterator, max_bin=max_bin)
+    return xgb.train({**params, 'tree_method': 'hist', 'max_bin': max_bin}, dtrain, num_boost_round=rounds)
+
+
+def build(booster, prepared, config=DEFAULT_CONFIG):
+    """The model artifact of a booster trained on `prepared`."""
+    from model_artifact import build_artifact
+
+    return build_artifact(booster, prepared['scaler'], prepared['label_encoders'], prepared['ohe'],
+                          prepared['feature_names'], scaled_features=config['scaled_features'])
+
+
+def main(argv=None):
+    import argparse
+    import tempfile
+    import time
+
+    from incremental import save_model
+    from model_artifact import DEFAULT_ARTIFACT_PATH
+    from prediction_table import DEFAULT_TABLE_PATH
+
+    parser = argparse.ArgumentParser(description="Train the sales model out of core, from chunked shards.")
+    parser.add_argument('train', help="raw training file with Train.csv's columns")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--matrix', choices=MATRIX_KINDS, default='external')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per shard")
+    parser.add_argument('--shard-dir', help="keep the shards and matrix pages here (default: a temporary directory)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shard_dir = args.shard_dir or tmp
+        start = time.perf_counter()
+        prepared = prepare(args.train, shard_dir, chunksize=args.chunksize)
+        prepared_at = time.perf_counter()
+        booster = train(prepared, shard_dir, matrix=args.matrix)
+        trained_at = time.perf_counter()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    artifact_path = os.path.join(args.output_dir, DEFAULT_ARTIFACT_PATH)
+    save_model(booster, build(booster, prepared), artifact_path, model_path=None,
+               table_path=os.path.join(args.output_dir, DEFAULT_TABLE_PATH))
+    print(f"{prepared['rows']:,} rows in {len(prepared['shards'])} shards: prepared in {prepared_at - start:.1f} s, "
+          f"trained in {trained_at - prepared_at:.1f} s; wrote {artifact_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""salesprediction.py as an importable, stage-cached training pipeline.
+
+The stages (load, clean, encode, transform, select, tune, export and the opt-in
+report) are pure functions in `pipeline.stages`; `pipeline.runner.run` executes
+the ones a target needs, reusing cached outputs whose inputs have not changed and
+running independent stages concurrently.
+
+Usage:
+    python -m pipeline                          # select, tune and export
+    python -m pipeline --targets export         # retrain and export only
+    python -m pipeline --report --max-workers 3
+"""
+
+from pipeline.runner import DEFAULT_CACHE_DIR, plan, run
+from pipeline.stages import DEFAULT_CONFIG, DEFAULT_TARGETS, STAGES
+
+__all__ = ['DEFAULT_CACHE_DIR', 'DEFAULT_CONFIG', 'DEFAULT_TARGETS', 'STAGES', 'plan', 'run']
@@ -0,0 +1,74 @@
+"""Command-line entry point: `python -m pipeline --help`."""
+
+import argparse
+
+from pipeline.runner import DEFAULT_CACHE_DIR, plan, run
+from pipeline.stages import DEFAULT_CONFIG, DEFAULT_TARGETS, STAGES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pipeline',
+                                     description="Run the training pipeline, reusing cached stage outputs.")
+    parser.add_argument('--targets', nargs='+', choices=list(STAGES), default=None,
+                        help=f"stages to bring up to date (default: {' '.join(DEFAULT_TARGETS)})")
+    parser.add_argument('--report', action='store_true', help="also render the charts (report stage)")
+    parser.add_argument('--train', default=DEFAULT_CONFIG['train_path'])
+    parser.add_argument('--output-dir', default=DEFAULT_CONFIG['export']['output_dir'],
+                        help="where export writes the model, artifact and prediction table")
+    parser.add_argument('--report-dir', default=DEFAULT_CONFIG['report']['output_dir'])
+    parser.add_argument('--catalog', default=DEFAULT_CONFIG['catalog_path'], help="listings the cube stage scores")
+    parser.add_argument('--selected-features', action='store_true',
+                        help="export with the features chosen by select instead of the app's inputs")
+    parser.add_argument('--tuned-params', action='store_true',
+                        help="export with the XGBoost params found by tune instead of the notebook's")
+    parser.add_argument('--max-fits', type=int, default=None, help="most XGBoost fits in the tune stage")
+    parser.add_argument('--patience', type=int, default=None, help="early stop for the select stage")
+    parser.add_argument('--n-jobs', type=int, default=DEFAULT_CONFIG['n_jobs'])
+    parser.add_argument('--max-workers', type=int, default=1, help="stages run concurrently")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--force', nargs='+', choices=list(STAGES), default=(),
+                        help="rerun these stages (and everything downstream) even if cached")
+    parser.add_argument('--dry-run', action='store_true', help="show which stages would run")
+    args = parser.parse_args(argv)
+
+    config = {
+        **DEFAULT_CONFIG,
+        'train_path': args.train,
+        'select': {**DEFAULT_CONFIG['select'], 'patience': args.patience},
+        'tune': {**DEFAULT_CONFIG['tune'], 'max_fits': args.max_fits},
+        'export': {**DEFAULT_CONFIG['export'], 'output_dir': args.output_dir,
+                   **({'features': 'selected'} if args.selected_features else {}),
+                   **({'params': 'tuned'} if args.tuned_params else {})},
+        'report': {'output_dir': args.report_dir},
+        'catalog_path': args.catalog,
+        'n_jobs': args.n_jobs,
+    }
+    targets = list(args.targets or DEFAULT_TARGETS) + (['report'] if args.report else [])
+
+    if args.dry_run:
+        for name, path, runs in plan(targets, config, args.cache_dir, args.force):
+            print(f"{name:<10} {'run' if runs else 'cached':<7} {path}")
+        return
+
+    def log(stage, status, seconds):
+        print(f"{stage:<10} {status:<7}" + (f" {seconds:.2f}s" if status == 'ran' else ''), flush=True)
+
+    outputs = run(targets, config, args.cache_dir, args.max_workers, args.force, log)
+    if 'select' in outputs:
+        print(f"\nBest features: {outputs['select']['features']}")
+    if 'tune' in outputs:
+        print("\nTuning results:")
+        print(outputs['tune']['results'].to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    if 'export' in outputs:
+        export = outputs['export']
+        print("\nFinal model: " + ", ".join(f"{name} {value:.3f}" for name, value in export['metrics'].items()))
+        print("Written: " + ", ".join(export['paths']))
+    if 'report' in outputs:
+        print(f"Report: {', '.join(outputs['report'])}")
+    if 'cube' in outputs:
+        forecast = outputs['cube']
+        print(f"Cube: {len(forecast.catalog):,} listings, {forecast.total():,.0f} expected sales in total")
+
+
+if __name__ == '__main__':
+    main()
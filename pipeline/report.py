@@ -0,0 +1,125 @@
+"""The notebook's charts as an opt-in report stage.
+
+salesprediction.py draws its EDA and model charts inline with `plt.show()` and
+`fig.show()`, so every run renders them. Here they are written to files by the
+`report` stage, which only runs when asked for (`python -m pipeline --report`).
+The charts use matplotlib alone (the notebook's seaborn heatmap and plotly
+scatter become plain matplotlib figures); matplotlib is only imported by this stage.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import TARGET
+
+NUMERIC_COLUMNS = ['Item_Weight', 'Item_Visibility', 'Item_MRP', 'Outlet_Establishment_Year', TARGET]
+CATEGORICAL_COLUMNS = ['Item_Fat_Content', 'Item_Type', 'Outlet_Identifier', 'Outlet_Size',
+                       'Outlet_Location_Type', 'Outlet_Type']
+
+
+def summary(raw):
+    """Per column: dtype, missing values, distinct values and (numeric columns) skewness."""
+    numeric = raw.select_dtypes('number')
+    return pd.DataFrame({
+        'dtype': raw.dtypes.astype(str),
+        'missing': raw.isnull().sum(),
+        'unique': raw.nunique(),
+        'skew': numeric.skew().reindex(raw.columns),
+    })
+
+
+def _distributions(plt, raw):
+    fig, axes = plt.subplots(1, len(NUMERIC_COLUMNS), figsize=(len(NUMERIC_COLUMNS) * 5, 4))
+    for ax, column in zip(axes, NUMERIC_COLUMNS):
+        ax.hist(raw[column].dropna(), bins=30, color='navy', edgecolor='black')
+        ax.set_title(f"{column}\nskew {raw[column].skew():.2f}")
+    return fig
+
+
+def _category_counts(plt, cleaned):
+    fig, axes = plt.subplots(2, 3, figsize=(18, 10))
+    for ax, column in zip(axes.ravel(), CATEGORICAL_COLUMNS):
+        counts = cleaned[column].value_counts()
+        ax.bar(counts.index.astype(str), counts.to_numpy(), color='lightcoral', edgecolor='black')
+        ax.set_title(column)
+        ax.tick_params(axis='x', labelrotation=90)
+    return fig
+
+
+def _correlation(plt, cleaned):
+    corr = cleaned[['Item_Weight', 'Item_Visibility', 'Item_MRP', TARGET]].corr()
+    fig, ax = plt.subplots(figsize=(7, 5))
+    image = ax.imshow(corr.to_numpy(), vmin=-1, vmax=1, cmap='viridis')
+    ax.set_xticks(range(len(corr)), corr.columns, rotation=45, ha='right')
+    ax.set_yticks(range(len(corr)), corr.columns)
+    for (i, j), value in np.ndenumerate(corr.to_numpy()):
+        ax.text(j, i, f"{value:.2f}", ha='center', va='center', color='white')
+    fig.colorbar(image, ax=ax)
+    ax.set_title("Numerical Features Correlation")
+    return fig
+
+
+def _sales_by_outlet(plt, cleaned):
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    for ax, column in zip(axes, ['Outlet_Type', 'Outlet_Location_Type']):
+        means = cleaned.groupby(column)[TARGET].mean().sort_values()
+        ax.bar(means.index.astype(str), means.to_numpy(), color='purple', edgecolor='black')
+        ax.set_title(f"Mean {TARGET} by {column}")
+    return fig
+
+
+def _feature_importance(plt, data):
+    from xgboost import XGBRegressor
+
+    from feature_selection import XGB_PARAMS
+
+    model = XGBRegressor(**XGB_PARAMS).fit(data['X_train'], data['y_train'])
+    importance = pd.Series(model.feature_importances_, index=data['X_train'].columns).sort_values(ascending=False)
+    fig, ax = plt.subplots(figsize=(10, 7))
+    ax.bar(importance.index, importance.to_numpy())
+    ax.tick_params(axis='x', labelrotation=90)
+    ax.set_title('Feature Importance - XGBoost')
+    return fig
+
+
+def _selection_curve(plt, results):
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    axes[0].plot(results['Num_Features'], results['R2_CV'], marker='o', color='b', label='R²')
+    axes[1].plot(results['Num_Features'], results['MAE_CV'], marker='o', color='g', label='MAE')
+    axes[1].plot(results['Num_Features'], results['RMSE_CV'], marker='o', color='r', label='RMSE')
+    for ax, title in zip(axes, ['R²', 'MAE and RMSE']):
+        ax.set_xlabel('Number of Features')
+        ax.set_ylabel('Cross-Validation Score')
+        ax.set_title(f"{title} - Feature Selection Performance")
+        ax.legend()
+    return fig
+
+
+def write_report(raw, cleaned, data, selection, output_dir):
+    """Write summary.csv and the charts as PNGs to `output_dir`; returns the paths written."""
+    import matplotlib
+
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, 'summary.csv')]
+    summary(raw).to_csv(paths[0], index_label='column')
+    charts = {
+        'distributions': lambda: _distributions(plt, raw),
+        'category_counts': lambda: _category_counts(plt, cleaned),
+        'correlation': lambda: _correlation(plt, cleaned),
+        'sales_by_outlet': lambda: _sales_by_outlet(plt, cleaned),
+        'feature_importance': lambda: _feature_importance(plt, data),
+        'feature_selection': lambda: _selection_curve(plt, selection['results']),
+    }
+    for name, draw in charts.items():
+        fig = draw()
+        fig.tight_layout()
+        path = os.path.join(output_dir, f"{name}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        paths.append(path)
+    return paths
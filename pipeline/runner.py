@@ -0,0 +1,182 @@
+"""DAG runner with a content-addressed cache per stage.
+
+A stage's cache key is a hash of its name, the config sections it declares, the
+contents of the files it reads and its upstream stages' keys. So all keys are
+known before anything runs, and a stage runs only if its key has no cached output
+(or it, or a stage upstream of it, is forced). Outputs are stored with joblib under
+`.cache/pipeline/<stage>-<key>.joblib`. Stages that also write files (export's
+model and artifact, the cube) get their digests recorded next to it, in
+`<stage>-<key>.outputs.json`, and rerun when a file is missing or was overwritten.
+
+With `max_workers > 1`, stages whose inputs are ready run concurrently in a
+process pool (select, tune and report are independent once transform is done).
+Workers read their inputs from the cache and write their output there, and like
+model_zoo.py, their thread pools are capped so the stages don't oversubscribe
+the cores.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from feature_cache import file_digest
+from pipeline.stages import DEFAULT_CONFIG, DEFAULT_TARGETS, STAGES
+
+# Bump when a stage function changes in a way its config does not capture
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'pipeline')
+
+
+def required_stages(targets, config=DEFAULT_CONFIG):
+    """`targets` and everything upstream of them, in topological order."""
+    order, visiting = [], set()
+
+    def visit(name):
+        if name in order:
+            return
+        if name not in STAGES:
+            raise ValueError(f"unknown stage {name!r}; expected one of {list(STAGES)}")
+        if name in visiting:
+            raise ValueError(f"stage {name!r} depends on itself")
+        visiting.add(name)
+        for dependency in STAGES[name].requires(config):
+            visit(dependency)
+        order.append(name)
+
+    for target in targets:
+        visit(target)
+    return order
+
+
+def stage_keys(order, config=DEFAULT_CONFIG):
+    """Cache key of every stage in `order` (which must be topological)."""
+    keys = {}
+    for name in order:
+        stage = STAGES[name]
+        digest = hashlib.sha256(f"v{CACHE_VERSION}:{name}".encode())
+        digest.update(json.dumps({key: config[key] for key in stage.config}, sort_keys=True).encode())
+        for key in stage.files:
+            digest.update(file_digest(config[key]).encode())
+        for dependency in stage.requires(config):
+            digest.update(keys[dependency].encode())
+        keys[name] = digest.hexdigest()[:32]
+    return keys
+
+
+def plan(targets=None, config=DEFAULT_CONFIG, cache_dir=DEFAULT_CACHE_DIR, force=()):
+    """[(stage, cache path, will run)] for `targets`, in topological order."""
+    order = required_stages(targets or DEFAULT_TARGETS, config)
+    keys = stage_keys(order, config)
+    forced = set()
+    steps = []
+    for name in order:
+        # A forced stage may produce a different output, so everything downstream reruns too
+        if name in force or any(dependency in forced for dependency in STAGES[name].requires(config)):
+            forced.add(name)
+        path = os.path.join(cache_dir, f"{name}-{keys[name]}.joblib")
+        steps.append((name, path, name in forced or not os.path.exists(path) or not _outputs_intact(name, path)))
+    return steps
+
+
+def _outputs_path(path):
+    return path[:-len('.joblib')] + '.outputs.json'
+
+
+def _outputs_intact(name, path):
+    """Whether the files the stage wrote alongside its cached value are still as it left them."""
+    if STAGES[name].outputs is None:
+        return True
+    try:
+        with open(_outputs_path(path)) as file:
+            digests = json.load(file)
+    except FileNotFoundError:
+        return False
+    return all(os.path.exists(output) and file_digest(output) == digest for output, digest in digests.items())
+
+
+def _store(name, config, value, path):
+    import joblib
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    joblib.dump(value, tmp_path)
+    os.replace(tmp_path, path)
+    if STAGES[name].outputs is not None:
+        digests = {output: file_digest(output) for output in STAGES[name].outputs(config, value)}
+        tmp_path = f"{_outputs_path(path)}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as file:
+            json.dump(digests, file, indent=1)
+        os.replace(tmp_path, _outputs_path(path))
+
+
+def _run_stage(name, config, input_paths, path):
+    """Run one stage on inputs read from the cache; returns its wall-clock seconds."""
+    import joblib
+
+    inputs = {dependency: joblib.load(input_path) for dependency, input_path in input_paths.items()}
+    start = time.perf_counter()
+    value = STAGES[name].func(config, inputs)
+    seconds = time.perf_counter() - start
+    _store(name, config, value, path)
+    return seconds
+
+
+def _init_worker(threads):
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(threads)
+
+
+def run(targets=None, config=DEFAULT_CONFIG, cache_dir=DEFAULT_CACHE_DIR, max_workers=1, force=(), log=None):
+    """Bring `targets` up to date and return {target: output}.
+
+    `log(stage, status, seconds)` is called as each stage is found cached or finishes.
+    """
+    import joblib
+
+    targets = targets or DEFAULT_TARGETS
+    steps = plan(targets, config, cache_dir, force)
+    paths = {name: path for name, path, _ in steps}
+    pending = [name for name, _, runs in steps if runs]
+    log = log or (lambda stage, status, seconds: None)
+    for name, _, runs in steps:
+        if not runs:
+            log(name, 'cached', 0.0)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    values = {}
+
+    def value(name):
+        if name not in values:
+            values[name] = joblib.load(paths[name])
+        return values[name]
+
+    if max_workers == 1 or len(pending) <= 1:
+        for name in pending:
+            start = time.perf_counter()
+            values[name] = STAGES[name].func(config, {dependency: value(dependency)
+                                                      for dependency in STAGES[name].requires(config)})
+            seconds = time.perf_counter() - start
+            _store(name, config, values[name], paths[name])
+            log(name, 'ran', seconds)
+    else:
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        threads = max(1, (os.cpu_count() or 1) // max_workers)
+        worker_config = {**config, 'n_jobs': threads}
+        done = set(paths) - set(pending)
+        running = {}
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            while pending or running:
+                for name in [name for name in pending if set(STAGES[name].requires(config)) <= done]:
+                    pending.remove(name)
+                    input_paths = {dependency: paths[dependency] for dependency in STAGES[name].requires(config)}
+                    running[pool.submit(_run_stage, name, worker_config, input_paths, paths[name])] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    seconds = future.result()
+                    done.add(name)
+                    log(name, 'ran', seconds)
+
+    return {name: value(name) for name in targets}
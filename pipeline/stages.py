@@ -0,0 +1,207 @@
+"""The training pipeline of salesprediction.py as stage functions.
+
+Every stage is a pure function `stage(config, inputs)` of the pipeline config and
+a dict of its upstream stages' outputs, keyed by stage name. The notebook's
+module-level statements map onto them:
+    load       read the raw training file (section 2)
+    clean      imputation and fat-content normalization (section 3)
+    encode     Outlet_Age, ordinal/label/one-hot encoding (sections 5.1-5.2)
+    transform  sqrt transform, scaling and the train/test split (sections 5.3-5.4)
+    select     RFE feature selection (section 8, feature_selection.py)
+    tune       hyperparameter search (section 7, tuning.py)
+    export     final fit, pickle, artifact and prediction table (section 9)
+    report     the EDA and model charts, opt-in (see report.py)
+    cube       the catalog scored once and rolled up for planners, opt-in (see forecast_cube.py)
+
+`STAGES` declares which upstream outputs and config sections each stage reads;
+the runner hashes exactly those to decide whether a cached output is still valid.
+"""
+
+import os
+import pickle
+
+import preprocessing
+from batch_predict import FEATURE_NAMES
+from feature_selection import XGB_PARAMS
+from forecast_cube import DEFAULT_CUBE_PATH
+from model_artifact import DEFAULT_ARTIFACT_PATH
+from prediction_table import DEFAULT_TABLE_PATH
+
+DEFAULT_CONFIG = {
+    'train_path': 'Train.csv',
+    'preprocessing': preprocessing.DEFAULT_CONFIG,
+    'split': {'test_size': preprocessing.TEST_SIZE, 'random_state': preprocessing.RANDOM_STATE},
+    'select': {'cv': 5, 'patience': None, 'max_features': None},
+    'tune': {'models': ['XGB'], 'max_fits': None, 'time_budget': None},
+    # 'selected'/'tuned' use the select/tune outputs; the defaults are the notebook's final choices,
+    # which are also the app's inputs
+    'export': {'features': FEATURE_NAMES, 'params': XGB_PARAMS, 'output_dir': '.',
+               'model_file': 'sales_prediction_model.pkl', 'artifact_file': DEFAULT_ARTIFACT_PATH,
+               'table_file': DEFAULT_TABLE_PATH},
+    'report': {'output_dir': 'report'},
+    # Listings the cube scores, written next to the exported artifact
+    'catalog_path': 'Test.csv',
+    'cube': {'output_file': DEFAULT_CUBE_PATH},
+    # Parallelism inside select/tune; changes speed, not results, so no stage hashes it
+    'n_jobs': -1,
+}
+
+
+class Stage:
+    """A stage function, the stages it reads and the config it depends on.
+
+    `inputs` is a tuple of stage names, or a function of the config returning one.
+    `files` names config entries holding paths whose contents are part of the cache key.
+    `outputs(config, value)` lists the files the stage writes besides its cached
+    value; the runner reruns it when one of them is missing or has changed.
+    """
+
+    def __init__(self, func, inputs=(), config=(), files=(), outputs=None):
+        self.func = func
+        self.inputs = inputs
+        self.config = config
+        self.files = files
+        self.outputs = outputs
+
+    def requires(self, config):
+        return tuple(self.inputs(config) if callable(self.inputs) else self.inputs)
+
+
+def load(config, inputs):
+    import pandas as pd
+
+    return pd.read_csv(config['train_path'])
+
+
+def clean(config, inputs):
+    return preprocessing.clean(inputs['load'], config['preprocessing'])
+
+
+def encode(config, inputs):
+    frame, label_encoders, ohe = preprocessing.encode(inputs['clean'], config['preprocessing'])
+    return {'frame': frame, 'label_encoders': label_encoders, 'ohe': ohe}
+
+
+def transform(config, inputs):
+    settings = config['preprocessing']
+    df, scaler = preprocessing.transform(inputs['encode']['frame'], settings)
+    X, y = df.drop(settings['dropped_columns'], axis=1), df[preprocessing.TARGET]
+    if settings.get('onehot_encoding', 'dense') == 'sparse':
+        X = preprocessing.to_csr(X, inputs['encode']['ohe'], settings['onehot_columns'])
+    X_train, X_test, y_train, y_test = preprocessing.split(X, y, **config['split'])
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test, 'scaler': scaler}
+
+
+def select(config, inputs):
+    from feature_selection import select_features
+
+    data = inputs['transform']
+    results, features = select_features(data['X_train'], data['y_train'], n_jobs=config['n_jobs'],
+                                        **config['select'])
+    return {'results': results, 'features': list(features)}
+
+
+def tune(config, inputs):
+    from tuning import tune as tune_models
+
+    data = inputs['transform']
+    results, params = tune_models(data['X_train'], data['y_train'], data['X_test'], data['y_test'],
+                                  n_jobs=config['n_jobs'], **config['tune'])
+    return {'results': results, 'params': params}
+
+
+def _export_inputs(config):
+    inputs = ['encode', 'transform']
+    if config['export']['features'] == 'selected':
+        inputs.append('select')
+    if config['export']['params'] == 'tuned':
+        inputs.append('tune')
+    return inputs
+
+
+def export(config, inputs):
+    """Fit the final model and write the pickle, the artifact and (for the app's inputs) the prediction table."""
+    from xgboost import XGBRegressor
+
+    from model_artifact import build_artifact, load_artifact, save_artifact
+    from prediction_table import build_table, save_table
+    from tuning import evaluation_metrics
+
+    settings = config['export']
+    if config['preprocessing'].get('onehot_encoding', 'dense') != 'dense':
+        raise ValueError("export needs the 'dense' one-hot encoding; the artifact stores the fitted OneHotEncoder")
+    data, encoded = inputs['transform'], inputs['encode']
+    features = inputs['select']['features'] if settings['features'] == 'selected' else list(settings['features'])
+    params = inputs['tune']['params']['XGB'] if settings['params'] == 'tuned' else dict(settings['params'])
+
+    X_train, X_test = data['X_train'][features], data['X_test'][features]
+    model = XGBRegressor(**params).fit(X_train, data['y_train'])
+    metrics = evaluation_metrics(model, X_train, data['y_train'], X_test, data['y_test'])
+
+    output_dir = settings['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, settings['model_file'])
+    tmp_path = f"{model_path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as file:
+        pickle.dump(model, file)
+    os.replace(tmp_path, model_path)
+
+    artifact_path = os.path.join(output_dir, settings['artifact_file'])
+    artifact = build_artifact(model, data['scaler'], encoded['label_encoders'], encoded['ohe'], features,
+                              scaled_features=config['preprocessing']['scaled_features'])
+    save_artifact(artifact, artifact_path)
+    paths = [model_path, artifact_path]
+    if artifact_path.endswith('.json'):
+        paths += [os.path.splitext(artifact_path)[0] + ext for ext in ('.ubj', '.npz')]
+    # The table enumerates the app's discrete inputs; other feature sets have no table
+    if settings['table_file'] and features == FEATURE_NAMES and artifact_path.endswith('.json'):
+        table_path = os.path.join(output_dir, settings['table_file'])
+        save_table(build_table(load_artifact(artifact_path)), table_path)
+        paths.append(table_path)
+    return {'model': model, 'features': features, 'params': params, 'metrics': metrics, 'paths': paths,
+            'artifact': artifact}
+
+
+def report(config, inputs):
+    from pipeline.report import write_report
+
+    return write_report(inputs['load'], inputs['clean'], inputs['transform'], inputs['select'],
+                        config['report']['output_dir'])
+
+
+def cube(config, inputs):
+    """Score the catalog with the exported model and roll the predictions up into the forecast cube."""
+    import pandas as pd
+
+    from forecast_cube import ForecastCube
+    from model_artifact import SalesModel
+
+    # Listings are scored through batch_predict, which builds the app's features
+    if inputs['export']['features'] != FEATURE_NAMES:
+        raise ValueError("the cube needs a model exported with the app's features")
+    # The model export fitted, not the artifact file, which may have been replaced since
+    forecast = ForecastCube.build(pd.read_csv(config['catalog_path']), SalesModel(inputs['export']['artifact']))
+    forecast.save(_cube_path(config))
+    return forecast
+
+
+def _cube_path(config):
+    return os.path.join(config['export']['output_dir'], config['cube']['output_file'])
+
+
+STAGES = {
+    'load': Stage(load, config=('train_path',), files=('train_path',)),
+    'clean': Stage(clean, ('load',), config=('preprocessing',)),
+    'encode': Stage(encode, ('clean',), config=('preprocessing',)),
+    'transform': Stage(transform, ('encode',), config=('preprocessing', 'split')),
+    'select': Stage(select, ('transform',), config=('select',)),
+    'tune': Stage(tune, ('transform',), config=('tune',)),
+    'export': Stage(export, _export_inputs, config=('preprocessing', 'export'),
+                    outputs=lambda config, value: value['paths']),
+    'report': Stage(report, ('load', 'clean', 'transform', 'select'), config=('report',)),
+    'cube': Stage(cube, ('export',), config=('export', 'cube'), files=('catalog_path',),
+                  outputs=lambda config, value: [_cube_path(config)]),
+}
+
+# What `python -m pipeline` runs without --targets; the report and the cube are opt-in
+DEFAULT_TARGETS = ['select', 'tune', 'export']
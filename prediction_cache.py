@@ -0,0 +1,69 @@
+"""Bounded LRU/TTL memo for single predictions.
+
+Streamlit reruns app.py on every widget interaction, and users tend to revisit the
+same handful of inputs, so the app memoizes `predict_sales` results process-wide
+(shared by all sessions) keyed on the normalized feature tuple.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_features(outlet_type, outlet_identifier_out027, item_mrp, outlet_identifier_out019,
+                       outlet_age, outlet_identifier_out035):
+    """Canonical, hashable key for one `predict_sales` call.
+
+    Accepts the outlet flags either as the app's labels ('OUT027' / 'Other') or as 0/1.
+    """
+    def flag(value, outlet):
+        return 1 if value == outlet or value == 1 else 0
+
+    return (int(outlet_type),
+            flag(outlet_identifier_out027, 'OUT027'),
+            float(item_mrp),
+            flag(outlet_identifier_out019, 'OUT019'),
+            int(outlet_age),
+            flag(outlet_identifier_out035, 'OUT035'))
+
+
+class PredictionCache:
+    """Thread-safe LRU cache whose entries also expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize=4096, ttl=3600.0, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Compute outside the lock so concurrent sessions don't serialize on the model
+        value = compute()
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,374 @@
+"""Standalone asyncio HTTP prediction service with micro-batching.
+
+Endpoints (JSON in, JSON out):
+    POST /predict        one row, keyed like the arguments of `predict_sales` in app.py:
+                         {"outlet_type": 1, "outlet_identifier_out027": "Other", "item_mrp": 150.0,
+                          "outlet_identifier_out019": "Other", "outlet_age": 25,
+                          "outlet_identifier_out035": "Other"}
+                         -> {"prediction": 2464.69}
+                         outlet_type is a code 0-3 and outlet_age an integer; each flag is its
+                         outlet's label, "Other", 0 or 1. Anything else is a 400.
+    POST /predict/batch  {"rows": [<row>, ...]} -> {"predictions": [...]}
+    GET  /health         -> {"status": "ok"}
+    GET  /metrics        latency histograms in the Prometheus text format (with --metrics;
+                         per worker process under --workers)
+
+Concurrent requests are coalesced: rows wait at most `max_wait_ms` for others to
+arrive and are scored together, up to `max_batch_size` rows per model call.
+Only the standard library and the model evaluator are needed.
+
+With `--workers N` the server pre-forks N worker processes that accept on one
+shared listening socket. The parent writes the model parameters and the
+prediction table once to a read-only file (shared_model.py) and every worker maps
+it zero-copy instead of loading its own copy.
+
+`--profile-dir` turns on the stack sampler from instrumentation.py: requests
+slower than `--profile-threshold-ms` are dumped there as folded stacks. SIGUSR1
+toggles it at runtime.
+
+Usage:
+    python prediction_server.py --port 8000 --max-batch-size 256 --max-wait-ms 2
+    python prediction_server.py --port 8000 --workers 4
+    python prediction_server.py --port 8000 --metrics --profile-dir profiles
+"""
+
+import asyncio
+import json
+import math
+import os
+import signal
+import socket
+
+import numpy as np
+
+from instrumentation import METRICS, PROFILER, install_toggle_signal
+from model_artifact import DEFAULT_ARTIFACT_PATH, load_artifact
+
+FEATURE_KEYS = ['outlet_type', 'outlet_identifier_out027', 'item_mrp',
+                'outlet_identifier_out019', 'outlet_age', 'outlet_identifier_out035']
+
+# Outlet_Type label codes 0-3 (batch_predict.OUTLET_TYPES, which would import pandas)
+N_OUTLET_TYPES = 4
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _number(row, key):
+    value = row[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise BadRequest(f"{key} must be a finite number, got {value!r}")
+    return value
+
+
+def _integer(row, key):
+    value = _number(row, key)
+    if value != int(value):
+        raise BadRequest(f"{key} must be an integer, got {value!r}")
+    return int(value)
+
+
+def _flag(row, key, outlet):
+    value = row[key]
+    number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if value == outlet or number and value == 1:
+        return 1
+    if value == 'Other' or number and value == 0:
+        return 0
+    raise BadRequest(f"{key} must be {outlet!r}, 'Other', 0 or 1, got {value!r}")
+
+
+def parse_row(row):
+    """Feature tuple for one JSON row, in `predict_sales` order.
+
+    Stricter than the app's `normalize_features`: a value that doesn't name a
+    valid input exactly is rejected rather than coerced.
+    """
+    if not isinstance(row, dict):
+        raise BadRequest("each row must be a JSON object")
+    missing = [key for key in FEATURE_KEYS if key not in row]
+    if missing:
+        raise BadRequest(f"missing fields: {missing}")
+    outlet_type = _integer(row, 'outlet_type')
+    if not 0 <= outlet_type < N_OUTLET_TYPES:
+        raise BadRequest(f"outlet_type must be a code in [0, {N_OUTLET_TYPES}), got {outlet_type}")
+    return (outlet_type,
+            _flag(row, 'outlet_identifier_out027', 'OUT027'),
+            float(_number(row, 'item_mrp')),
+            _flag(row, 'outlet_identifier_out019', 'OUT019'),
+            _integer(row, 'outlet_age'),
+            _flag(row, 'outlet_identifier_out035', 'OUT035'))
+
+
+class MicroBatcher:
+    """Coalesces concurrently submitted feature blocks into one `predict` call."""
+
+    def __init__(self, predict, max_batch_size=256, max_wait=0.002):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = asyncio.Queue()
+
+    async def submit(self, features):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        n_rows = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+        while n_rows < self.max_batch_size:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            items.append(item)
+            n_rows += len(item[0])
+        return items
+
+    def _score(self, items):
+        try:
+            predictions = self.predict(np.concatenate([features for features, _ in items]))
+        except Exception:
+            # One bad block must not fail the requests it was batched with
+            for features, future in items:
+                if not future.done():
+                    try:
+                        future.set_result(self.predict(features))
+                    except Exception as error:
+                        future.set_exception(error)
+            return
+        start = 0
+        for features, future in items:
+            if not future.done():
+                future.set_result(predictions[start:start + len(features)])
+            start += len(features)
+
+    async def run(self):
+        while True:
+            items = await self._collect()
+            self.batches += 1
+            self.rows += sum(len(features) for features, _ in items)
+            self._score(items)
+
+
+class PredictionServer:
+    def __init__(self, model, max_batch_size=256, max_wait_ms=2.0):
+        self.model = model
+        self.batcher = MicroBatcher(model.predict, max_batch_size=max_batch_size, max_wait=max_wait_ms / 1000)
+
+    async def handle(self, method, path, body):
+        """Route one request; returns (status, JSON-serializable payload)."""
+        if path == '/health':
+            return 200, {'status': 'ok', 'batches': self.batcher.batches, 'rows': self.batcher.rows}
+        if path == '/metrics':
+            return 200, METRICS.render()
+        if path not in ('/predict', '/predict/batch'):
+            return 404, {'error': f"unknown path {path}"}
+        if method != 'POST':
+            return 405, {'error': "use POST"}
+        try:
+            payload = json.loads(body or b'null')
+            if path == '/predict':
+                with METRICS.time('feature_build', rows=1):
+                    rows = [parse_row(payload)]
+            else:
+                if not isinstance(payload, dict) or not isinstance(payload.get('rows'), list):
+                    raise BadRequest('expected {"rows": [...]}')
+                with METRICS.time('feature_build', rows=len(payload['rows'])):
+                    rows = [parse_row(row) for row in payload['rows']]
+        except (ValueError, BadRequest) as error:
+            return 400, {'error': str(error)}
+        if not rows:
+            return 200, {'predictions': []}
+
+        try:
+            predictions = await self.batcher.submit(np.array(rows, dtype=np.float64))
+        except ValueError as error:
+            return 400, {'error': str(error)}
+        if path == '/predict':
+            return 200, {'prediction': float(predictions[0])}
+        return 200, {'predictions': [float(p) for p in predictions]}
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body's extent is unknown, so the connection can't be reused
+                    status, payload = 400, {'error': "invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        with METRICS.time('request'):
+                            status, payload = await self.handle(method, path.split('?')[0], body)
+                    except Exception as error:
+                        status, payload = 500, {'error': repr(error)}
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                METRICS.count(f'http_{status}_responses')
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), 'text/plain; version=0.0.4'
+                else:
+                    data, content_type = json.dumps(payload).encode(), 'application/json'
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: {content_type}\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000, sock=None, ready=None):
+        batcher_task = asyncio.create_task(self.batcher.run())
+        if sock is not None:
+            server = await asyncio.start_server(self.serve_connection, sock=sock)
+        else:
+            server = await asyncio.start_server(self.serve_connection, host, port)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher_task.cancel()
+
+
+def serve_prefork(shared_path, host, port, workers, max_batch_size=256, max_wait_ms=2.0):
+    """Fork `workers` processes that serve from one listening socket and one mapped model file."""
+    from shared_model import SharedModel
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(1024)
+
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if PROFILER.enabled:
+                # Threads don't survive fork; restart the sampler in the worker
+                PROFILER.enable()
+            try:
+                server = PredictionServer(SharedModel(shared_path), max_batch_size=max_batch_size,
+                                          max_wait_ms=max_wait_ms)
+                asyncio.run(server.serve(sock=listener))
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    listener.close()
+
+    def stop(signum, frame):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in pids:
+        while True:
+            try:
+                os.waitpid(pid, 0)
+                break
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+
+
+def main(argv=None):
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Serve sales predictions over HTTP with micro-batching.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument('--backend', choices=['numpy', 'xgboost'], default='numpy')
+    parser.add_argument('--max-batch-size', type=int, default=256, help="most rows scored per model call")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help="longest a row waits for others to batch with")
+    parser.add_argument('--workers', type=int, default=0, help="pre-fork this many workers sharing a mapped model")
+    parser.add_argument('--shared-model', help="where to write the shared model file (default: a temp file)")
+    parser.add_argument('--metrics', action='store_true', help="collect latency histograms for GET /metrics")
+    parser.add_argument('--profile-dir', help="dump folded stacks of slow requests here (SIGUSR1 toggles)")
+    parser.add_argument('--profile-threshold-ms', type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    METRICS.enabled = METRICS.enabled or args.metrics
+    if args.profile_dir:
+        PROFILER.enable(args.profile_dir, threshold=args.profile_threshold_ms / 1000)
+    install_toggle_signal()
+
+    if args.workers < 1:
+        server = PredictionServer(load_artifact(args.artifact, backend=args.backend),
+                                  max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+        print(f"Serving predictions on http://{args.host}:{args.port}")
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    from shared_model import write_shared_model
+
+    shared_path = args.shared_model or os.path.join(tempfile.gettempdir(), f"sales_prediction_shared-{os.getpid()}.bin")
+    write_shared_model(load_artifact(args.artifact, backend='numpy'), shared_path)
+    print(f"Serving predictions on http://{args.host}:{args.port} with {args.workers} workers "
+          f"(shared model: {shared_path})", flush=True)
+    try:
+        serve_prefork(shared_path, args.host, args.port, args.workers,
+                      max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    finally:
+        if not args.shared_model:
+            os.remove(shared_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""Precomputed prediction table over the app's input space.
+
+Five of the six model inputs are discrete (Outlet_Type code, three outlet flags,
+integer Outlet_Age) and a tree ensemble is piecewise constant in the one
+continuous input, Item_MRP. So every prediction the app can make is one entry of
+a table indexed by (discrete combination, MRP interval between consecutive split
+thresholds). Discrete values that fall between the same split thresholds share a
+row, which keeps the table small.
+
+The table is stored in a flat binary file (see `save_table` for the layout) and
+answers a prediction with a few array lookups and one binary search over the MRP
+thresholds, without the model in memory.
+
+Usage:
+    python prediction_table.py --artifact sales_prediction_artifact.json --output sales_prediction_table.bin
+"""
+
+import bisect
+import struct
+
+import numpy as np
+
+DEFAULT_TABLE_PATH = "sales_prediction_table.bin"
+
+MAGIC = b'SPTABLE\x00'
+TABLE_VERSION = 1
+CONTINUOUS_FEATURE = 'Item_MRP'
+# Range of the app's Outlet Age slider
+AGE_RANGE = (0, 100)
+
+
+def _discrete_domain(sales_model, index, age_range):
+    """(min value, number of values) a discrete app input can take."""
+    name = sales_model.feature_names[index]
+    if index in sales_model._lookup:
+        return 0, len(sales_model._lookup[index])
+    if name == 'Outlet_Age':
+        return age_range[0], age_range[1] - age_range[0] + 1
+    if name.startswith('Outlet_Identifier_'):
+        return 0, 2
+    raise ValueError(f"Don't know the discrete domain of feature {name}")
+
+
+def _split_thresholds(trees, index):
+    mask = (trees.feature == index) & np.isfinite(trees.threshold)
+    return np.unique(trees.threshold[mask])
+
+
+def _representatives(thresholds):
+    # One float32 value inside each interval: x < t goes left, so t itself starts the next interval
+    if len(thresholds) == 0:
+        return np.zeros(1, dtype=np.float32)
+    return np.concatenate([[thresholds[0] - np.float32(1)], thresholds]).astype(np.float32)
+
+
+def build_table(sales_model, age_range=AGE_RANGE):
+    """Materialize the table from a SalesModel loaded with the NumPy backend."""
+    trees = sales_model.model
+    if not hasattr(trees, 'threshold'):
+        raise ValueError("build_table needs the flattened trees, load the artifact with backend='numpy'")
+
+    n_features = len(sales_model.feature_names)
+    mrp_index = sales_model.feature_names.index(CONTINUOUS_FEATURE)
+    mrp_thresholds = _split_thresholds(trees, mrp_index)
+
+    # Per discrete feature: value -> bucket (interval between its split thresholds),
+    # and a representative scaled value per bucket to evaluate the trees on.
+    lut_min, lut_len, luts, bucket_values = [], [], [], []
+    for index in range(n_features):
+        if index == mrp_index:
+            lut_min.append(0)
+            lut_len.append(0)
+            luts.append(np.zeros(0, dtype=np.int64))
+            bucket_values.append(None)
+            continue
+        low, count = _discrete_domain(sales_model, index, age_range)
+        raw = np.zeros((count, n_features))
+        raw[:, index] = np.arange(low, low + count)
+        scaled = sales_model.transform(raw)[:, index].astype(np.float32)
+        thresholds = _split_thresholds(trees, index)
+        luts.append(np.searchsorted(thresholds, scaled, side='right'))
+        lut_min.append(low)
+        lut_len.append(count)
+        bucket_values.append(_representatives(thresholds))
+    bucket_values[mrp_index] = _representatives(mrp_thresholds)
+
+    # Cartesian product of buckets, MRP last so each combination's MRP curve is contiguous
+    grids = np.meshgrid(*bucket_values, indexing='ij')
+    order = [i for i in range(n_features) if i != mrp_index] + [mrp_index]
+    grid = np.stack([grids[i].transpose(order).ravel() for i in range(n_features)], axis=1)
+    table = trees.predict(grid).astype(np.float32)
+
+    # Fold the row-major strides into the LUTs, so a combination index is a plain sum
+    shape = [len(bucket_values[i]) for i in order[:-1]]
+    strides = np.cumprod([1] + shape[::-1])[::-1][1:]
+    for stride, index in zip(strides, order[:-1]):
+        luts[index] = luts[index] * stride
+
+    return {
+        'mrp_index': mrp_index,
+        'mrp_coef': float(sales_model._coef[mrp_index]),
+        'mrp_offset': float(sales_model._offset[mrp_index]),
+        'lut_min': np.asarray(lut_min, dtype=np.int32),
+        'lut_len': np.asarray(lut_len, dtype=np.int32),
+        'luts': np.concatenate(luts).astype(np.int32),
+        'thresholds': mrp_thresholds.astype(np.float32),
+        'table': table,
+    }
+
+
+def save_table(table, path=DEFAULT_TABLE_PATH):
+    """Write the table as one flat little-endian file.
+
+    Layout: 8-byte magic; int32 header [version, n_features, mrp_index,
+    n_lut, n_thresholds, n_combinations]; int32 lut_min[n_features];
+    int32 lut_len[n_features]; float64 [mrp_coef, mrp_offset]; int32 luts[n_lut];
+    float32 thresholds[n_thresholds]; float32 table[n_combinations, n_thresholds + 1].
+    """
+    with open(path, 'wb') as file:
+        file.write(table_bytes(table))
+
+
+def table_bytes(table):
+    """The table file's contents (see `save_table`) as bytes."""
+    n_intervals = len(table['thresholds']) + 1
+    header = np.array([TABLE_VERSION, len(table['lut_min']), table['mrp_index'], len(table['luts']),
+                       len(table['thresholds']), len(table['table']) // n_intervals], dtype='<i4')
+    return MAGIC + b''.join(np.ascontiguousarray(array, dtype=dtype).tobytes()
+                            for array, dtype in ((header, '<i4'), (table['lut_min'], '<i4'), (table['lut_len'], '<i4'),
+                                                 (np.array([table['mrp_coef'], table['mrp_offset']]), '<f8'),
+                                                 (table['luts'], '<i4'), (table['thresholds'], '<f4'),
+                                                 (table['table'], '<f4')))
+
+
+def _parse(buffer):
+    """Split a table file's bytes into (header, arrays); arrays are views into `buffer`."""
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a prediction table file")
+    offset = len(MAGIC)
+
+    def take(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    version, n_features, mrp_index, n_lut, n_thresholds, n_combinations = take('<i4', 6).tolist()
+    if version != TABLE_VERSION:
+        raise ValueError(f"Unsupported table version {version}, expected {TABLE_VERSION}")
+    arrays = {
+        'lut_min': take('<i4', n_features),
+        'lut_len': take('<i4', n_features),
+        'mrp': take('<f8', 2),
+        'luts': take('<i4', n_lut),
+        'thresholds': take('<f4', n_thresholds),
+        'table': take('<f4', n_combinations * (n_thresholds + 1)),
+    }
+    return mrp_index, arrays
+
+
+def _to_float32(value):
+    # Round a Python float to float32 like the tree evaluator does
+    return struct.unpack('<f', struct.pack('<f', value))[0]
+
+
+class PredictionTable:
+    """Answers `predict_sales`-encoded feature rows from the precomputed table."""
+
+    def __init__(self, buffer):
+        self.mrp_index, arrays = _parse(buffer)
+        self._lut_min = arrays['lut_min'].tolist()
+        self._lut_len = arrays['lut_len'].tolist()
+        self._lut_start = np.concatenate([[0], np.cumsum(arrays['lut_len'])[:-1]]).tolist()
+        self._mrp_coef, self._mrp_offset = arrays['mrp'].tolist()
+        self.luts = arrays['luts']
+        self.thresholds = arrays['thresholds']
+        self.table = arrays['table']
+        self.n_intervals = len(self.thresholds) + 1
+        # Plain lists make the single-row path a handful of Python operations
+        self._lut_list = self.luts.tolist()
+        self._threshold_list = self.thresholds.tolist()
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        with open(path, 'rb') as file:
+            return cls(file.read())
+
+    def predict_one(self, features):
+        """Prediction for one row of the app's six inputs (same order as `predict_sales`)."""
+        if len(features) != len(self._lut_min):
+            raise ValueError(f"Expected {len(self._lut_min)} features, got {len(features)}")
+        combination = 0
+        for index, value in enumerate(features):
+            if index == self.mrp_index:
+                continue
+            position = int(value) - self._lut_min[index]
+            if position != value - self._lut_min[index] or not 0 <= position < self._lut_len[index]:
+                raise ValueError(f"Feature {index} value {value} is outside the precomputed table")
+            combination += self._lut_list[self._lut_start[index] + position]
+        mrp = _to_float32(features[self.mrp_index] * self._mrp_coef + self._mrp_offset)
+        interval = bisect.bisect_right(self._threshold_list, mrp)
+        return float(self.table[combination * self.n_intervals + interval])
+
+    def predict(self, features):
+        """Vectorized lookup for an (n_rows, 6) matrix."""
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(self._lut_min):
+            raise ValueError(f"Expected an (n, {len(self._lut_min)}) feature matrix, got {features.shape}")
+        combination = np.zeros(len(features), dtype=np.intp)
+        for index in range(features.shape[1]):
+            if index == self.mrp_index:
+                continue
+            position = features[:, index] - self._lut_min[index]
+            if ((position < 0) | (position >= self._lut_len[index]) | (position != np.floor(position))).any():
+                raise ValueError(f"Feature {index} has values outside the precomputed table")
+            combination += self.luts[self._lut_start[index] + position.astype(np.intp)]
+        mrp = (features[:, self.mrp_index] * self._mrp_coef + self._mrp_offset).astype(np.float32)
+        interval = np.searchsorted(self.thresholds, mrp, side='right')
+        return self.table[combination * self.n_intervals + interval]
+
+
+def main(argv=None):
+    import argparse
+
+    from model_artifact import DEFAULT_ARTIFACT_PATH, load_artifact
+
+    parser = argparse.ArgumentParser(description="Precompute the prediction table for the app's input space.")
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument('--output', '-o', default=DEFAULT_TABLE_PATH)
+    parser.add_argument('--max-age', type=int, default=AGE_RANGE[1], help="largest Outlet_Age to precompute")
+    args = parser.parse_args(argv)
+
+    table = build_table(load_artifact(args.artifact, backend='numpy'), age_range=(AGE_RANGE[0], args.max_age))
+    save_table(table, args.output)
+    n_intervals = len(table['thresholds']) + 1
+    print(f"{len(table['table']) // n_intervals} combinations x {n_intervals} MRP intervals "
+          f"saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Training-frame preprocessing from salesprediction.py as plain functions.
+
+`preprocess` runs the notebook's sections 3.2-5.4 (imputation, Outlet_Size mode
+pivot, fat-content normalization, Outlet_Age, ordinal/label/one-hot encoding,
+square-root transform, standard scaling) on the raw training frame and returns the
+design matrix, the target and the fitted transformers.
+
+`config['onehot_encoding']` selects how the one-hot block (Item_Identifier
+prefix, Item_Type, Outlet_Identifier) is represented:
+- 'dense': float64 columns in the frame, as in the notebook;
+- 'sparse': the design matrix is a scipy CSR matrix (numeric columns, then the
+  one-hot block);
+- 'categorical': one pandas category column each, for XGBoost's
+  `enable_categorical` (see `xgboost_params`).
+"""
+
+import numpy as np
+import pandas as pd
+
+from model_artifact import (FAT_CONTENT_MAP, ONEHOT_COLUMNS, OUTLET_LOCATION_MAP, OUTLET_SIZE_MAP,
+                            SCALED_FEATURES, THIS_YEAR)
+
+TARGET = 'Item_Outlet_Sales'
+
+# Everything that changes the output of `preprocess`; part of the feature cache key
+DEFAULT_CONFIG = {
+    'this_year': THIS_YEAR,
+    'fat_content_map': FAT_CONTENT_MAP,
+    'outlet_size_map': OUTLET_SIZE_MAP,
+    'outlet_location_map': OUTLET_LOCATION_MAP,
+    'label_encoded': ['Item_Fat_Content', 'Outlet_Type'],
+    'onehot_columns': ONEHOT_COLUMNS,
+    'item_identifier_prefix': 2,
+    'scaled_features': SCALED_FEATURES,
+    'dropped_columns': ['Outlet_Establishment_Year', 'Item_Visibility', TARGET],
+    'onehot_encoding': 'dense',
+}
+
+ENCODINGS = ('dense', 'sparse', 'categorical')
+
+# Same split as the notebook
+TEST_SIZE = 0.2
+RANDOM_STATE = 2
+
+
+def clean(df_train, config=DEFAULT_CONFIG):
+    """Section 3: impute Item_Weight and Outlet_Size, normalize Item_Fat_Content."""
+    df = df_train.copy()
+    df['Item_Weight'] = df['Item_Weight'].fillna(df['Item_Weight'].mean())
+    mode_of_outlet_size = df.pivot_table(values='Outlet_Size', columns='Outlet_Type', aggfunc=(lambda x: x.mode()[0]))
+    miss_values = df['Outlet_Size'].isnull()
+    df.loc[miss_values, 'Outlet_Size'] = df.loc[miss_values, 'Outlet_Type'].apply(lambda x: mode_of_outlet_size[x])
+    return df.replace({'Item_Fat_Content': config['fat_content_map']})
+
+
+def encode(df, config=DEFAULT_CONFIG):
+    """Section 5.1-5.2: Outlet_Age, ordinal, label and one-hot encoding.
+
+    Returns (encoded frame, label_encoders, ohe); ohe is None in 'categorical' mode.
+    """
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+
+    df = df.copy()
+    df['Outlet_Age'] = config['this_year'] - df['Outlet_Establishment_Year'].astype(int)
+    df['Outlet_Size'] = df['Outlet_Size'].map(config['outlet_size_map'])
+    df['Outlet_Location_Type'] = df['Outlet_Location_Type'].map(config['outlet_location_map'])
+
+    label_encoders = {}
+    for col in config['label_encoded']:
+        label_encoders[col] = LabelEncoder()
+        df[col] = label_encoders[col].fit_transform(df[col])
+
+    onehot_columns = config['onehot_columns']
+    df['Item_Identifier'] = df['Item_Identifier'].str[:config['item_identifier_prefix']]
+    encoding = config.get('onehot_encoding', 'dense')
+    if encoding not in ENCODINGS:
+        raise ValueError(f"unknown onehot_encoding {encoding!r}; expected one of {ENCODINGS}")
+    if encoding == 'categorical':
+        df[onehot_columns] = df[onehot_columns].astype('category')
+        return df, label_encoders, None
+    ohe = OneHotEncoder(drop='first').fit(df[onehot_columns])
+    if encoding == 'sparse':
+        # The raw columns stay; `preprocess` appends the CSR block after scaling
+        return df, label_encoders, ohe
+    encoded = ohe.transform(df[onehot_columns]).toarray()
+    encoded_df = pd.DataFrame(encoded, columns=ohe.get_feature_names_out(onehot_columns), index=df.index)
+    df = pd.concat([df.drop(columns=onehot_columns), encoded_df], axis=1)
+    return df, label_encoders, ohe
+
+
+def transform(df, config=DEFAULT_CONFIG):
+    """Section 5.3-5.4: square-root Item_Visibility and standard-scale the numeric features.
+
+    Returns (scaled frame, scaler).
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    df = df.copy()
+    df['Item_Visibility_Sqrt'] = np.sqrt(df['Item_Visibility'])
+    scaler = StandardScaler()
+    df[config['scaled_features']] = scaler.fit_transform(df[config['scaled_features']])
+    return df, scaler
+
+
+def encode_fitted(df, label_encoders, config=DEFAULT_CONFIG):
+    """`encode` and the square-root transform of a cleaned frame, with already-fitted label encoders.
+
+    For new data (incremental batches, out-of-core chunks), which must be encoded
+    as the training data was: an unseen label-encoded value raises ValueError. The
+    one-hot columns stay raw (see `model_features`) and nothing is scaled.
+    """
+    df = df.copy()
+    df['Outlet_Age'] = config['this_year'] - df['Outlet_Establishment_Year'].astype(int)
+    df['Outlet_Size'] = df['Outlet_Size'].astype(object).map(config['outlet_size_map'])
+    df['Outlet_Location_Type'] = df['Outlet_Location_Type'].astype(object).map(config['outlet_location_map'])
+    for col, encoder in label_encoders.items():
+        df[col] = encoder.transform(df[col].astype(str).to_numpy(dtype=object))
+    df['Item_Identifier'] = df['Item_Identifier'].astype(str).str[:config['item_identifier_prefix']]
+    df['Item_Visibility_Sqrt'] = np.sqrt(df['Item_Visibility'].astype(np.float64))
+    return df
+
+
+def model_features(encoded, feature_names, scaling=None, config=DEFAULT_CONFIG):
+    """The `feature_names` columns of an `encode_fitted` frame as float64, one-hot flags included.
+
+    `scaling` maps scaled features to (mean, scale), as in the model artifact;
+    without it the values stay unscaled.
+    """
+    columns = {}
+    for name in feature_names:
+        if name in encoded:
+            values = encoded[name].to_numpy(dtype=np.float64)
+            if scaling and name in scaling:
+                mean, scale = scaling[name]
+                values = (values - mean) / scale
+            columns[name] = values
+            continue
+        col = next((col for col in config['onehot_columns'] if name.startswith(f"{col}_")), None)
+        if col is None:
+            raise ValueError(f"Unknown feature {name!r}")
+        columns[name] = (encoded[col].astype(str) == name[len(col) + 1:]).to_numpy(dtype=np.float64)
+    return pd.DataFrame(columns, index=encoded.index)
+
+
+def preprocess(df_train, config=DEFAULT_CONFIG):
+    """Raw training frame -> (X, y, (scaler, label_encoders, ohe))."""
+    df, label_encoders, ohe = encode(clean(df_train, config), config)
+    df, scaler = transform(df, config)
+    X = df.drop(config['dropped_columns'], axis=1)
+    y = df[TARGET]
+    if config.get('onehot_encoding', 'dense') == 'sparse':
+        X = to_csr(X, ohe, config['onehot_columns'])
+    return X, y, (scaler, label_encoders, ohe)
+
+
+def to_csr(X, ohe, onehot_columns):
+    """CSR design matrix: the numeric columns of X, then the one-hot block."""
+    from scipy import sparse
+
+    numeric = sparse.csr_matrix(X.drop(columns=onehot_columns).to_numpy(dtype=np.float64))
+    return sparse.hstack([numeric, ohe.transform(X[onehot_columns])], format='csr')
+
+
+def xgboost_params(X):
+    """Extra XGBRegressor parameters needed to fit on X (category columns need enable_categorical)."""
+    if isinstance(X, pd.DataFrame) and any(isinstance(dtype, pd.CategoricalDtype) for dtype in X.dtypes):
+        return {'enable_categorical': True, 'tree_method': 'hist'}
+    return {}
+
+
+def split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """The notebook's train/test split: (X_train, X_test, y_train, y_test)."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
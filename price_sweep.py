@@ -0,0 +1,187 @@
+"""What-if pricing sweep: predicted sales of items at outlets over a grid of Item_MRP values.
+
+The pricing team wants sales curves for thousands of items at every outlet, i.e.
+the Cartesian product items x outlets x MRP grid, easily hundreds of millions
+of points. Scoring it point by point is almost all repeated work:
+- the app's model sees an item only through its MRP, and an outlet only through
+  its type, flags and age;
+- the trees are piecewise constant in Item_MRP (see prediction_table.py), so all
+  prices between two consecutive split thresholds get the same prediction.
+`PriceSweep` evaluates the trees once per distinct outlet and MRP interval (a
+few hundred rows for the Big Mart outlets), then answers every point of the
+product with a binary search over the thresholds and a gather. `sweep` yields
+the product in chunks of whole items, so peak memory depends on the chunk size,
+not on the size of the sweep.
+
+The grid is either absolute prices, or multipliers of each item's current MRP
+(`relative=True`).
+
+Usage:
+    python price_sweep.py Test.csv --grid 30 270 --points 241 --output sweep.parquet
+    python price_sweep.py Test.csv --relative --grid 0.8 1.2 --points 9 --output sweep.csv
+    python price_sweep.py Test.csv --curves
+"""
+
+import numpy as np
+import pandas as pd
+
+from batch_predict import INPUT_COLUMNS, build_features
+from prediction_table import CONTINUOUS_FEATURE, _representatives, _split_thresholds
+
+DEFAULT_OUTPUT_PATH = "price_sweep.csv"
+# Output rows per chunk; a chunk holds whole items, so it can be larger for very long grids
+DEFAULT_CHUNK_ROWS = 1_000_000
+OUTLET_COLUMNS = [col for col in INPUT_COLUMNS if col != 'Item_MRP']
+OUTPUT_COLUMNS = ['Item_Identifier', 'Outlet_Identifier', 'Item_MRP', 'Item_Outlet_Sales']
+
+
+def _as_grid(grid):
+    grid = np.asarray(grid, dtype=np.float64)
+    if grid.ndim != 1 or len(grid) == 0 or not np.isfinite(grid).all():
+        raise ValueError("The MRP grid must be a non-empty 1-d array of finite values")
+    return grid
+
+
+class PriceSweep:
+    """Piecewise-constant MRP curves of a set of outlets, for sweeping prices.
+
+    `sales_model` must be loaded with the NumPy backend (the thresholds are read
+    from the flattened trees). `outlets` has one row per outlet with
+    Outlet_Identifier, Outlet_Type and Outlet_Establishment_Year.
+    """
+
+    def __init__(self, sales_model, outlets):
+        trees = sales_model.model
+        if not hasattr(trees, 'threshold'):
+            raise ValueError("PriceSweep needs the flattened trees, load the artifact with backend='numpy'")
+        missing = [col for col in OUTLET_COLUMNS if col not in outlets.columns]
+        if missing:
+            raise ValueError(f"Missing outlet columns: {missing}")
+        if outlets['Outlet_Identifier'].duplicated().any():
+            raise ValueError("Outlets must be given once each")
+
+        self.outlets = outlets['Outlet_Identifier'].astype(str).to_numpy()
+        self.mrp_index = sales_model.feature_names.index(CONTINUOUS_FEATURE)
+        self._mrp_coef = sales_model._coef[self.mrp_index]
+        self._mrp_offset = sales_model._offset[self.mrp_index]
+        self.thresholds = _split_thresholds(trees, self.mrp_index).astype(np.float32)
+
+        # Outlets with the same features share a curve; evaluate each distinct one per MRP interval
+        scaled = sales_model.transform(build_features(outlets[OUTLET_COLUMNS].assign(Item_MRP=0.0)))
+        distinct, inverse = np.unique(scaled.astype(np.float32), axis=0, return_inverse=True)
+        representatives = _representatives(self.thresholds)
+        grid = np.repeat(distinct, len(representatives), axis=0)
+        grid[:, self.mrp_index] = np.tile(representatives, len(distinct))
+        curves = trees.predict(grid).reshape(len(distinct), len(representatives))
+        # curves[outlet, interval] is the prediction for any MRP in that interval
+        self.curves = curves[inverse.ravel()]
+
+    def intervals(self, mrp):
+        """MRP interval of each raw price, scaled and compared in float32 like the trees do."""
+        scaled = (np.asarray(mrp, dtype=np.float64) * self._mrp_coef + self._mrp_offset).astype(np.float32)
+        return np.searchsorted(self.thresholds, scaled, side='right')
+
+    def predict(self, outlet_positions, mrp):
+        """Predictions for outlet positions (into `outlets`) and raw prices of the same shape."""
+        return self.curves[outlet_positions, self.intervals(mrp)]
+
+    def curve_table(self):
+        """Every outlet's curve as price bands: MRP_From (inclusive), MRP_To (exclusive), prediction.
+
+        The band edges are the split thresholds mapped back to raw prices; a price
+        within float32 rounding of an edge may fall in either band.
+        """
+        edges = (self.thresholds.astype(np.float64) - self._mrp_offset) / self._mrp_coef
+        n_intervals = len(edges) + 1
+        return pd.DataFrame({
+            'Outlet_Identifier': np.repeat(self.outlets, n_intervals),
+            'MRP_From': np.tile(np.concatenate([[-np.inf], edges]), len(self.outlets)),
+            'MRP_To': np.tile(np.concatenate([edges, [np.inf]]), len(self.outlets)),
+            'Item_Outlet_Sales': self.curves.ravel(),
+        })
+
+    def sweep(self, items, grid, relative=False, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield the items x outlets x grid product as DataFrames of OUTPUT_COLUMNS.
+
+        Rows are ordered by item, then outlet, then grid point. With `relative`,
+        the grid holds multipliers of each item's Item_MRP.
+        """
+        grid = _as_grid(grid)
+        if 'Item_Identifier' not in items.columns or relative and 'Item_MRP' not in items.columns:
+            raise ValueError("Items need Item_Identifier, and Item_MRP for a relative grid")
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be a positive integer")
+        item_ids = pd.Index(items['Item_Identifier'].astype(str))
+        if item_ids.has_duplicates:
+            repeated = sorted(set(item_ids[item_ids.duplicated()]))
+            raise ValueError(f"Items must be given once each, repeated: {repeated[:5]}")
+
+        n_outlets, n_grid = len(self.outlets), len(grid)
+        per_item = n_outlets * n_grid
+        step = max(1, chunk_rows // per_item)
+        outlet_codes = np.repeat(np.arange(n_outlets, dtype=np.int32), n_grid)
+        if relative:
+            current = items['Item_MRP'].to_numpy(dtype=np.float64)
+        else:
+            # The same curve for every item: look it up once
+            absolute = np.broadcast_to(grid, (n_outlets, n_grid)).ravel()
+            absolute_predictions = self.curves[:, self.intervals(grid)].ravel()
+
+        for start in range(0, len(item_ids), step):
+            count = min(step, len(item_ids) - start)
+            if relative:
+                mrp = current[start:start + count, None] * grid
+                # (outlets, items, grid) -> (items, outlets, grid)
+                predictions = self.curves[:, self.intervals(mrp)].transpose(1, 0, 2).ravel()
+                mrp = np.repeat(mrp, n_outlets, axis=0).ravel()
+            else:
+                mrp = np.tile(absolute, count)
+                predictions = np.tile(absolute_predictions, count)
+            codes = np.repeat(np.arange(start, start + count, dtype=np.int32), per_item)
+            yield pd.DataFrame({
+                'Item_Identifier': pd.Categorical.from_codes(codes, categories=item_ids),
+                'Outlet_Identifier': pd.Categorical.from_codes(np.tile(outlet_codes, count), categories=self.outlets),
+                'Item_MRP': mrp,
+                'Item_Outlet_Sales': predictions,
+            })
+
+
+def items_and_outlets(catalog):
+    """Distinct items (Item_Identifier, Item_MRP) and outlets of a Test.csv-shaped frame."""
+    items = catalog.drop_duplicates('Item_Identifier')[['Item_Identifier', 'Item_MRP']]
+    outlets = catalog.drop_duplicates('Outlet_Identifier')[OUTLET_COLUMNS].sort_values('Outlet_Identifier')
+    return items.reset_index(drop=True), outlets.reset_index(drop=True)
+
+
+def main(argv=None):
+    import argparse
+
+    from model_artifact import DEFAULT_ARTIFACT_PATH, load_artifact
+    from synthetic_data import write_csv, write_parquet
+
+    parser = argparse.ArgumentParser(description="Predicted sales of every item at every outlet over an MRP grid.")
+    parser.add_argument('catalog', help="Test.csv-shaped file listing the items and outlets to sweep")
+    parser.add_argument('--grid', type=float, nargs=2, default=[30.0, 270.0], metavar=('START', 'STOP'),
+                        help="MRP range, inclusive (multipliers of each item's MRP with --relative)")
+    parser.add_argument('--points', type=int, default=241, help="grid points in the range")
+    parser.add_argument('--relative', action='store_true', help="grid values multiply each item's current MRP")
+    parser.add_argument('--curves', action='store_true', help="print each outlet's price bands instead")
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT_PATH, help="CSV, or Parquet if it ends in .parquet")
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_PATH)
+    args = parser.parse_args(argv)
+
+    items, outlets = items_and_outlets(pd.read_csv(args.catalog))
+    engine = PriceSweep(load_artifact(args.artifact, backend='numpy'), outlets)
+    if args.curves:
+        print(engine.curve_table().to_string(index=False))
+        return
+
+    grid = np.linspace(args.grid[0], args.grid[1], args.points)
+    write = write_parquet if args.output.endswith('.parquet') else write_csv
+    write(engine.sweep(items, grid, relative=args.relative), args.output)
+    print(f"Swept {len(items)} items x {len(outlets)} outlets x {len(grid)} prices "
+          f"({len(items) * len(outlets) * len(grid):,} rows) into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
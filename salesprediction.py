@@ -538,10 +538,11 @@ df['Outlet_Age'] = this_year - df['Outlet_Establishment_Year'].astype(int)
 df['Outlet_Size'] = df['Outlet_Size'].replace({'Small': 1, 'Medium': 2, 'High': 3})
 df['Outlet_Location_Type'] = df['Outlet_Location_Type'].replace({'Tier 1': 1, 'Tier 2': 2, 'Tier 3': 3})
 
-# Label Encoding for nominal features
-le = LabelEncoder()
-df['Item_Fat_Content'] = le.fit_transform(df['Item_Fat_Content'])
-df['Outlet_Type'] = le.fit_transform(df['Outlet_Type'])
+# Label Encoding for nominal features (one encoder per column so both can be exported)
+le_fat_content = LabelEncoder()
+le_outlet_type = LabelEncoder()
+df['Item_Fat_Content'] = le_fat_content.fit_transform(df['Item_Fat_Content'])
+df['Outlet_Type'] = le_outlet_type.fit_transform(df['Outlet_Type'])
 
 """
 #### 5.2: OneHotEncoding"""
@@ -964,13 +965,24 @@ X_test_best = X_test[selected_features]
 sales_prediction_model.fit(X_train_best, y_train)
 
 import pickle
+from model_artifact import build_artifact, save_artifact
 
 # Path to save the pickle file
 pkl_filename = "sales_prediction_model.pkl"
 
 # Save the model to a pickle file
-with open('sales_prediction_model', 'wb') as file:
-    pickle.dump('sales_prediction_model.pkl', file)
+with open(pkl_filename, 'wb') as file:
+    pickle.dump(sales_prediction_model, file)
 
 print(f"Model saved to {pkl_filename}")
 
+# Save the fitted preprocessing together with the model, so serving applies the same scaling.
+# The .json artifact stores the trees next to it in XGBoost's native format (sales_prediction_artifact.ubj)
+artifact_filename = "sales_prediction_artifact.json"
+artifact = build_artifact(sales_prediction_model, scaler,
+                          {'Item_Fat_Content': le_fat_content, 'Outlet_Type': le_outlet_type},
+                          ohe, selected_features, scaled_features=scalled_features)
+save_artifact(artifact, artifact_filename)
+
+print(f"Artifact saved to {artifact_filename}")
+
@@ -0,0 +1,76 @@
+"""Slim serving entry point: NumPy and the model evaluator, nothing else.
+
+The import graph is model_artifact -> tree_arrays (or prediction_table) and
+NumPy. It has no pandas, scikit-learn, xgboost or scipy, and no web framework.
+So a fresh process is ready to score in little more than NumPy's own import
+time. `benchmarks/bench_import_time.py` holds it to a budget.
+
+Feature rows use the app's encoding, in `predict_sales` order: Outlet_Type code,
+OUT027 flag, Item_MRP, OUT019 flag, Outlet_Age, OUT035 flag. They are read as
+JSON lines on stdin (one row or a list of rows per line). One JSON list of
+predictions is written per line.
+
+Usage:
+    python serve.py 1 0 249.8 0 25 0
+    python serve.py --table sales_prediction_table.bin < rows.jsonl
+"""
+
+import json
+import sys
+
+from model_artifact import DEFAULT_ARTIFACT_PATH, load_artifact
+
+
+def load_model(artifact_path=DEFAULT_ARTIFACT_PATH, table_path=None):
+    """The NumPy tree evaluator, or the precomputed prediction table when `table_path` is given."""
+    if table_path:
+        from prediction_table import PredictionTable
+
+        return PredictionTable.load(table_path)
+    return load_artifact(artifact_path, backend='numpy')
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_rows(line):
+    """The rows of one JSON line: a list of numbers (one row) or a list of such lists."""
+    rows = json.loads(line)
+    if not isinstance(rows, list):
+        raise ValueError("expected a JSON list of numbers or a list of such lists")
+    if rows and not isinstance(rows[0], list):
+        rows = [rows]
+    if not all(isinstance(row, list) and all(_is_number(value) for value in row) for row in rows):
+        raise ValueError("expected a JSON list of numbers or a list of such lists")
+    return rows
+
+
+def score_lines(model, lines, output):
+    """Score JSON rows line by line; a bad line gets an {"error": ...} line instead of stopping the loop."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            output.write(json.dumps(model.predict(parse_rows(line)).tolist()) + '\n')
+        except (TypeError, ValueError, IndexError, KeyError) as error:
+            output.write(json.dumps({'error': str(error)}) + '\n')
+        output.flush()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score feature rows with only NumPy and the model evaluator.")
+    parser.add_argument('features', nargs='*', type=float, help="one row to score; otherwise rows are read from stdin")
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument('--table', help="answer from the precomputed prediction table instead")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.artifact, args.table)
+    lines = [json.dumps(args.features)] if args.features else sys.stdin
+    score_lines(model, lines, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Read-only memory-mapped model file shared by pre-forked scoring workers.
+
+Every array the scorer needs (the preprocessing coefficients, the flattened
+trees and the precomputed prediction table) is written once into one file,
+already in the dtypes the evaluators use. Workers map the file read-only and wrap
+the mapped bytes in NumPy views, so N workers share one copy of the parameters in
+the page cache instead of each deserializing its own.
+
+Layout: 8-byte magic, uint64 header length, JSON header (array name -> dtype,
+shape, offset), then the arrays, each aligned to 64 bytes.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from instrumentation import METRICS
+from model_artifact import ARTIFACT_VERSION, SalesModel
+from prediction_table import PredictionTable, build_table, table_bytes
+from tree_arrays import TreeEnsemble
+
+MAGIC = b'SPSHARED'
+ALIGNMENT = 64
+
+
+def write_shared_model(sales_model, path):
+    """Write the model (loaded with the NumPy backend) and its prediction table into `path`.
+
+    The table is built from `sales_model` rather than read from a table file, which
+    may be stale after a retrain; workers answer from it first.
+    """
+    trees = sales_model.model
+    if not hasattr(trees, 'arrays'):
+        raise ValueError("write_shared_model needs the flattened trees, load the artifact with backend='numpy'")
+
+    arrays = {'coef': sales_model._coef, 'offset': sales_model._offset}
+    for index, lookup in sales_model._lookup.items():
+        arrays[f'lookup_{index}'] = lookup
+    scalars = {}
+    for name, array in trees.arrays().items():
+        if np.ndim(array) == 0:
+            scalars[name] = array.item()
+        else:
+            arrays[f'trees_{name}'] = array
+    arrays['table'] = np.frombuffer(table_bytes(build_table(sales_model)), dtype=np.uint8)
+
+    header = {'version': ARTIFACT_VERSION, 'feature_names': sales_model.feature_names,
+              'tree_scalars': scalars, 'arrays': {}}
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header_bytes = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+
+    # Write to a temporary name and rename, so workers never map a half-written file
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as file:
+        file.write(MAGIC + struct.pack('<Q', len(header_bytes)) + header_bytes)
+        for name, array in arrays.items():
+            file.seek(data_start + header['arrays'][name]['offset'])
+            file.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+
+class SharedModel:
+    """A worker's zero-copy view of the shared model file.
+
+    `predict` answers from the prediction table and falls back to walking the trees
+    for batches with inputs outside the table (e.g. an Outlet_Age beyond the slider).
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a shared model file")
+        (header_length,) = struct.unpack('<Q', buffer[len(MAGIC):len(MAGIC) + 8])
+        header = json.loads(bytes(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + header_length]))
+        data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+
+        views = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            views[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                        offset=data_start + spec['offset']).reshape(spec['shape'])
+
+        trees = {name[len('trees_'):]: view for name, view in views.items() if name.startswith('trees_')}
+        trees.update(header['tree_scalars'])
+        lookup = {int(name[len('lookup_'):]): view for name, view in views.items() if name.startswith('lookup_')}
+        self.model = SalesModel({'version': header['version'], 'feature_names': header['feature_names'],
+                                 'model': TreeEnsemble(trees), 'coef': views['coef'],
+                                 'offset': views['offset'], 'lookup': lookup})
+        self.table = PredictionTable(views['table'].data)
+        self.feature_names = self.model.feature_names
+
+    def predict(self, features):
+        with METRICS.time('table_predict', rows=len(features)):
+            try:
+                return self.table.predict(features)
+            except ValueError:
+                pass
+        return self.model.predict(features)
@@ -0,0 +1,199 @@
+"""Reproducible synthetic Big Mart datasets of arbitrary size.
+
+Train.csv (8,523 rows) is too small to show how the pipeline and the serving
+paths scale. `learn_profile` extracts its structure:
+- the item catalog: Item_Identifier prefix, Item_Type, weight, fat content and
+  base MRP per item, plus how MRP and visibility vary from row to row;
+- the 10 outlets with their establishment year, size, location and type, how
+  often each appears, and which ones lack Item_Weight/Outlet_Size;
+- the raw Item_Fat_Content spellings ('LF', 'reg', ...) per normalized value;
+- the sales relationship, as the empirical distribution of sales / MRP per outlet.
+
+`generate` then draws rows from that profile in chunks, with a generator seeded
+from (seed, chunk index), so a dataset of any size comes out the same for the
+same seed and chunk size and memory stays bounded by the chunk size. The output
+has Train.csv's columns (Test.csv's without the target) and is streamed to CSV or
+Parquet.
+
+Usage:
+    python synthetic_data.py --rows 10000000 --output train_10m.parquet --seed 0
+    python synthetic_data.py --rows 1000000 --output test_1m.csv --no-target
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_artifact import FAT_CONTENT_MAP
+from preprocessing import TARGET
+
+OUTLET_COLUMNS = ['Outlet_Establishment_Year', 'Outlet_Size', 'Outlet_Location_Type', 'Outlet_Type']
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+# Resolution of the per-outlet sales / MRP distribution
+N_QUANTILES = 201
+
+
+def learn_profile(df):
+    """Item catalog, outlets and distributions of a Train.csv-shaped frame."""
+    fat = df['Item_Fat_Content'].replace(FAT_CONTENT_MAP)
+    items = df.assign(Fat=fat).groupby('Item_Identifier', sort=True).agg(
+        Item_Type=('Item_Type', 'first'), Fat=('Fat', 'first'), Item_Weight=('Item_Weight', 'mean'),
+        Item_MRP=('Item_MRP', 'mean'),
+        Item_Visibility=('Item_Visibility', lambda v: v[v > 0].mean() if (v > 0).any() else np.nan))
+    # Items never weighed in the data get the mean weight of their type
+    items['Item_Weight'] = items['Item_Weight'].fillna(items.groupby('Item_Type')['Item_Weight'].transform('mean'))
+    visible = df['Item_Visibility'] > 0
+    items['Item_Visibility'] = items['Item_Visibility'].fillna(df.loc[visible, 'Item_Visibility'].mean())
+
+    outlets = df.groupby('Outlet_Identifier', sort=True)
+    outlet_table = outlets[OUTLET_COLUMNS].first()
+    outlet_table['Outlet_Size'] = outlets['Outlet_Size'].agg(lambda s: s.mode()[0] if s.notna().any() else None)
+
+    base = df['Item_Identifier'].map(items['Item_MRP'])
+    vis_base = df.loc[visible, 'Item_Identifier'].map(items['Item_Visibility'])
+    spellings = {}
+    for value, group in df.groupby(fat)['Item_Fat_Content']:
+        counts = group.value_counts(normalize=True)
+        spellings[value] = (counts.index.tolist(), counts.to_numpy())
+
+    ratio = (df[TARGET] / df['Item_MRP']).to_numpy()
+    quantiles = np.linspace(0, 1, N_QUANTILES)
+    return {
+        'items': items,
+        'outlets': outlet_table,
+        'outlet_weights': outlets.size().to_numpy() / len(df),
+        'weight_missing': outlets['Item_Weight'].agg(lambda s: s.isna().mean()).to_numpy(),
+        'mrp_noise': float((df['Item_MRP'] / base - 1).std()),
+        'visibility_zero_rate': float(1 - visible.mean()),
+        'visibility_noise': float(np.log(df.loc[visible, 'Item_Visibility'] / vis_base).std()),
+        'fat_spellings': spellings,
+        'sales_ratio_quantiles': np.stack([np.quantile(ratio[outlets.indices[outlet]], quantiles)
+                                           for outlet in outlet_table.index]),
+    }
+
+
+def make_catalog(profile, n_items, seed=0):
+    """`n_items` items: the learned catalog first, then variants of it with new identifiers and MRPs."""
+    items = profile['items']
+    rng = np.random.default_rng([seed, 2**32 - 1])
+    templates = np.arange(n_items) % len(items)
+    catalog = items.iloc[templates].reset_index()
+    copy = np.arange(n_items) // len(items)
+    variant = copy > 0
+    # Same prefix (the first two characters the pipeline uses) and type as the template
+    catalog.loc[variant, 'Item_Identifier'] = catalog.loc[variant, 'Item_Identifier'] + '-' + copy[variant].astype(str)
+    catalog.loc[variant, 'Item_MRP'] *= rng.lognormal(0, 0.25, variant.sum())
+    catalog['Item_MRP'] = catalog['Item_MRP'].clip(items['Item_MRP'].min(), items['Item_MRP'].max())
+    return catalog
+
+
+def generate(profile, n_rows, seed=0, n_items=None, chunk_size=DEFAULT_CHUNK_SIZE, target=True):
+    """Yield DataFrame chunks totalling `n_rows` synthetic rows."""
+    catalog = make_catalog(profile, n_items or len(profile['items']), seed)
+    outlets = profile['outlets']
+    outlet_ids = outlets.index.to_numpy()
+    spellings = profile['fat_spellings']
+
+    for index, start in enumerate(range(0, n_rows, chunk_size)):
+        rng = np.random.default_rng([seed, index])
+        size = min(chunk_size, n_rows - start)
+        item = rng.integers(len(catalog), size=size)
+        outlet = rng.choice(len(outlet_ids), size=size, p=profile['outlet_weights'])
+
+        mrp = catalog['Item_MRP'].to_numpy()[item] * (1 + profile['mrp_noise'] * rng.standard_normal(size))
+        weight = catalog['Item_Weight'].to_numpy()[item].copy()
+        weight[rng.random(size) < profile['weight_missing'][outlet]] = np.nan
+        visibility = catalog['Item_Visibility'].to_numpy()[item] * rng.lognormal(0, profile['visibility_noise'], size)
+        visibility[rng.random(size) < profile['visibility_zero_rate']] = 0.0
+
+        fat = catalog['Fat'].to_numpy()[item]
+        raw_fat = fat.astype(object)
+        for value, (labels, probabilities) in spellings.items():
+            rows = fat == value
+            raw_fat[rows] = rng.choice(labels, size=rows.sum(), p=probabilities)
+
+        chunk = pd.DataFrame({
+            'Item_Identifier': catalog['Item_Identifier'].to_numpy()[item],
+            'Item_Weight': weight.round(3),
+            'Item_Fat_Content': raw_fat,
+            'Item_Visibility': visibility.clip(0, 1).round(9),
+            'Item_Type': catalog['Item_Type'].to_numpy()[item],
+            'Item_MRP': mrp.round(4),
+            'Outlet_Identifier': outlet_ids[outlet],
+            **{col: outlets[col].to_numpy()[outlet] for col in OUTLET_COLUMNS},
+        })
+        if target:
+            # Inverse-CDF draw from the outlet's sales / MRP distribution
+            u = rng.random(size) * (N_QUANTILES - 1)
+            lower = u.astype(np.int64).clip(max=N_QUANTILES - 2)
+            quantiles = profile['sales_ratio_quantiles'][outlet]
+            rows = np.arange(size)
+            low, high = quantiles[rows, lower], quantiles[rows, lower + 1]
+            ratio = low + (high - low) * (u - lower)
+            chunk[TARGET] = (mrp * ratio).round(4)
+        yield chunk
+
+
+def write_csv(chunks, path):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', newline='') as file:
+        for index, chunk in enumerate(chunks):
+            chunk.to_csv(file, header=index == 0, index=False)
+    os.replace(tmp_path, path)
+
+
+def write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if 'Outlet_Size' in schema.names:
+                    # Outlet_Size is all-null in some chunks; pin the schema to strings
+                    schema = schema.set(schema.get_field_index('Outlet_Size'), pa.field('Outlet_Size', pa.string()))
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+
+
+def write_dataset(path, n_rows, source='Train.csv', seed=0, n_items=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                  target=True):
+    """Learn the profile of `source` and stream `n_rows` rows to `path` (.csv or .parquet)."""
+    profile = learn_profile(pd.read_csv(source))
+    chunks = generate(profile, n_rows, seed=seed, n_items=n_items, chunk_size=chunk_size, target=target)
+    if path.endswith('.parquet'):
+        write_parquet(chunks, path)
+    elif path.endswith('.csv'):
+        write_csv(chunks, path)
+    else:
+        raise ValueError(f"unsupported output format for {path!r}; use .csv or .parquet")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Big Mart dataset.")
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--output', required=True, help=".csv or .parquet")
+    parser.add_argument('--source', default='Train.csv', help="dataset whose structure is learned")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--items', type=int, default=None, help="catalog size (default: as in the source)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--no-target', action='store_true', help="omit Item_Outlet_Sales, like Test.csv")
+    args = parser.parse_args(argv)
+
+    write_dataset(args.output, args.rows, source=args.source, seed=args.seed, n_items=args.items,
+                  chunk_size=args.chunk_size, target=not args.no_target)
+
+
+if __name__ == '__main__':
+    main()
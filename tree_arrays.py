@@ -0,0 +1,177 @@
+"""Pure-NumPy evaluator for the boosted trees.
+
+The deployed model is 100 depth-3 trees over 6 features, i.e. a few hundred
+nodes. Flattened into contiguous arrays (feature index, threshold, children,
+default direction for missing values, leaf value) it can be evaluated for a whole
+batch and all trees at once with NumPy fancy indexing, without importing xgboost.
+
+Usage (flatten the booster of the model artifact):
+    python tree_arrays.py --booster sales_prediction_artifact.ubj --output sales_prediction_artifact.npz
+"""
+
+import json
+
+import numpy as np
+
+DEFAULT_BOOSTER_PATH = "sales_prediction_artifact.ubj"
+DEFAULT_TREES_PATH = "sales_prediction_artifact.npz"
+
+
+def flatten_booster(booster):
+    """Flatten an XGBoost Booster (or XGBRegressor) into a dict of contiguous arrays.
+
+    Node ids are global across trees. Leaves point to themselves, so walking
+    `max_depth` steps from every root always ends on a leaf.
+    """
+    if hasattr(booster, 'get_booster'):
+        booster = booster.get_booster()
+    model = json.loads(booster.save_raw('json'))
+    learner = model['learner']
+    objective = learner['objective']['name']
+    if objective != 'reg:squarederror':
+        raise ValueError(f"Only reg:squarederror models are supported, got {objective}")
+    trees = learner['gradient_booster']['model']['trees']
+
+    feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+    for tree in trees:
+        if any(tree['split_type']):
+            raise ValueError("Categorical splits are not supported")
+        lefts = np.asarray(tree['left_children'], dtype=np.int32)
+        rights = np.asarray(tree['right_children'], dtype=np.int32)
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        is_leaf = lefts == -1
+        own_ids = np.arange(len(lefts), dtype=np.int32) + offset
+
+        feature.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+        threshold.append(np.where(is_leaf, np.float32(np.inf), conditions))
+        left.append(np.where(is_leaf, own_ids, lefts + offset))
+        right.append(np.where(is_leaf, own_ids, rights + offset))
+        default_left.append(np.asarray(tree['default_left'], dtype=bool))
+        value.append(np.where(is_leaf, conditions, np.float32(0)))
+        roots.append(offset)
+        max_depth = max(max_depth, _tree_depth(lefts, rights))
+        offset += len(lefts)
+
+    return {
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold).astype(np.float32),
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'default_left': np.concatenate(default_left),
+        'value': np.concatenate(value).astype(np.float32),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'max_depth': np.int32(max_depth),
+        'base_score': np.float32(learner['learner_model_param']['base_score']),
+        'num_feature': np.int32(learner['learner_model_param']['num_feature']),
+    }
+
+
+def _tree_depth(lefts, rights):
+    depth = 0
+    level = [0]
+    while True:
+        level = [child for node in level for child in (lefts[node], rights[node]) if child != -1]
+        if not level:
+            return depth
+        depth += 1
+
+
+def save_trees(trees, path=DEFAULT_TREES_PATH):
+    np.savez(path, **trees)
+
+
+class TreeEnsemble:
+    """Batch evaluator over flattened trees; a drop-in for `XGBRegressor.predict`.
+
+    Every step advances all (row, tree) pairs one level down together. It beats
+    xgboost's per-call overhead for single rows and small batches; for batches in
+    the thousands xgboost's compiled traversal is still faster.
+    """
+
+    # Rows walked together; keeps the (rows, trees) index arrays cache-sized
+    chunk_size = 512
+
+    def __init__(self, trees):
+        self.feature = np.asarray(trees['feature'], dtype=np.intp)
+        self.threshold = np.asarray(trees['threshold'], dtype=np.float32)
+        self.left = np.asarray(trees['left'], dtype=np.intp)
+        self.right = np.asarray(trees['right'], dtype=np.intp)
+        self.default_left = np.asarray(trees['default_left'], dtype=bool)
+        self.value = np.asarray(trees['value'], dtype=np.float32)
+        self.roots = np.asarray(trees['roots'], dtype=np.intp)
+        self.max_depth = int(trees['max_depth'])
+        self.base_score = np.float32(trees['base_score'])
+        self.num_feature = int(trees['num_feature'])
+        # children[2 * node + go_left] is the next node
+        if 'children' in trees:
+            self._children = np.asarray(trees['children'], dtype=np.intp)
+        else:
+            self._children = np.stack([self.right, self.left], axis=1).ravel()
+
+    def arrays(self):
+        """The evaluator's arrays in the dtypes it uses, for zero-copy sharing (see shared_model.py)."""
+        return {'feature': self.feature, 'threshold': self.threshold, 'left': self.left, 'right': self.right,
+                'default_left': self.default_left, 'value': self.value, 'roots': self.roots,
+                'children': self._children, 'max_depth': np.int64(self.max_depth),
+                'base_score': self.base_score, 'num_feature': np.int64(self.num_feature)}
+
+    @classmethod
+    def load(cls, path=DEFAULT_TREES_PATH):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def _check(self, features):
+        # XGBoost compares in float32, so do the same to land on identical branches
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != self.num_feature:
+            raise ValueError(f"Expected an (n, {self.num_feature}) feature matrix, got {features.shape}")
+        return features
+
+    def _walk(self, features):
+        flat = features.ravel()
+        row_offsets = (np.arange(len(features), dtype=np.intp) * self.num_feature)[:, None]
+        has_nan = np.isnan(flat).any()
+        nodes = np.broadcast_to(self.roots, (len(features), len(self.roots)))
+        for _ in range(self.max_depth):
+            x = flat.take(row_offsets + self.feature.take(nodes))
+            go_left = x < self.threshold.take(nodes)
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.default_left.take(nodes), go_left)
+            nodes = self._children.take(2 * nodes + go_left)
+        return nodes
+
+    def leaf_indices(self, features):
+        """Global leaf id reached by every row in every tree, shape (n_rows, n_trees)."""
+        features = self._check(features)
+        return np.concatenate([self._walk(features[start:start + self.chunk_size])
+                               for start in range(0, len(features), self.chunk_size)] or
+                              [np.empty((0, len(self.roots)), dtype=np.intp)])
+
+    def predict(self, features):
+        features = self._check(features)
+        predictions = np.empty(len(features), dtype=np.float32)
+        for start in range(0, len(features), self.chunk_size):
+            leaves = self._walk(features[start:start + self.chunk_size])
+            predictions[start:start + self.chunk_size] = self.value.take(leaves).sum(axis=1, dtype=np.float64)
+        return predictions + self.base_score
+
+
+def main(argv=None):
+    import argparse
+
+    from booster_io import load_booster
+
+    parser = argparse.ArgumentParser(description="Flatten a native XGBoost booster into NumPy arrays.")
+    parser.add_argument('--booster', default=DEFAULT_BOOSTER_PATH, help="native .json/.ubj booster")
+    parser.add_argument('--output', '-o', default=DEFAULT_TREES_PATH)
+    args = parser.parse_args(argv)
+
+    trees = flatten_booster(load_booster(args.booster))
+    save_trees(trees, args.output)
+    print(f"{len(trees['roots'])} trees, {len(trees['value'])} nodes saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
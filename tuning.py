@@ -0,0 +1,196 @@
+"""Budgeted hyperparameter search for the models compared in salesprediction.py.
+
+Section 7 of the notebook runs every grid exhaustively under 5-fold GridSearchCV:
+162 XGBoost configurations (810 fits) and 24 random-forest configurations (120
+fits). Here:
+- XGB: successive halving with boosting rounds as the budget. All configurations
+  of the grid (n_estimators aside) get `min_rounds` rounds, the best 1/`eta` of
+  them move on with `eta` times the rounds, and so on up to the grid's largest
+  n_estimators. Every fit uses XGBoost's native early stopping on one validation
+  fold held out of the training split. The grid is shuffled, and with `max_fits`
+  the first rung is a random sample small enough for the whole halving schedule
+  to fit in the budget. `time_budget` stops the search wherever it is; the best
+  fit so far wins. The best configuration is refitted on the whole training
+  split with its early-stopped number of rounds.
+- RandomForest: sklearn's HalvingGridSearchCV with rows as the budget.
+- Ridge/Lasso: GridSearchCV as in the notebook (the grids are tiny).
+
+The output is the notebook's results table (R2/MAE/RMSE on train and test).
+
+Usage:
+    python tuning.py --max-fits 150 --time-budget 300
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import RANDOM_STATE, xgboost_params
+
+PARAM_GRIDS = {
+    'Ridge': {'alpha': [0.1, 1.0, 10.0, 100.0]},
+    'Lasso': {'alpha': [0.1, 1.0, 10.0, 100.0]},
+    'RandomForest': {'n_estimators': [100, 200],
+                     'max_depth': [None, 10, 20],
+                     'min_samples_split': [2, 5],
+                     'min_samples_leaf': [1, 2]},
+    'XGB': {'n_estimators': [100, 200],
+            'max_depth': [3, 6, 9],
+            'learning_rate': [0.01, 0.1, 0.2],
+            'subsample': [0.6, 0.8, 1.0],
+            'colsample_bytree': [0.6, 0.8, 1.0]},
+}
+
+RESULT_COLUMNS = ['Model', 'R2_train', 'MAE_train', 'RMSE_train', 'R2_test', 'MAE_test', 'RMSE_test']
+
+
+def evaluation_metrics(model, X_train, y_train, X_test, y_test):
+    """The notebook's R2/MAE/RMSE on the train and test splits."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    metrics = {}
+    for suffix, X, y in [('train', X_train, y_train), ('test', X_test, y_test)]:
+        y_pred = model.predict(X)
+        metrics[f'R2_{suffix}'] = r2_score(y, y_pred)
+        metrics[f'MAE_{suffix}'] = mean_absolute_error(y, y_pred)
+        metrics[f'RMSE_{suffix}'] = np.sqrt(mean_squared_error(y, y_pred))
+    return metrics
+
+
+def _schedule_fits(n_candidates, rounds, max_rounds, eta):
+    """Fits used by a halving schedule starting with `n_candidates` at `rounds`."""
+    total = n_candidates
+    while rounds < max_rounds:
+        n_candidates = max(1, n_candidates // eta)
+        rounds = min(rounds * eta, max_rounds)
+        total += n_candidates
+    return total
+
+
+def _first_rung_size(n_candidates, max_fits, rounds, max_rounds, eta):
+    """Largest first rung whose whole schedule takes at most `max_fits` fits (at least one candidate)."""
+    for size in range(n_candidates, 1, -1):
+        if _schedule_fits(size, rounds, max_rounds, eta) <= max_fits:
+            return size
+    return 1
+
+
+def successive_halving(X, y, param_grid=PARAM_GRIDS['XGB'], min_rounds=25, eta=3, early_stopping_rounds=20,
+                       max_fits=None, time_budget=None, validation_size=0.2, n_jobs=None,
+                       random_state=RANDOM_STATE, clock=time.perf_counter):
+    """Successive halving over `param_grid` with boosting rounds as the resource.
+
+    The configurations are shuffled with `random_state`. With `max_fits`, the
+    first rung keeps as many of them as lets every rung run in full; when
+    `time_budget` runs out the search stops mid-rung and the best fit so far
+    wins, so a short budget only sees a random sample of the first rung.
+
+    Returns (best params including the early-stopped n_estimators, history frame
+    with one row per fit).
+    """
+    from sklearn.model_selection import train_test_split
+    from xgboost import XGBRegressor
+
+    grid = {key: values for key, values in param_grid.items() if key != 'n_estimators'}
+    max_rounds = max(param_grid.get('n_estimators', [min_rounds]))
+    candidates = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    rounds = min(min_rounds, max_rounds)
+    # Shuffled, so a first rung cut short by the budget is a random sample rather than a grid prefix
+    order = np.random.default_rng(random_state).permutation(len(candidates))
+    if max_fits is not None:
+        order = order[:_first_rung_size(len(candidates), max_fits, rounds, max_rounds, eta)]
+    candidates = [candidates[i] for i in order]
+    X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=validation_size, random_state=random_state)
+
+    deadline = None if time_budget is None else clock() + time_budget
+    history = []
+    while candidates:
+        scores = []
+        for params in candidates:
+            if (max_fits is not None and len(history) >= max_fits) or (deadline is not None and clock() >= deadline):
+                break
+            model = XGBRegressor(**params, **xgboost_params(X), n_estimators=rounds,
+                                 early_stopping_rounds=early_stopping_rounds, n_jobs=n_jobs, random_state=0)
+            model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+            scores.append(model.best_score)
+            history.append({**params, 'rounds': rounds, 'best_iteration': model.best_iteration,
+                            'val_rmse': model.best_score})
+        if len(scores) < len(candidates) or rounds >= max_rounds:
+            break
+        keep = max(1, len(candidates) // eta)
+        candidates = [candidates[i] for i in np.argsort(scores, kind='stable')[:keep]]
+        rounds = min(rounds * eta, max_rounds)
+
+    if not history:
+        raise ValueError("the budget allows no fits")
+    # Any fit is a complete configuration (params + rounds), whichever rung it ran in
+    best = min(history, key=lambda fit: fit['val_rmse'])
+    best_params = {key: best[key] for key in grid}
+    best_params['n_estimators'] = best['best_iteration'] + 1
+    return best_params, pd.DataFrame(history)
+
+
+def tune(X_train, y_train, X_test, y_test, models=tuple(PARAM_GRIDS), cv=5, n_jobs=-1, **halving_kwargs):
+    """Tune each model and score the best one; returns (results frame, best params per model)."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.linear_model import Lasso, Ridge
+    from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV
+    from xgboost import XGBRegressor
+
+    results, best_params = [], {}
+    for name in models:
+        if name == 'XGB':
+            params, _ = successive_halving(X_train, y_train, PARAM_GRIDS['XGB'], **halving_kwargs)
+            best_model = XGBRegressor(**params, **xgboost_params(X_train), random_state=0).fit(X_train, y_train)
+        elif xgboost_params(X_train):
+            raise ValueError(f"{name} needs numeric features; use the 'dense' or 'sparse' one-hot encoding")
+        else:
+            if name == 'RandomForest':
+                search = HalvingGridSearchCV(RandomForestRegressor(random_state=0), PARAM_GRIDS[name], cv=cv,
+                                             scoring='r2', resource='n_samples', factor=3,
+                                             random_state=RANDOM_STATE, n_jobs=n_jobs)
+            elif name in ('Ridge', 'Lasso'):
+                estimator = Ridge() if name == 'Ridge' else Lasso()
+                search = GridSearchCV(estimator, PARAM_GRIDS[name], cv=cv, scoring='r2', n_jobs=n_jobs)
+            else:
+                raise ValueError(f"unknown model {name!r}; expected one of {list(PARAM_GRIDS)}")
+            search.fit(X_train, y_train)
+            params, best_model = search.best_params_, search.best_estimator_
+        best_params[name] = params
+        results.append({'Model': name, **evaluation_metrics(best_model, X_train, y_train, X_test, y_test)})
+    return pd.DataFrame(results, columns=RESULT_COLUMNS), best_params
+
+
+def main(argv=None):
+    from feature_cache import load_training_frame
+    from preprocessing import DEFAULT_CONFIG, ENCODINGS, split
+
+    parser = argparse.ArgumentParser(description="Budgeted hyperparameter search with successive halving.")
+    parser.add_argument('--train', default='Train.csv')
+    parser.add_argument('--models', nargs='+', choices=list(PARAM_GRIDS),
+                        help="default: all, or XGB only with --encoding categorical")
+    parser.add_argument('--max-fits', type=int, default=None, help="most XGBoost fits in the halving search")
+    parser.add_argument('--time-budget', type=float, default=None, help="seconds for the XGBoost halving search")
+    parser.add_argument('--min-rounds', type=int, default=25, help="boosting rounds in the first rung")
+    parser.add_argument('--eta', type=int, default=3, help="keep the best 1/eta per rung")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--encoding', choices=ENCODINGS, default='dense', help="one-hot block representation")
+    args = parser.parse_args(argv)
+
+    models = args.models or (['XGB'] if args.encoding == 'categorical' else list(PARAM_GRIDS))
+    X, y = load_training_frame(args.train, {**DEFAULT_CONFIG, 'onehot_encoding': args.encoding})
+    X_train, X_test, y_train, y_test = split(X, y)
+    results, best_params = tune(X_train, y_train, X_test, y_test, models=models, n_jobs=args.n_jobs,
+                                min_rounds=args.min_rounds, eta=args.eta, max_fits=args.max_fits,
+                                time_budget=args.time_budget)
+    for name, params in best_params.items():
+        print(f"Best parameters for {name}: {params}")
+    print(results.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()